@@ -0,0 +1,23 @@
+-- Gate state for client summary regeneration (workers/summary_gate.py)
+-- The processing workers skip generate_summary() when an item adds only
+-- negligible content; this table tracks what has been deferred per client.
+
+-- Create table (idempotent)
+CREATE TABLE IF NOT EXISTS public.client_summary_state (
+  client_id uuid NOT NULL PRIMARY KEY,
+  centroid jsonb,                       -- running mean of chunk embeddings
+  chunk_count integer NOT NULL DEFAULT 0,
+  pending_tokens integer NOT NULL DEFAULT 0,  -- tokens added since last summary
+  last_summarized_at timestamptz,
+  updated_at timestamptz DEFAULT now()
+);
+
+-- Used by SummaryGate.stale_clients() to find deferred summaries
+CREATE INDEX IF NOT EXISTS idx_client_summary_state_pending
+  ON public.client_summary_state (last_summarized_at)
+  WHERE pending_tokens > 0;
+
+-- Notes / Recommendations:
+-- 1) If this table is missing the gate fails open and every item regenerates.
+-- 2) Tune with SUMMARY_MIN_NEW_TOKENS, SUMMARY_NOVELTY_THRESHOLD,
+--    SUMMARY_MIN_NOVEL_TOKENS and SUMMARY_MAX_STALENESS_HOURS; SUMMARY_GATE=off disables it.
@@ -0,0 +1,14 @@
+-- Content fingerprint lookup for knowledge item de-duplication (workers/dedupe.py)
+-- The processing workers store a normalized raw_text hash in metadata.content_hash
+-- and look it up before chunking a new item.
+
+-- Expression index on the fingerprint, scoped by client (idempotent)
+CREATE INDEX IF NOT EXISTS idx_knowledge_items_content_hash
+  ON public.knowledge_items (client_id, (metadata->>'content_hash'))
+  WHERE metadata->>'content_hash' IS NOT NULL;
+
+-- Notes / Recommendations:
+-- 1) Duplicates are marked processed with metadata.duplicate_of = <original item id>;
+--    their chunks and embeddings are the original item's.
+-- 2) Items processed before fingerprinting have no content_hash and are never
+--    matched; backfill with the worker's content_fingerprint() if needed.
@@ -0,0 +1,71 @@
+-- Token usage rollups written by the processing workers (workers/usage.py)
+-- Replaces the per-chunk token_usage rows with batched per-item and
+-- per-client-hour totals, which the report command reads directly.
+
+-- Per-item totals, one row per (item, model) (idempotent)
+CREATE TABLE IF NOT EXISTS public.token_usage_item_rollups (
+  item_id uuid NOT NULL,
+  client_id uuid NOT NULL,
+  model text NOT NULL,
+  tokens_in bigint NOT NULL DEFAULT 0,
+  tokens_out bigint NOT NULL DEFAULT 0,
+  requests integer NOT NULL DEFAULT 0,
+  elapsed_sec double precision NOT NULL DEFAULT 0,  -- API wall time
+  cost_usd numeric(12, 6) NOT NULL DEFAULT 0,
+  processed_at timestamptz DEFAULT now(),
+  PRIMARY KEY (item_id, model)
+);
+
+-- Per-client hourly totals, one row per (client, hour, model)
+CREATE TABLE IF NOT EXISTS public.token_usage_hourly_rollups (
+  client_id uuid NOT NULL,
+  hour timestamptz NOT NULL,
+  model text NOT NULL,
+  tokens_in bigint NOT NULL DEFAULT 0,
+  tokens_out bigint NOT NULL DEFAULT 0,
+  requests integer NOT NULL DEFAULT 0,
+  items integer NOT NULL DEFAULT 0,
+  elapsed_sec double precision NOT NULL DEFAULT 0,
+  cost_usd numeric(12, 6) NOT NULL DEFAULT 0,
+  PRIMARY KEY (client_id, hour, model)
+);
+
+-- Adds per-(client, hour, model) deltas to the hourly rollups in one
+-- statement, so concurrent flushes never overwrite each other's counts.
+-- Called by workers/usage.py as rpc('add_token_usage_hourly', {deltas: [...]}).
+CREATE OR REPLACE FUNCTION public.add_token_usage_hourly(deltas jsonb)
+RETURNS void
+LANGUAGE sql
+AS $$
+  INSERT INTO public.token_usage_hourly_rollups AS t
+    (client_id, hour, model, tokens_in, tokens_out, requests, items, elapsed_sec, cost_usd)
+  SELECT d.client_id, d.hour, d.model, d.tokens_in, d.tokens_out, d.requests, d.items, d.elapsed_sec, d.cost_usd
+  FROM jsonb_to_recordset(deltas) AS d(
+    client_id uuid,
+    hour timestamptz,
+    model text,
+    tokens_in bigint,
+    tokens_out bigint,
+    requests integer,
+    items integer,
+    elapsed_sec double precision,
+    cost_usd numeric
+  )
+  ON CONFLICT (client_id, hour, model) DO UPDATE SET
+    tokens_in = t.tokens_in + EXCLUDED.tokens_in,
+    tokens_out = t.tokens_out + EXCLUDED.tokens_out,
+    requests = t.requests + EXCLUDED.requests,
+    items = t.items + EXCLUDED.items,
+    elapsed_sec = t.elapsed_sec + EXCLUDED.elapsed_sec,
+    cost_usd = t.cost_usd + EXCLUDED.cost_usd;
+$$;
+
+-- Time-range scans for `python workers/usage.py report`
+CREATE INDEX IF NOT EXISTS idx_token_usage_hourly_rollups_hour
+  ON public.token_usage_hourly_rollups (hour);
+CREATE INDEX IF NOT EXISTS idx_token_usage_item_rollups_processed_at
+  ON public.token_usage_item_rollups (processed_at);
+
+-- Notes / Recommendations:
+-- 1) Costs use the price table in workers/usage.py (MODEL_PRICES); update it when pricing changes.
+-- 2) Hourly rows are only written through add_token_usage_hourly(), which increments them atomically.
@@ -17,21 +17,54 @@ Environment Variables Required:
 - REPO_NAME: Target repository in format "owner/repo"
 
 Optional:
+- LOG_LEVEL: Root log level (default: INFO)
+- LOG_FORMAT: "text" or "json" (one object per line with run_id/stage/step fields) (default: text)
 - NOTES_SOURCE: Path to notes directory (default: ./output/notes)
 - OUTPUT_DIR: Output directory for generated files (default: ./output)
+- NOTES_READ_WORKERS: Concurrent note file reads (default: 8)
+- NOTES_MAX_BYTES: Per-note size cap; larger files are truncated (default: 5 MiB)
+- LLM_CACHE_TTL_HOURS: Summary response cache lifetime (default: 168)
+- LLM_CACHE_MAX_MB: Summary response cache size limit (default: 50)
+- SUMMARY_PROMPT_TOKENS: Prompt budget before switching to map-reduce (default: 6000)
+- SUMMARY_WORKERS: Concurrent summary requests in map-reduce mode (default: 4)
+- SUMMARY_MAX_OUTPUT_TOKENS: Completion budget per summary or batch; reduce calls get room
+  for every partial's action items, up to the model's limit (default: 1000)
+- PROFILE_TOP_N: Allocation sites listed per step with --profile (default: 25)
+- TRACING: Set to "off" to skip writing output/traces/<run_id>.json (default: on)
+- TRACE_KEEP: Number of trace files kept in output/traces/ (default: 30)
+- WATCH_DEBOUNCE_SEC: With --watch, quiet period after an edit before re-running (default: 2)
+- WATCH_POLL_SEC: With --watch, polling interval when inotify is unavailable (default: 2)
+- WATCH_SALES_REFRESH_MIN: With --watch, minutes before sales data is pulled again (default: 60)
+- TENANT_WORKERS: With --tenants, tenants run concurrently (default: 4)
+- OPENAI_MAX_CONCURRENCY: With --tenants, OpenAI requests in flight across all tenants (default: 8)
+- HTTP_POOL_SIZE: Pooled keep-alive connections per API host (default: 10)
+- HTTP_CONNECT_TIMEOUT / HTTP_READ_TIMEOUT: Default request timeouts in seconds (default: 5 / 30)
+- HTTP_RETRIES: Retries on connection errors, 429 and 5xx (default: 3)
+- GITHUB_API_URL / OPENAI_BASE_URL: API roots, e.g. for GitHub Enterprise Server or a proxy (default: public APIs)
 """
 
 import os
 import sys
+import contextlib
+import dataclasses
+import functools
 import json
 import logging
+import threading
+import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Callable, TypeVar, Tuple, TypedDict
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Callable, ContextManager, TypeVar, Tuple, TypedDict
 
 T = TypeVar("T")
 
+SUMMARY_MODEL = "gpt-4-turbo-preview"
+SUMMARY_TEMPERATURE = 0.7
+SUMMARY_SYSTEM_PROMPT = "You are a helpful assistant that summarizes daily work notes."
+SUMMARY_OUTPUT_TOKEN_LIMIT = 4096  # longest completion SUMMARY_MODEL returns
+NON_JSON_ASSESSMENT = "AI generated summary (non-JSON response)"
+
 def run_step(
     *,
     run_id: str,
@@ -39,47 +72,81 @@ def run_step(
     step: str,
     fn: Callable[[], T],
     allow_failure: bool = True,
+    metrics: "Optional[StepMetrics]" = None,
+    profiler: "Optional[StepProfiler]" = None,
 ) -> Tuple[bool, Optional[T]]:
     """
     Execute a single automation step with structured logging and failure isolation.
+
+    Wall time, CPU time, peak RSS growth and HTTP traffic are measured into
+    ``metrics`` (see ``lib.step_metrics``) and included in the step's log line.
+    With a ``profiler`` (``--profile``) the step is also run under cProfile
+    and tracemalloc; see ``lib.profiling``.
     """
-    logger.info(
-        "STEP_START",
-        extra={"run_id": run_id, "stage": stage, "step": step}
-    )
+    metrics = metrics if metrics is not None else StepMetrics()
+    if profiler is not None:
+        fn = functools.partial(profiler.run, step, fn)
 
-    try:
-        result = fn()
+    with start_span(f"{stage}/{step}", {"run_id": run_id, "stage": stage, "step": step}) as span:
         logger.info(
-            "STEP_SUCCESS",
+            "STEP_START",
             extra={"run_id": run_id, "stage": stage, "step": step}
         )
-        return True, result
 
-    except Exception as e:
-        logger.error(
-            "STEP_FAILURE",
-            extra={
-                "run_id": run_id,
-                "stage": stage,
-                "step": step,
-                "error": str(e),
-            },
-            exc_info=True,
-        )
-
-        if not allow_failure:
-            raise
-
-        return False, None
+        metrics.start()
+        try:
+            result = fn()
+            metrics.stop()
+            for key, value in metrics.as_record().items():
+                span.set_attribute(f"step.{key}", value)
+            logger.info(
+                "STEP_SUCCESS",
+                extra={"run_id": run_id, "stage": stage, "step": step, **metrics.as_record()}
+            )
+            return True, result
 
+        except Exception as e:
+            metrics.stop()
+            for key, value in metrics.as_record().items():
+                span.set_attribute(f"step.{key}", value)
+            span.record_error(e)
+            logger.error(
+                "STEP_FAILURE",
+                extra={
+                    "run_id": run_id,
+                    "stage": stage,
+                    "step": step,
+                    "error": str(e),
+                    **metrics.as_record(),
+                },
+                exc_info=True,
+            )
 
-    class RunStepRecord(TypedDict, total=False):
-        stage: str
-        step: str
-        status: str
-        error: str
+            if not allow_failure:
+                raise
 
+            return False, None
+
+
+from lib.audit_store import AuditStore
+from lib.env_checks import REQUIRED_MODULES, missing_modules
+from lib.issue_creator import IssueCreator, MutationPacer
+from lib.issue_index import IssueIndex, normalize_title
+from lib.json_stream import JsonStreamParser
+from lib.llm_cache import LLMCache, cache_key
+from lib.logging_setup import setup_logging
+from lib.map_reduce import TokenCounter, batch_notes, map_reduce, merge_partials
+from lib.notes_manifest import NotesDelta, NotesManifest
+from lib.output_writer import dumps_json, write_atomic, write_json
+from lib.run_history import RunHistory
+from lib.step_graph import StepGraphError, StepOutcome, StepSpec, run_graph
+from lib.step_metrics import StepMetrics, install_http_hooks
+from lib.tenants import SharedServices, Tenant, load_tenants
+from lib.tracing import STATUS_ERROR, TraceContextFilter, Tracer, prune_traces, start_span
+from lib.transport import github_client, openai_client
+
+if TYPE_CHECKING:
+    from lib.profiling import StepProfiler
 
 # Import sales pipeline module
 try:
@@ -91,16 +158,16 @@ except ImportError:
 
 
 def configure_logging() -> logging.Logger:
-    """Configure structured logging with env-driven levels and run identifiers."""
-    # Simpler logging for demo/test runs: do not pre-populate `run_id` on the
-    # LogRecord to avoid conflicts when callers pass `extra={'run_id': ...}`.
-    level_name = os.getenv("LOG_LEVEL", "INFO").upper()
-    level = getattr(logging, level_name, logging.INFO)
-
-    logging.basicConfig(
-        level=level,
-        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-        datefmt="%Y-%m-%dT%H:%M:%S%z",
+    """Configure structured logging with env-driven levels and run identifiers.
+
+    Records are written by a background thread (see ``lib.logging_setup``);
+    ``LOG_FORMAT=json`` switches to one JSON object per line.
+    """
+    # Fill tenant/run_id/stage/step into every line from the current trace
+    # span; filters run on the calling thread, before the record is queued
+    setup_logging(
+        text_format="%(asctime)s [%(levelname)s] %(name)s: %(message)s%(trace_context)s",
+        filters=[TraceContextFilter()],
     )
 
     logger = logging.getLogger(__name__)
@@ -110,29 +177,18 @@ def configure_logging() -> logging.Logger:
 
 logger = configure_logging()
 
-# Third-party imports (with fallback for demo mode)
-try:
-    from dotenv import load_dotenv
-    from openai import (
-        APIConnectionError,
-        APITimeoutError,
-        APIStatusError,
-        OpenAI,
-        RateLimitError,
-    )
-    from github import (
-        BadCredentialsException,
-        Github,
-        GithubException,
-        RateLimitExceededException,
-        UnknownObjectException,
-    )
-    HAS_DEPS = True
-except ImportError:
-    HAS_DEPS = False
+# Third-party SDKs (dotenv, openai, PyGithub) are imported lazily on the code
+# paths that use them; importing openai alone takes longer than a demo run.
+# Availability is checked with find_spec, which does not import anything.
+HAS_DEPS = not missing_modules(REQUIRED_MODULES)
+if not HAS_DEPS:
     logger.warning("⚠️  Missing dependencies. Install with: pip install -r scripts/requirements.txt")
     logger.warning("   Running in DEMO MODE (no actual API calls)")
 
+if TYPE_CHECKING:
+    from github import Github
+    from openai import OpenAI
+
 
 @dataclass
 class AutomationConfig:
@@ -148,6 +204,8 @@ class AutomationConfig:
     def load(cls, demo_mode: bool, project_root: Path) -> "AutomationConfig":
         """Load configuration from environment variables with sensible defaults."""
         if HAS_DEPS:
+            from dotenv import load_dotenv
+
             load_dotenv(project_root / ".env.local")
 
         output_dir = Path(os.getenv("OUTPUT_DIR", project_root / "output"))
@@ -183,6 +241,12 @@ class RunStepRecord(TypedDict, total=False):
     step: str
     status: str
     error: str
+    duration_sec: float
+    cpu_sec: float
+    rss_peak_delta_kb: int
+    http_calls: int
+    http_bytes_sent: int
+    http_bytes_received: int
 
 
 
@@ -193,12 +257,34 @@ class DailyAutomation:
     GitHub issue creation, and structured output generation.
     """
 
-    def __init__(self, demo_mode: bool = False):
+    def __init__(
+        self,
+        demo_mode: bool = False,
+        incremental: bool = False,
+        use_cache: bool = True,
+        stream: bool = False,
+        profile: bool = False,
+        tenant: Optional[Tenant] = None,
+        shared: Optional[SharedServices] = None,
+    ):
         """Set up paths, clients, and runtime mode.
 
         Args:
             demo_mode: When True, skip external API calls and use stubbed data so the
                 script can run safely without network access.
+            incremental: When True, only notes that are new or changed since the
+                last successful run are summarized.
+            use_cache: When False, always call OpenAI instead of reusing a cached
+                summary for an identical prompt.
+            stream: When True, stream the summary completion and start creating
+                GitHub issues for action items as soon as each one is complete.
+            profile: When True, profile every step (cProfile, tracemalloc and a
+                stack sampler) into ``output/profiles/<run_id>/``; steps then run
+                one at a time.
+            tenant: Repository, notes and output directory to use instead of
+                ``REPO_NAME``, ``NOTES_SOURCE`` and ``OUTPUT_DIR``.
+            shared: API clients, rate limits and sales data shared with other
+                tenants running in the same process (see ``lib.tenants``).
 
         Side Effects:
             - Creates local output and notes directories if they do not exist.
@@ -210,7 +296,19 @@ class DailyAutomation:
         # dependencies are missing. Missing deps are a runtime error unless the
         # user explicitly opts into demo mode.
         self.demo_mode = demo_mode
+        self.incremental = incremental
+        self.stream = stream
+        self.profile = profile
+        self.tenant = tenant
+        self.shared = shared
         self.config = AutomationConfig.load(self.demo_mode, self.project_root)
+        if tenant is not None:
+            self.config = dataclasses.replace(
+                self.config,
+                repo_name=tenant.repo_name,
+                output_dir=tenant.output_dir,
+                notes_source=tenant.notes_source,
+            )
 
         # If runtime dependencies are not present and the user did not request
         # demo mode, fail fast with a clear message.
@@ -235,18 +333,81 @@ class DailyAutomation:
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.notes_source.mkdir(parents=True, exist_ok=True)
 
+        # Size/mtime/hash of every note seen by the last successful run
+        self.notes_manifest = NotesManifest(
+            self.output_dir / "notes_manifest.json",
+            self.notes_source,
+            max_workers=int(os.getenv("NOTES_READ_WORKERS", "8")),
+            max_bytes=int(os.getenv("NOTES_MAX_BYTES", str(5 * 1024 * 1024))),
+        )
+        self.notes_delta: Optional[NotesDelta] = None
+
+        # Append-only audit trail of every run's output (output/audit/daily/)
+        self.audit_store = AuditStore(self.output_dir / "audit" / "daily")
+
+        # Every run's summary, for step duration/failure trends (see lib/run_history.py)
+        self.run_history_path: Optional[Path] = None
+        if os.getenv("RUN_HISTORY", "on").lower() != "off":
+            self.run_history_path = self.output_dir / "run_history.sqlite3"
+
+        # Identical prompts (re-runs, cron retries) reuse the previous response
+        self.summary_cache: Optional[LLMCache] = None
+        if use_cache:
+            self.summary_cache = LLMCache(
+                self.output_dir / "llm_cache",
+                ttl_seconds=float(os.getenv("LLM_CACHE_TTL_HOURS", "168")) * 3600,
+                max_bytes=int(float(os.getenv("LLM_CACHE_MAX_MB", "50")) * 1024 * 1024),
+            )
+
+        # Note sets over this prompt budget are summarized in batches (map-reduce)
+        self.token_counter = TokenCounter(SUMMARY_MODEL)
+        self.summary_prompt_budget = int(os.getenv("SUMMARY_PROMPT_TOKENS", "6000"))
+        self.summary_output_tokens = min(
+            int(os.getenv("SUMMARY_MAX_OUTPUT_TOKENS", "1000")), SUMMARY_OUTPUT_TOKEN_LIMIT
+        )
+
         # Initialize clients
-        self.openai_client: Optional[OpenAI] = None
-        self.github_client: Optional[Github] = None
+        self.openai_client: Optional["OpenAI"] = None
+        self.github_client: Optional["Github"] = None
         self.repo = None
+        # Paces issue creation to stay under GitHub's secondary rate limits
+        # (shared by all tenants, since the limits apply per token)
+        self.github_pacer = shared.github_pacer if shared is not None else MutationPacer(
+            min_interval=float(os.getenv("GITHUB_MUTATION_INTERVAL", "1.0"))
+        )
+        # Caps OpenAI requests in flight when tenants share the client
+        self.openai_slots: ContextManager[Any] = (
+            shared.openai_slots if shared is not None else contextlib.nullcontext()
+        )
+
+        # Local mirror of open automation issues, used to avoid re-filing
+        # the same action item every day (ISSUE_DEDUPE=off disables it)
+        self.issue_index: Optional[IssueIndex] = None
+        # Issue creation started from streamed action items, collected later
+        self._early_issue_creator: Optional[IssueCreator] = None
+        self._submitted_issue_keys: set[str] = set()
+
+        # Set by watch(): re-runs reuse sales data pulled within the refresh window
+        # and only file GitHub issues when explicitly asked to
+        self.watching = False
+        self.create_issues = True
+        self._sales_pipeline_cache: Optional[Tuple[float, Optional[Dict[str, Any]]]] = None
 
         if not self.demo_mode:
             self._initialize_clients()
+            if os.getenv("ISSUE_DEDUPE", "on").lower() not in ("0", "off", "false"):
+                self.issue_index = IssueIndex(
+                    self.output_dir / "issue_index.json",
+                    repo_name=self.config.repo_name or "",
+                    token=self.config.github_token,
+                    match_threshold=float(os.getenv("ISSUE_MATCH_THRESHOLD", "0.9")),
+                )
 
         logger.info(
             "Initialized DailyAutomation",
             extra={
                 "demo_mode": self.demo_mode,
+                "incremental": self.incremental,
                 "output_dir": str(self.output_dir),
                 "notes_source": str(self.notes_source),
             },
@@ -282,24 +443,26 @@ class DailyAutomation:
             )
             raise RuntimeError(msg)
 
-        # Initialize API clients
-        try:
-            self.openai_client = OpenAI(api_key=self.config.openai_api_key)
-        except Exception as e:
-            logger.error("❌ Failed to initialize OpenAI client.")
-            logger.error("   Verify OPENAI_API_KEY is valid and network access is available.")
-            raise RuntimeError("OpenAI client initialization failed") from e
+        from github import (
+            BadCredentialsException,
+            GithubException,
+            RateLimitExceededException,
+        )
 
-        try:
-            # PyGithub supports multiple authentication styles depending on version.
-            # Prefer the newer `Auth.Token` API when available, otherwise fall back
-            # to the legacy `Github(<token>)` constructor.
-            try:
-                from github import Auth  # type: ignore
+        # Tenants share one pair of clients (and their connection pools);
+        # the first tenant to get here creates them
+        shared = self.shared
+        with shared.clients_lock if shared is not None else contextlib.nullcontext():
+            if shared is not None and shared.openai_client is not None:
+                self.openai_client = shared.openai_client
+                self.github_client = shared.github_client
+            else:
+                self._create_api_clients()
+                if shared is not None:
+                    shared.openai_client = self.openai_client
+                    shared.github_client = self.github_client
 
-                self.github_client = Github(auth=Auth.Token(self.config.github_token))
-            except Exception:
-                self.github_client = Github(self.config.github_token)
+        try:
             self.repo = self.github_client.get_repo(self.config.repo_name)
             logger.info(
                 "✓ API clients initialized successfully",
@@ -324,13 +487,33 @@ class DailyAutomation:
             logger.error(f"❌ Failed to initialize GitHub client: {e}")
             raise RuntimeError("GitHub client initialization failed") from e
 
+    def _create_api_clients(self) -> None:
+        """Create the OpenAI and GitHub clients from the configured credentials.
+
+        Both come from ``lib.transport``, which sizes their connection pools,
+        timeouts and retries and shares them with other callers in the process.
+        """
+        try:
+            self.openai_client = openai_client(self.config.openai_api_key)
+        except Exception as e:
+            logger.error("❌ Failed to initialize OpenAI client.")
+            logger.error("   Verify OPENAI_API_KEY is valid and network access is available.")
+            raise RuntimeError("OpenAI client initialization failed") from e
+
+        try:
+            self.github_client = github_client(self.config.github_token)
+        except Exception as e:
+            logger.error(f"❌ Failed to initialize GitHub client: {e}")
+            raise RuntimeError("GitHub client initialization failed") from e
+
     def ingest_notes(self) -> List[str]:
         """Load text notes that feed the automation run.
 
         Returns:
             A list of note strings gathered from Markdown or text files in the
             configured notes directory. If no files are found, a small set of demo
-            notes is returned.
+            notes is returned. In incremental mode only new or changed notes are
+            returned, and an empty list means nothing changed.
 
         Side Effects:
             Logs progress and warnings; creates the notes directory if missing during
@@ -342,26 +525,35 @@ class DailyAutomation:
         if self.notes_source.exists():
             notes.extend(self._read_notes_from_disk())
 
-        if not notes:
+        if not notes and not self.incremental:
             notes = self._demo_notes()
 
         logger.info(f"✓ Ingested {len(notes)} notes")
         return notes
 
     def _read_notes_from_disk(self) -> List[str]:
-        """Read markdown and text notes from the notes directory."""
+        """Read markdown and text notes, using the manifest to find what changed."""
+        delta = self.notes_manifest.scan(read_unchanged=not self.incremental)
+        self.notes_delta = delta
+        logger.info(
+            f"  Notes since last run: {len(delta.new)} new, {len(delta.changed)} changed, "
+            f"{len(delta.removed)} removed, {len(delta.unchanged)} unchanged"
+        )
+
         notes = []
-        for pattern in ["**/*.md", "**/*.txt"]:
-            for file_path in self.notes_source.glob(pattern):
-                try:
-                    content = file_path.read_text(encoding="utf-8")
-                    if content.strip():
-                        notes.append(content.strip())
-                        logger.debug(f"  Loaded: {file_path.name}")
-                except Exception as e:
-                    logger.warning(f"  Failed to read {file_path}: {e}")
+        for note in delta.modified if self.incremental else delta.all_notes:
+            if note.content.strip():
+                notes.append(note.content.strip())
+                logger.debug("  Loaded: %s", note.path)
         return notes
 
+    def _commit_notes_manifest(self) -> None:
+        """Make the current notes scan the baseline for the next run."""
+        try:
+            self.notes_manifest.commit()
+        except Exception as e:
+            logger.warning(f"Failed to save notes manifest: {e}")
+
     def _demo_notes(self) -> List[str]:
         """Return fallback demo notes when no files are available."""
         logger.info("  No notes found, using demo data")
@@ -395,11 +587,16 @@ class DailyAutomation:
             logger.info("  Running in demo mode (stubbed)")
             return self._generate_demo_summary(notes)
 
+        from openai import APIConnectionError, APIStatusError, APITimeoutError, RateLimitError
+
         try:
             notes_text = self._format_notes_for_prompt(notes)
             prompt = self._build_summary_prompt(notes_text)
-            response = self._request_summary(prompt)
-            return self._parse_summary_response(response)
+            if self.token_counter.count(prompt) <= self.summary_prompt_budget:
+                stream_issues = self.stream and self.repo and self.create_issues
+                on_action_item = self._submit_early_action_item if stream_issues else None
+                return self._cached_summary(prompt, on_action_item=on_action_item)
+            return self._map_reduce_summary(notes)
         except RateLimitError as e:
             logger.error("❌ OpenAI rate limit reached while generating summary.")
             logger.error("   Wait before retrying or reduce request volume.")
@@ -420,7 +617,7 @@ class DailyAutomation:
             logger.error(f"OpenAI API error: {e}")
 
         logger.info("  Falling back to demo summary")
-        return self._generate_demo_summary(notes)
+        return self._fallback_summary(notes)
 
     def _format_notes_for_prompt(self, notes: List[str]) -> str:
         """Format notes into a numbered list suitable for prompts."""
@@ -438,32 +635,181 @@ class DailyAutomation:
             "Format as JSON with keys: highlights, action_items, assessment"
         )
 
-    def _request_summary(self, prompt: str) -> Any:
-        """Call the OpenAI API to generate a summary."""
-        return self.openai_client.chat.completions.create(
-            model="gpt-4-turbo-preview",
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that summarizes daily work notes."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=500,
-            timeout=30.0,
+    def _map_reduce_summary(self, notes: List[str]) -> Dict[str, Any]:
+        """Summarize notes in token-budgeted batches, then merge the partials."""
+        overhead = self.token_counter.count(self._build_summary_prompt(""))
+        batches = batch_notes(notes, max(256, self.summary_prompt_budget - overhead), self.token_counter)
+        logger.info(f"  Notes exceed the prompt budget; summarizing {len(batches)} batches")
+        return map_reduce(
+            batches,
+            summarize=self._summarize_batch,
+            reduce=self._reduce_summaries,
+            max_workers=int(os.getenv("SUMMARY_WORKERS", "4")),
         )
 
+    def _summarize_batch(self, batch: List[str]) -> Dict[str, Any]:
+        """Summarize one map-reduce batch.
+
+        A non-JSON (e.g. truncated) answer is not used as a partial, since its
+        placeholder action item would replace the batch's real ones: the batch
+        is split in half and each half summarized again.
+
+        Raises:
+            ValueError: if a single note still gets a non-JSON answer.
+        """
+        summary = self._cached_summary(self._build_summary_prompt(self._format_notes_for_prompt(batch)))
+        if summary.get("assessment") != NON_JSON_ASSESSMENT:
+            return summary
+        if len(batch) == 1:
+            raise ValueError("OpenAI returned a non-JSON summary for a single note")
+        logger.warning(f"Non-JSON summary for a batch of {len(batch)} notes; splitting it")
+        middle = len(batch) // 2
+        return merge_partials([self._summarize_batch(batch[:middle]), self._summarize_batch(batch[middle:])])
+
+    def _reduce_summaries(self, partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Combine partial summaries with one more OpenAI call (merged locally on failure)."""
+        prompt = (
+            "Combine these partial summaries of one day's notes into a single structured summary:\n\n"
+            f"{json.dumps(partials, indent=2, ensure_ascii=False)}\n\n"
+            "Keep:\n"
+            "1. Key highlights (2-4 bullet points)\n"
+            "2. All distinct action items with priorities (merge duplicates)\n"
+            "3. Brief overall assessment\n\n"
+            "Format as JSON with keys: highlights, action_items, assessment"
+        )
+        # Room for every partial's action items, plus highlights and assessment
+        items = [item for partial in partials for item in partial.get("action_items") or []]
+        max_tokens = min(
+            max(self.summary_output_tokens, self.token_counter.count(json.dumps(items, ensure_ascii=False)) + 400),
+            SUMMARY_OUTPUT_TOKEN_LIMIT,
+        )
+        try:
+            summary = self._cached_summary(prompt, max_tokens=max_tokens)
+        except Exception as e:
+            logger.warning(f"Reduce step failed, merging partial summaries locally: {e}")
+            return merge_partials(partials)
+        if summary.get("assessment") == NON_JSON_ASSESSMENT:
+            logger.warning("Reduce step returned a non-JSON summary, merging partial summaries locally")
+            return merge_partials(partials)
+        return summary
+
+    def _cached_summary(
+        self,
+        prompt: str,
+        on_action_item: Optional[Callable[[Any], None]] = None,
+        max_tokens: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Return the summary for ``prompt``, from the response cache when possible.
+
+        When streaming, ``on_action_item`` is called with each action item as
+        soon as it has been received (cache hits do not call it).
+        ``max_tokens`` defaults to ``SUMMARY_MAX_OUTPUT_TOKENS``.
+        """
+        max_tokens = max_tokens or self.summary_output_tokens
+        key = cache_key(SUMMARY_MODEL, SUMMARY_TEMPERATURE, SUMMARY_SYSTEM_PROMPT, prompt)
+        if self.summary_cache is not None:
+            cached = self.summary_cache.get(key)
+            if cached is not None:
+                logger.info("  Using cached summary (identical prompt)")
+                return self._parse_summary_content(cached["content"], cached["model"])
+
+        if self.stream:
+            content, model = self._stream_summary(prompt, on_action_item, max_tokens=max_tokens)
+        else:
+            response = self._request_summary(prompt, max_tokens=max_tokens)
+            content, model = response.choices[0].message.content, response.model
+        summary = self._parse_summary_content(content, model)
+
+        # Only pin well-formed responses; a non-JSON answer is retried next run
+        if self.summary_cache is not None and summary.get("assessment") != NON_JSON_ASSESSMENT:
+            try:
+                self.summary_cache.put(key, content, model)
+            except Exception as e:
+                logger.warning(f"Failed to cache summary response: {e}")
+        return summary
+
+    def _request_summary(self, prompt: str, max_tokens: Optional[int] = None) -> Any:
+        """Call the OpenAI API to generate a summary."""
+        with self.openai_slots:
+            return self.openai_client.chat.completions.create(
+                model=SUMMARY_MODEL,
+                messages=[
+                    {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=SUMMARY_TEMPERATURE,
+                max_tokens=max_tokens or self.summary_output_tokens,
+                timeout=30.0,
+            )
+
+    def _stream_summary(
+        self,
+        prompt: str,
+        on_action_item: Optional[Callable[[Any], None]] = None,
+        max_tokens: Optional[int] = None,
+    ) -> Tuple[str, str]:
+        """Stream a summary completion, surfacing list items as they complete.
+
+        The timeout applies between received chunks rather than to the whole
+        completion, so long responses are not cut off while still arriving.
+
+        Returns:
+            The full response text and the model that produced it.
+        """
+        with self.openai_slots:
+            stream = self.openai_client.chat.completions.create(
+                model=SUMMARY_MODEL,
+                messages=[
+                    {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=SUMMARY_TEMPERATURE,
+                max_tokens=max_tokens or self.summary_output_tokens,
+                timeout=30.0,
+                stream=True,
+            )
+
+            parser = JsonStreamParser(("highlights", "action_items"))
+            parts: List[str] = []
+            model = SUMMARY_MODEL
+            started = time.monotonic()
+            first_item: Optional[float] = None
+
+            for chunk in stream:
+                model = getattr(chunk, "model", None) or model
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                parts.append(delta)
+                for key, value in parser.feed(delta):
+                    if first_item is None:
+                        first_item = time.monotonic() - started
+                        logger.info(f"  First summary item after {first_item:.2f}s")
+                    logger.debug("  Streamed %s: %s", key, value)
+                    if key == "action_items" and on_action_item is not None:
+                        on_action_item(value)
+
+        logger.info(f"  Streamed summary in {time.monotonic() - started:.2f}s")
+        return "".join(parts), model
+
     def _parse_summary_response(self, response: Any) -> Dict[str, Any]:
         """Parse the OpenAI response into structured summary data."""
-        content = response.choices[0].message.content
+        return self._parse_summary_content(response.choices[0].message.content, response.model)
+
+    def _parse_summary_content(self, content: str, model: str) -> Dict[str, Any]:
+        """Parse summary JSON text into structured summary data."""
         try:
             summary_data = json.loads(content)
         except json.JSONDecodeError:
             summary_data = {
                 "highlights": [content[:200]],
                 "action_items": ["Review generated summary"],
-                "assessment": "AI generated summary (non-JSON response)"
+                "assessment": NON_JSON_ASSESSMENT,
             }
 
-        logger.info(f"✓ Generated summary using {response.model}")
+        logger.info(f"✓ Generated summary using {model}")
         return summary_data
 
     def _generate_demo_summary(self, notes: List[str]) -> Dict[str, Any]:
@@ -482,6 +828,14 @@ class DailyAutomation:
             "assessment": "Key outcomes: 3 actionable items identified. Sales pipeline automation is high-priority."
         }
 
+    def _fallback_summary(self, notes: List[str]) -> Dict[str, Any]:
+        """Demo summary used when generating the real one failed.
+
+        It is flagged with ``fallback`` so the run does not mark the notes as
+        summarized.
+        """
+        return {**self._generate_demo_summary(notes), "fallback": True}
+
     def create_github_issues(self, action_items: List[str]) -> List[Dict[str, Any]]:
         """Create GitHub issues for each action item.
 
@@ -492,13 +846,16 @@ class DailyAutomation:
             A list of dicts describing the created or demo issues (with ``number``, ``title``, ``url``, ``labels``).
 
         Side Effects:
-            - Creates real GitHub issues when not in demo mode.
+            - Creates real GitHub issues when not in demo mode, on a bounded
+              thread pool paced for GitHub's secondary rate limits. Items that
+              hit a rate limit are retried after the reset instead of dropped.
             - Logs results for each issue created.
         """
         logger.info("📋 Creating GitHub issues...")
         created_issues = []
+        creator, self._early_issue_creator = self._early_issue_creator, None
 
-        if not action_items:
+        if not action_items and creator is None:
             logger.info("  No action items to create issues from")
             return created_issues
 
@@ -506,14 +863,32 @@ class DailyAutomation:
             logger.info("  Running in demo mode (stubbed)")
             return self._demo_issues(action_items)
 
-        for item in action_items:
+        from github import (
+            BadCredentialsException,
+            GithubException,
+            RateLimitExceededException,
+            UnknownObjectException,
+        )
+
+        # Items already submitted while the summary was streaming are skipped
+        if creator is None:
+            creator = self._start_issue_creation()
+        with creator:
+            for item in action_items:
+                self._submit_action_item(creator, item)
+
+            # Results come back in submission order regardless of completion order
+            results = creator.results()
+        if not results:
+            logger.info("✓ All action items already have open issues")
+            return created_issues
+
+        for result in results:
+            item = result.item
             try:
-                # Skip invalid items (None, empty, or whitespace-only)
-                if item is None or not str(item).strip():
-                    logger.warning(f"  Skipping empty or invalid action item")
-                    continue
-                    
-                issue = self._create_issue_from_item(str(item))
+                if result.error is not None:
+                    raise result.error
+                issue = result.issue
                 created_issues.append({
                     "number": issue.number,
                     "title": issue.title,
@@ -521,6 +896,8 @@ class DailyAutomation:
                     "labels": [label.name for label in issue.labels],
                 })
                 logger.info(f"  Created issue #{issue.number}: {issue.title}")
+                if self.issue_index is not None:
+                    self.issue_index.add(issue.number, issue.title, issue.html_url)
             except ValueError as e:
                 logger.warning(f"Skipping invalid action item: {e}")
                 continue
@@ -532,7 +909,7 @@ class DailyAutomation:
                 except Exception:
                     reset_time = 'unknown'
                 logger.error(f"   Rate limit resets at: {reset_time}")
-                logger.error("   Wait before retrying or reduce request volume.")
+                logger.error(f"   Gave up after {result.attempts} attempts.")
                 logger.debug(f"GitHub rate limit details: {e}")
             except UnknownObjectException as e:
                 logger.error(f"❌ Repository or resource not found: {self.config.repo_name}")
@@ -550,9 +927,66 @@ class DailyAutomation:
                 logger.error(f"Unexpected error creating issue: {e}")
                 logger.info("  Continuing with partial results...")
 
+        if self.issue_index is not None:
+            try:
+                self.issue_index.save()
+            except Exception as e:
+                logger.warning(f"Failed to save issue index: {e}")
+
         logger.info(f"✓ Created {len(created_issues)} GitHub issues")
         return created_issues
 
+    def _start_issue_creation(self) -> IssueCreator:
+        """Sync the issue index and return a creator that accepts items as they arrive."""
+        from github import RateLimitExceededException
+
+        if self.issue_index is not None:
+            try:
+                self.issue_index.sync()
+            except Exception as e:
+                logger.warning(f"Issue index sync failed; duplicate check uses cached index: {e}")
+        self._submitted_issue_keys = set()
+        return IssueCreator(
+            self._create_issue_from_item,
+            max_workers=int(os.getenv("GITHUB_ISSUE_WORKERS", "4")),
+            pacer=self.github_pacer,
+            rate_limit_errors=(RateLimitExceededException,),
+            quota_fn=self._github_quota,
+        )
+
+    def _submit_action_item(self, creator: IssueCreator, item: Any) -> None:
+        """Queue one action item, skipping invalid items, repeats and existing issues."""
+        # Skip invalid items (None, empty, or whitespace-only)
+        if item is None or not str(item).strip():
+            logger.warning(f"  Skipping empty or invalid action item")
+            return
+        text = str(item)
+        title = text[:100].strip()
+        key = normalize_title(title)
+        if key in self._submitted_issue_keys:
+            logger.debug("  Skipping repeated action item: %s", title)
+            return
+        self._submitted_issue_keys.add(key)
+        if self.issue_index is not None:
+            existing = self.issue_index.find_duplicate(title)
+            if existing is not None:
+                logger.info(f"  Skipping duplicate of #{existing['number']}: {title}")
+                return
+        creator.submit(text)
+
+    def _submit_early_action_item(self, item: Any) -> None:
+        """Start creating an issue for an action item received mid-stream."""
+        if self._early_issue_creator is None:
+            self._early_issue_creator = self._start_issue_creation()
+        self._submit_action_item(self._early_issue_creator, item)
+
+    def _github_quota(self) -> Optional[Tuple[int, float]]:
+        """Remaining primary GitHub quota and its reset time, from the last response."""
+        if not self.github_client:
+            return None
+        remaining, _limit = self.github_client.rate_limiting
+        return remaining, float(self.github_client.rate_limiting_resettime)
+
     def _demo_issues(self, action_items: List[str]) -> List[Dict[str, Any]]:
         """Generate stub issue data for demo mode."""
         return [
@@ -612,11 +1046,10 @@ class DailyAutomation:
             
             # Save to main output file
             pipeline_file = self.output_dir / "sales_pipeline.json"
-            pipeline_file.write_text(
-                json.dumps(pipeline_data.to_dict(), indent=2),
-                encoding="utf-8"
-            )
-            logger.info(f"  Saved: {pipeline_file}")
+            if write_json(pipeline_file, pipeline_data.to_dict()):
+                logger.info(f"  Saved: {pipeline_file}")
+            else:
+                logger.info(f"  Unchanged: {pipeline_file}")
             
             # Save to cache
             try:
@@ -647,6 +1080,28 @@ class DailyAutomation:
             logger.debug("Sales pipeline pull error details:", exc_info=True)
             return None
 
+    def _sales_pipeline_for_run(self) -> Optional[Dict[str, Any]]:
+        """Pull sales data, or reuse a pull shared by this process.
+
+        With ``--tenants`` the pipeline is pulled once and copied into every
+        tenant's output directory. Note edits do not change the pipeline, so
+        ``--watch`` re-runs only pull again once ``WATCH_SALES_REFRESH_MIN``
+        has passed.
+        """
+        if self.shared is not None:
+            data = self.shared.sales_pipeline(self.pull_sales_pipeline_data)
+            if data is not None:
+                write_json(self.output_dir / "sales_pipeline.json", data)
+            return data
+        if self.watching and self._sales_pipeline_cache is not None:
+            pulled_at, data = self._sales_pipeline_cache
+            if time.monotonic() - pulled_at < float(os.getenv("WATCH_SALES_REFRESH_MIN", "60")) * 60:
+                logger.info("📊 Reusing sales pipeline data from this watch session")
+                return data
+        data = self.pull_sales_pipeline_data()
+        self._sales_pipeline_cache = (time.monotonic(), data)
+        return data
+
     def save_output(self, notes: List[str], summary: Dict[str, Any], issues: List[Dict[str, Any]], pipeline_data: Optional[Dict[str, Any]] = None) -> Path:
         """Save the daily run's output to a timestamped JSON file.
 
@@ -660,7 +1115,9 @@ class DailyAutomation:
             The absolute Path to the saved output file.
 
         Side Effects:
-            - Writes a JSON file to the ``output/`` directory.
+            - Writes a JSON file to the ``output/`` directory (atomically; readers
+              never see a partial file).
+            - Appends an audit record to ``output/audit/daily/``.
             - Creates the directory if it does not exist.
             - Logs the saved file path.
         """
@@ -711,15 +1168,17 @@ class DailyAutomation:
                 "timestamp": pipeline_data.get("timestamp", ""),
             }
 
+        # Serialize once; the output file and the audit record share the bytes
+        payload = dumps_json(output_data)
+
         # Save main output
         output_file = self.output_dir / "daily_summary.json"
-        output_file.write_text(json.dumps(output_data, indent=2, ensure_ascii=False), encoding="utf-8")
+        write_atomic(output_file, payload)
         logger.info(f"  Saved: {output_file}")
 
-        # Save audit log
-        log_file = self.output_dir / f"audit_{timestamp.strftime('%Y%m%d_%H%M%S')}.json"
-        log_file.write_text(json.dumps(output_data, indent=2, ensure_ascii=False), encoding="utf-8")
-        logger.info(f"  Saved: {log_file}")
+        # Append to the audit log
+        self.audit_store.append(output_data, record_type="daily_summary", ts=timestamp, payload=payload)
+        logger.info(f"  Audit record appended: {self.audit_store.directory}")
 
         logger.info("✓ Output saved successfully")
         return output_file
@@ -745,26 +1204,49 @@ class DailyAutomation:
             "steps": steps,
             "artifacts": artifacts,
         }
+        if self.notes_delta is not None:
+            run_summary["notes_delta"] = self.notes_delta.summary()
+        run_summary["llm_cache"] = {
+            "enabled": self.summary_cache is not None,
+            **(self.summary_cache.stats() if self.summary_cache else {"hits": 0, "misses": 0}),
+        }
 
         run_file = self.output_dir / "run.json"
-        run_file.write_text(
-            json.dumps(run_summary, indent=2, ensure_ascii=False),
-            encoding="utf-8",
-        )
+        write_json(run_file, run_summary)
 
         logger.info(f"📄 Saved run summary: {run_file}")
+        self._record_run_history(run_summary)
         return run_file
 
+    def _record_run_history(self, run_summary: Dict[str, Any]) -> None:
+        """Add the run to the history database; never fails the run."""
+        if self.run_history_path is None:
+            return
+        try:
+            with RunHistory(self.run_history_path) as history:
+                history.record_run(run_summary)
+            logger.debug(f"  Run recorded in {self.run_history_path}")
+        except Exception as e:
+            logger.warning(f"⚠️  Could not record run history: {e}")
+
     def run(self) -> int:
         """Execute the daily automation workflow from start to finish.
 
         Steps performed:
             1. Ingest notes from configured source.
             2. Generate summary (using OpenAI or demo fallback).
-            3. Pull sales pipeline data (new feature).
+            3. Pull sales pipeline data (concurrently with step 2).
             4. Create GitHub issues from action items (skipped in demo mode).
             5. Save outputs to disk.
 
+        Steps 2-5 run as a dependency graph (see ``lib.step_graph``), so
+        independent steps overlap while each keeps its ``allow_failure``
+        behaviour and ``run.json`` step record.
+
+        The run, its steps and their outbound API calls are recorded as
+        nested spans (see ``lib.tracing``) and exported to
+        ``output/traces/<run_id>.json`` unless ``TRACING=off``.
+
         Returns:
             0 on success, 1 on failure.
 
@@ -774,7 +1256,107 @@ class DailyAutomation:
             - Saves output JSON files to the ``output/`` directory.
         """
         run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        install_http_hooks()  # per-step HTTP call/byte counts and spans
+
+        # Trace of the run (steps and their API calls) in output/traces/
+        tracer: Optional[Tracer] = None
+        trace_file: Optional[Path] = None
+        if os.getenv("TRACING", "on").lower() != "off":
+            tracer = Tracer(
+                "avidelta-daily",
+                {
+                    "deployment.environment": "demo" if self.demo_mode else "production",
+                    **({"tenant": self.tenant.name} if self.tenant is not None else {}),
+                },
+            )
+            trace_file = self.output_dir / "traces" / f"{run_id}.json"
+
+        attributes: Dict[str, Any] = {"run_id": run_id, "demo_mode": self.demo_mode}
+        if self.tenant is not None:
+            attributes["tenant"] = self.tenant.name
+        with start_span("daily-run", attributes, tracer=tracer) as span:
+            try:
+                exit_code = self._run(run_id, trace_file)
+            finally:
+                # Issues started mid-stream but never collected (the run failed first)
+                creator, self._early_issue_creator = self._early_issue_creator, None
+                if creator is not None:
+                    creator.close()
+            span.set_attribute("exit_code", exit_code)
+            if exit_code != 0:
+                span.set_status(STATUS_ERROR, "run failed")
+
+        if tracer is not None and trace_file is not None:
+            try:
+                tracer.export(trace_file)
+                prune_traces(trace_file.parent, keep=int(os.getenv("TRACE_KEEP", "30")))
+                logger.info(f"🧭 Saved trace ({len(tracer.spans)} spans): {trace_file}")
+            except Exception as e:
+                logger.warning(f"⚠️  Could not export trace: {e}")
+        return exit_code
+
+    def watch(self, create_issues: bool = False) -> int:
+        """Run once, then re-run incrementally whenever the notes change.
+
+        Clients, the summary cache and the issue index stay loaded between
+        runs, so an edit is summarized within seconds of being saved. Edits
+        are debounced (``WATCH_DEBOUNCE_SEC``) into one run; only new or
+        changed notes are summarized. Stops on Ctrl-C or SIGTERM after the
+        current run finishes.
+
+        Args:
+            create_issues: Also file GitHub issues on every run. Off by
+                default, since a half-written note would otherwise turn
+                into issues on each save.
+
+        Returns:
+            The exit code of the last run.
+        """
+        import signal
+
+        from lib.notes_watcher import create_watcher, wait_for_changes
+
+        self.incremental = True
+        self.watching = True
+        self.create_issues = create_issues
+        stop = threading.Event()
+
+        def request_stop(signum: int, frame: Any) -> None:
+            logger.info("🛑 Stopping watch after the current run")
+            stop.set()
+
+        previous = {sig: signal.signal(sig, request_stop) for sig in (signal.SIGINT, signal.SIGTERM)}
+        watcher = create_watcher(
+            self.notes_source,
+            poll_interval=float(os.getenv("WATCH_POLL_SEC", "2")),
+            exclude=[self.output_dir] if self.output_dir != self.notes_source else [],
+        )
+        try:
+            exit_code = self.run()
+            debounce = float(os.getenv("WATCH_DEBOUNCE_SEC", "2"))
+            while wait_for_changes(watcher, debounce, stop):
+                logger.info("📝 Notes changed; re-running")
+                exit_code = self.run()
+        finally:
+            watcher.close()
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+        return exit_code
+
+    def _run(self, run_id: str, trace_file: Optional[Path]) -> int:
+        """Run the workflow for ``run()`` inside its root span."""
         started_at = datetime.now(timezone.utc)
+        if self.summary_cache is not None:
+            self.summary_cache.reset_stats()  # run.json counts this run only
+
+        profiler: Optional["StepProfiler"] = None
+        if self.profile:
+            from lib.profiling import StepProfiler
+
+            profiler = StepProfiler(
+                self.output_dir / "profiles" / run_id,
+                top_n=int(os.getenv("PROFILE_TOP_N", "25")),
+            )
 
         logger.info(
             "RUN_START",
@@ -784,9 +1366,14 @@ class DailyAutomation:
         overall_failed = False
         steps: List[RunStepRecord] = []
         artifacts: Dict[str, str] = {}
+        if profiler is not None:
+            artifacts["profiles"] = str(profiler.directory)
+        if trace_file is not None:
+            artifacts["trace"] = str(trace_file)
 
         try:
             # ── INGEST ─────────────────────────────────────────────
+            ingest_metrics = StepMetrics()
             try:
                 ok, notes = run_step(
                     run_id=run_id,
@@ -794,10 +1381,23 @@ class DailyAutomation:
                     step="load-notes",
                     fn=self.ingest_notes,
                     allow_failure=False,   # ingest is mandatory
+                    metrics=ingest_metrics,
+                    profiler=profiler,
                 )
-                steps.append({"stage": "ingest", "step": "load-notes", "status": "success" if ok else "failure"})
+                steps.append({
+                    "stage": "ingest",
+                    "step": "load-notes",
+                    "status": "success" if ok else "failure",
+                    **ingest_metrics.as_record(),  # type: ignore
+                })
             except Exception as e:
-                steps.append({"stage": "ingest", "step": "load-notes", "status": "failure", "error": str(e)})
+                steps.append({
+                    "stage": "ingest",
+                    "step": "load-notes",
+                    "status": "failure",
+                    "error": str(e),
+                    **ingest_metrics.as_record(),  # type: ignore
+                })
                 ended_at = datetime.now(timezone.utc)
                 try:
                     self._write_run_summary(
@@ -814,9 +1414,10 @@ class DailyAutomation:
 
             if not notes:
                 logger.warning(
-                    "No notes found; exiting early",
+                    "No new or changed notes; exiting early" if self.incremental else "No notes found; exiting early",
                     extra={"run_id": run_id}
                 )
+                self._commit_notes_manifest()
                 ended_at = datetime.now(timezone.utc)
                 self._write_run_summary(
                     run_id=run_id,
@@ -828,65 +1429,68 @@ class DailyAutomation:
                 )
                 return 0
 
-            # ── TRANSFORM ──────────────────────────────────────────
-            ok, summary = run_step(
-                run_id=run_id,
-                stage="transform",
-                step="generate-summary",
-                fn=lambda: self._build_summary(notes),
-                allow_failure=True,
-            )
-            steps.append({"stage": "transform", "step": "generate-summary", "status": "success" if ok else "failure"})
-
-            if not ok:
-                overall_failed = True
-                summary = self._generate_demo_summary(notes)
-
-            # ── OPTIONAL DATA ENRICHMENT ───────────────────────────
-            ok_enrich, pipeline_data = run_step(
-                run_id=run_id,
-                stage="enrich",
-                step="sales-pipeline",
-                fn=self.pull_sales_pipeline_data,
-                allow_failure=True,
-            )
-            steps.append({"stage": "enrich", "step": "sales-pipeline", "status": "success" if ok_enrich else "failure"})
-
-            # ── OUTPUT / SIDE EFFECTS ──────────────────────────────
-            ok_issues, issues = run_step(
-                run_id=run_id,
-                stage="output",
-                step="github-issues",
-                fn=lambda: self._handle_issues(summary),
-                allow_failure=True,
-            )
-            steps.append({"stage": "output", "step": "github-issues", "status": "success" if ok_issues else "failure"})
-
-            if not ok_issues:
-                overall_failed = True
-                issues = []
-
-            try:
-                ok_save, output_file = run_step(
-                    run_id=run_id,
+            # ── TRANSFORM / ENRICH / OUTPUT (dependency graph) ─────
+            # Independent steps run concurrently: the sales pipeline pull
+            # does not need the summary, so it overlaps the OpenAI call.
+            graph = [
+                StepSpec(
+                    stage="transform",
+                    step="generate-summary",
+                    fn=lambda deps: self._build_summary(notes),
+                    allow_failure=True,
+                    fallback=lambda: self._fallback_summary(notes),
+                ),
+                StepSpec(
+                    stage="enrich",
+                    step="sales-pipeline",
+                    fn=lambda deps: self._sales_pipeline_for_run(),
+                    allow_failure=True,
+                ),
+            ]
+            if self.create_issues:
+                graph.append(
+                    StepSpec(
+                        stage="output",
+                        step="github-issues",
+                        fn=lambda deps: self._handle_issues(deps["generate-summary"]),
+                        depends_on=("generate-summary",),
+                        allow_failure=True,
+                        fallback=lambda: [],
+                    )
+                )
+            graph.append(
+                StepSpec(
                     stage="output",
                     step="save-output",
-                    fn=lambda: self.save_output(
+                    fn=lambda deps: self.save_output(
                         notes,
-                        summary,
-                        issues,
-                        pipeline_data,
+                        deps["generate-summary"],
+                        deps.get("github-issues", []),
+                        deps["sales-pipeline"],
                     ),
+                    depends_on=tuple(spec.step for spec in graph),
                     allow_failure=False,  # must always persist outputs
                 )
-                steps.append({"stage": "output", "step": "save-output", "status": "success" if ok_save else "failure"})
-                # record artifact
-                try:
-                    artifacts["daily_summary"] = str(output_file)
-                except Exception:
-                    logger.debug("Could not record artifact path", exc_info=True)
-            except Exception as e:
-                steps.append({"stage": "output", "step": "save-output", "status": "failure", "error": str(e)})
+            )
+
+            step_metrics: Dict[str, StepMetrics] = {}
+            try:
+                outcomes = run_graph(
+                    graph,
+                    lambda spec, thunk: run_step(
+                        run_id=run_id,
+                        stage=spec.stage,
+                        step=spec.step,
+                        fn=thunk,
+                        allow_failure=spec.allow_failure,
+                        metrics=step_metrics.setdefault(spec.step, StepMetrics()),
+                        profiler=profiler,
+                    ),
+                    # Profilers are process wide: profile one step at a time
+                    max_workers=1 if profiler is not None else 4,
+                )
+            except StepGraphError as e:
+                steps.extend(self._step_records(e.outcomes, step_metrics))
                 ended_at = datetime.now(timezone.utc)
                 try:
                     self._write_run_summary(
@@ -898,8 +1502,25 @@ class DailyAutomation:
                         artifacts=artifacts,
                     )
                 except Exception:
-                    logger.debug("Failed to persist run summary after save-output failure", exc_info=True)
-                raise
+                    logger.debug(f"Failed to persist run summary after {e.failed.spec.step} failure", exc_info=True)
+                raise e.failed.error or e
+
+            steps.extend(self._step_records(outcomes, step_metrics))
+            results = {o.spec.step: o for o in outcomes}
+            summary_outcome = results["generate-summary"]
+            if summary_outcome.ok and not summary_outcome.result.get("fallback"):
+                self._commit_notes_manifest()
+            else:
+                # Keep the notes pending so the next run summarizes them for real
+                logger.warning("Summary generation failed; notes will be summarized again on the next run")
+            issues_outcome = results.get("github-issues")
+            overall_failed = not (results["generate-summary"].ok and (issues_outcome is None or issues_outcome.ok))
+            issues = issues_outcome.result if issues_outcome is not None else []
+            # record artifact
+            try:
+                artifacts["daily_summary"] = str(results["save-output"].result)
+            except Exception:
+                logger.debug("Could not record artifact path", exc_info=True)
 
             # ── FINALIZATION ───────────────────────────────────────
             ended_at = datetime.now(timezone.utc)
@@ -957,6 +1578,29 @@ class DailyAutomation:
             )
             return 1
 
+    def _step_records(
+        self,
+        outcomes: List[StepOutcome],
+        metrics: Optional[Dict[str, StepMetrics]] = None,
+    ) -> List[RunStepRecord]:
+        """Convert step graph outcomes (and their measured metrics) into run.json step records."""
+        records: List[RunStepRecord] = []
+        for outcome in outcomes:
+            record: RunStepRecord = {
+                "stage": outcome.spec.stage,
+                "step": outcome.spec.step,
+                "status": "success" if outcome.ok else "failure",
+            }
+            if outcome.error is not None:
+                record["error"] = str(outcome.error)
+            step_metrics = (metrics or {}).get(outcome.spec.step)
+            if step_metrics is not None:
+                record.update(step_metrics.as_record())  # type: ignore
+            elif outcome.duration_sec is not None:
+                record["duration_sec"] = round(outcome.duration_sec, 3)
+            records.append(record)
+        return records
+
     def _log_run_header(self) -> None:
         """Print a header banner to indicate run start."""
         logger.info("=" * 60)
@@ -976,7 +1620,7 @@ class DailyAutomation:
         if self.demo_mode:
             logger.info(f"Skipping GitHub issue creation (demo_mode={self.demo_mode})")
             return []
-        if action_items:
+        if action_items or self._early_issue_creator is not None:
             logger.info("Creating GitHub issues from action items")
             return self.create_github_issues(action_items)
         logger.info("No action items to create issues from")
@@ -1008,6 +1652,61 @@ class DailyAutomation:
         logger.info("=" * 60)
 
 
+def run_tenants(config_path: Path, demo_mode: bool = False, **options: Any) -> int:
+    """Run the daily automation for every tenant in ``config_path``.
+
+    Tenants run concurrently (``TENANT_WORKERS``) in one process, sharing the
+    OpenAI and GitHub clients, the GitHub mutation pacer, a cap on in-flight
+    OpenAI requests and a single sales pipeline pull (see ``lib.tenants``).
+    A tenant that fails does not stop the others.
+
+    Profiling is not supported: the profilers are process wide and cannot
+    tell concurrent tenants apart.
+
+    Args:
+        config_path: Tenants config file.
+        demo_mode: Passed to every tenant's ``DailyAutomation``.
+        **options: Other ``DailyAutomation`` keyword arguments.
+
+    Returns:
+        0 if every tenant succeeded, 1 otherwise.
+
+    Raises:
+        ValueError: if ``profile`` is requested.
+    """
+    if options.get("profile"):
+        raise ValueError("Tenants cannot be profiled; profile a single run instead")
+    from concurrent.futures import ThreadPoolExecutor
+
+    project_root = Path(__file__).parent.parent
+    default_output = AutomationConfig.load(demo_mode, project_root).output_dir
+    tenants = load_tenants(config_path, default_output)
+    shared = SharedServices(
+        github_pacer=MutationPacer(min_interval=float(os.getenv("GITHUB_MUTATION_INTERVAL", "1.0"))),
+        openai_slots=threading.BoundedSemaphore(int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))),
+    )
+    logger.info(f"🏢 Running {len(tenants)} tenants from {config_path}")
+
+    def run_tenant(tenant: Tenant) -> int:
+        try:
+            automation = DailyAutomation(demo_mode=demo_mode, tenant=tenant, shared=shared, **options)
+            return automation.run()
+        except Exception as e:
+            logger.error(f"❌ Tenant {tenant.name} failed: {e}", extra={"tenant": tenant.name})
+            return 1
+
+    workers = max(1, min(len(tenants), int(os.getenv("TENANT_WORKERS", "4"))))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tenant") as pool:
+        results = dict(zip((t.name for t in tenants), pool.map(run_tenant, tenants)))
+
+    failed = [name for name, code in results.items() if code != 0]
+    if failed:
+        logger.error(f"❌ {len(failed)}/{len(tenants)} tenants failed: {', '.join(failed)}")
+        return 1
+    logger.info(f"✓ All {len(tenants)} tenants completed")
+    return 0
+
+
 def main(argv: Optional[List[str]] = None) -> int:
     """Run the daily automation script from the command line.
 
@@ -1037,15 +1736,72 @@ def main(argv: Optional[List[str]] = None) -> int:
         action="store_true",
         help="Alias for --demo (no API calls, no external changes)"
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only summarize notes that are new or changed since the last successful run"
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream the summary and start creating issues while it is still being generated"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile each step (cProfile, tracemalloc, speedscope) into output/profiles/<run_id>/"
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and re-summarize new or changed notes within seconds of each edit (implies --incremental)"
+    )
+    parser.add_argument(
+        "--watch-issues",
+        action="store_true",
+        help="With --watch, also create GitHub issues on every re-run (off by default)"
+    )
+    parser.add_argument(
+        "--tenants",
+        type=Path,
+        metavar="CONFIG",
+        help="Run every tenant (repo, notes, output dir) in CONFIG concurrently, sharing clients and the sales pull"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always call OpenAI, ignoring cached summaries for identical prompts"
+    )
 
     args = parser.parse_args(argv)
+    if args.tenants and args.watch:
+        parser.error("--tenants cannot be combined with --watch")
+    if args.watch_issues and not args.watch:
+        parser.error("--watch-issues requires --watch")
+    if args.tenants and args.profile:
+        # tracemalloc and the stack sampler are process wide; tenants run concurrently
+        parser.error("--tenants cannot be combined with --profile")
 
     # Support both --demo and --dry-run flags
     demo_mode = args.demo or args.dry_run
 
     try:
-        automation = DailyAutomation(demo_mode=demo_mode)
-        return automation.run()
+        if args.tenants:
+            return run_tenants(
+                args.tenants,
+                demo_mode=demo_mode,
+                incremental=args.incremental,
+                use_cache=not args.no_cache,
+                stream=args.stream,
+            )
+        automation = DailyAutomation(
+            demo_mode=demo_mode,
+            incremental=args.incremental,
+            use_cache=not args.no_cache,
+            stream=args.stream,
+            profile=args.profile,
+        )
+        return automation.watch(create_issues=args.watch_issues) if args.watch else automation.run()
     except Exception as e:
         # Error already logged inside run() or __init__
         logger.error(f"❌ Fatal error: {e}")
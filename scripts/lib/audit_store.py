@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+# pyright: strict
+"""
+Append-Only Audit Store
+========================
+
+Replaces one ``audit_YYYYMMDD_HHMMSS.json`` file per run with an append-only
+JSON Lines log per stream (``output/audit/<stream>/``):
+
+- records are appended to an active ``segment-*.jsonl`` file and fsync'd
+- the active segment is rotated when it exceeds ``max_segment_bytes`` or is
+  older than ``rotate_after``; closed segments are compressed (zstd when the
+  ``zstandard`` package is installed, otherwise gzip)
+- ``index.json`` lists every segment with its time range and, per date, the
+  offset of that date's first record, so readers can skip whole segments and
+  seek within one
+- ``AuditStore.read()`` streams records for a date range in append order
+
+Each line is ``{"ts": <ISO-8601 UTC>, "type": <record type>, "data": {...}}``.
+
+Usage:
+    python scripts/lib/audit_store.py read output/audit/daily --since 2025-12-01
+    python scripts/lib/audit_store.py import output/audit/daily 'output/audit_*.json' --type daily_summary
+"""
+
+import argparse
+import gzip
+import io
+import json
+import logging
+import os
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional
+
+if __package__:
+    from .output_writer import dumps_json, write_json
+else:  # executed as a script
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from lib.output_writer import dumps_json, write_json
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+DEFAULT_SEGMENT_BYTES = 8 * 1024 * 1024
+DEFAULT_ROTATE_AFTER = timedelta(days=7)
+
+Record = Dict[str, Any]
+
+
+def _zstd() -> Any:
+    try:
+        import zstandard  # type: ignore
+
+        return zstandard
+    except ImportError:
+        return None
+
+
+def _parse_ts(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        ts = value
+    else:
+        text = str(value).replace("Z", "+00:00")
+        ts = datetime.fromisoformat(text)
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+def _single_line(payload: bytes) -> bytes:
+    """Fold indented JSON onto one line.
+
+    JSON strings cannot contain raw newlines, so every newline in the payload
+    (and the indentation after it) is formatting and can be dropped.
+    """
+    if b"\n" not in payload:
+        return payload
+    return b"".join(part.lstrip(b" ") for part in payload.split(b"\n"))
+
+
+class AuditStore:
+    """Append-only, rotated, compressed JSONL audit log for one stream."""
+
+    def __init__(
+        self,
+        directory: Path,
+        max_segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        rotate_after: timedelta = DEFAULT_ROTATE_AFTER,
+        compression: str = "auto",
+    ) -> None:
+        """
+        Args:
+            directory: Stream directory, e.g. ``output/audit/daily``
+            max_segment_bytes: Rotate the active segment beyond this size
+            rotate_after: Rotate the active segment once it is this old
+            compression: ``auto`` (zstd if available, else gzip), ``zstd``,
+                ``gzip`` or ``none``
+        """
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.rotate_after = rotate_after
+        if compression == "auto":
+            compression = "zstd" if _zstd() is not None else "gzip"
+        if compression == "zstd" and _zstd() is None:
+            raise RuntimeError("zstandard package not installed. Run: pip install zstandard")
+        self.compression = compression
+        self._lock = threading.Lock()
+
+    # ── index ──────────────────────────────────────────────────
+
+    @property
+    def index_path(self) -> Path:
+        return self.directory / "index.json"
+
+    def _load_index(self) -> Dict[str, Any]:
+        try:
+            index = json.loads(self.index_path.read_text(encoding="utf-8"))
+            if index.get("version") == INDEX_VERSION:
+                return index
+            logger.warning(f"Unsupported audit index version in {self.index_path}; rebuilding")
+        except FileNotFoundError:
+            pass
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Unreadable audit index {self.index_path}; rebuilding: {e}")
+        return self._rebuild_index()
+
+    def _save_index(self, index: Dict[str, Any]) -> None:
+        write_json(self.index_path, index)
+
+    def _scan_segment(self, name: str) -> Dict[str, Any]:
+        """Build an index entry by reading a segment."""
+        entry: Dict[str, Any] = {"name": name, "records": 0, "bytes": 0, "dates": {}}
+        offset = 0
+        with self._open_segment(name) as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        ts = json.loads(line)["ts"]
+                    except (ValueError, KeyError):
+                        offset += len(line)
+                        continue
+                    self._index_record(entry, ts, offset)
+                offset += len(line)
+        entry["bytes"] = offset
+        entry.setdefault("created_at", entry.get("first_ts") or datetime.now(timezone.utc).isoformat())
+        return entry
+
+    def _rebuild_index(self) -> Dict[str, Any]:
+        segments: List[Dict[str, Any]] = []
+        if self.directory.exists():
+            names = sorted(p.name for p in self.directory.glob("segment-*.jsonl*"))
+            for name in names:
+                segments.append(self._scan_segment(name))
+        return {"version": INDEX_VERSION, "segments": segments}
+
+    @staticmethod
+    def _index_record(entry: Dict[str, Any], ts: str, offset: int) -> None:
+        date = ts[:10]
+        dates: Dict[str, List[int]] = entry.setdefault("dates", {})
+        if date in dates:
+            dates[date][1] += 1
+        else:
+            dates[date] = [offset, 1]
+        entry["first_ts"] = entry.get("first_ts") or ts
+        entry["last_ts"] = ts
+        entry["records"] = entry.get("records", 0) + 1
+
+    # ── segments ───────────────────────────────────────────────
+
+    def _open_segment(self, name: str) -> IO[bytes]:
+        path = self.directory / name
+        if name.endswith(".gz"):
+            return gzip.open(path, "rb")  # type: ignore[return-value]
+        if name.endswith(".zst"):
+            zstandard = _zstd()
+            if zstandard is None:
+                raise RuntimeError("zstandard package not installed. Run: pip install zstandard")
+            raw = open(path, "rb")
+            return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw, closefd=True))
+        return open(path, "rb")
+
+    def _compress(self, name: str) -> str:
+        """Compress a closed segment; returns its new name."""
+        if self.compression == "none":
+            return name
+        src = self.directory / name
+        suffix = ".zst" if self.compression == "zstd" else ".gz"
+        dst = self.directory / f"{name}{suffix}"
+        tmp = self.directory / f".{dst.name}.tmp"
+        with open(src, "rb") as fin, open(tmp, "wb") as fout:
+            if self.compression == "zstd":
+                _zstd().ZstdCompressor(level=10).copy_stream(fin, fout)
+            else:
+                with gzip.GzipFile(fileobj=fout, mode="wb", mtime=0) as gz:
+                    while chunk := fin.read(1024 * 1024):
+                        gz.write(chunk)
+            fout.flush()
+            os.fsync(fout.fileno())
+        os.replace(tmp, dst)
+        src.unlink()
+        return dst.name
+
+    def _should_rotate(self, active: Dict[str, Any], now: datetime) -> bool:
+        if active["bytes"] >= self.max_segment_bytes:
+            return True
+        return now - _parse_ts(active["created_at"]) >= self.rotate_after
+
+    # ── writing ────────────────────────────────────────────────
+
+    def _file_lock(self) -> Any:
+        """Cross-process lock so overlapping cron runs do not interleave writes."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        handle = open(self.directory / ".lock", "a+b")
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        return handle
+
+    def append(
+        self,
+        data: Record,
+        record_type: str = "record",
+        ts: Optional[datetime] = None,
+        payload: Optional[bytes] = None,
+    ) -> None:
+        """
+        Durably append one record, rotating the active segment if needed.
+
+        Args:
+            data: The record
+            record_type: Stored as ``type``, for filtering reads
+            ts: Record time (default: now)
+            payload: ``data`` already serialized with ``dumps_json`` (indented
+                or not); used as is instead of serializing ``data`` again
+        """
+        now = ts or datetime.now(timezone.utc)
+        stamp = now.astimezone(timezone.utc).isoformat()
+        body = _single_line(payload) if payload is not None else dumps_json(data, indent=False)
+        line = (
+            b'{"ts":' + dumps_json(stamp) + b',"type":' + dumps_json(record_type)
+            + b',"data":' + body + b"}\n"
+        )
+
+        with self._lock:
+            lock = self._file_lock()
+            try:
+                index = self._load_index()
+                segments: List[Dict[str, Any]] = index["segments"]
+                active = segments[-1] if segments and segments[-1]["name"].endswith(".jsonl") else None
+
+                if active is not None:
+                    size = (self.directory / active["name"]).stat().st_size
+                    if size != active["bytes"]:
+                        # Index lagged a crash or concurrent writer; re-derive it
+                        active.update(self._scan_segment(active["name"]))
+                    if self._should_rotate(active, now):
+                        active["name"] = self._compress(active["name"])
+                        active = None
+
+                if active is None:
+                    name = f"segment-{now.strftime('%Y%m%dT%H%M%S')}-{len(segments):05d}.jsonl"
+                    active = {"name": name, "created_at": stamp, "records": 0, "bytes": 0, "dates": {}}
+                    segments.append(active)
+
+                with open(self.directory / active["name"], "ab") as f:
+                    f.write(line)
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._index_record(active, stamp, active["bytes"])
+                active["bytes"] += len(line)
+                self._save_index(index)
+            finally:
+                lock.close()
+
+    # ── reading ────────────────────────────────────────────────
+
+    def _iter_segment(self, name: str, offset: int = 0) -> Iterator[Record]:
+        try:
+            f = self._open_segment(name)
+        except FileNotFoundError:
+            return  # rotated by a concurrent writer; the next index load has it
+        with f:
+            if offset and not (name.endswith(".gz") or name.endswith(".zst")):
+                f.seek(offset)
+            else:
+                # Compressed streams are skipped forward without JSON parsing
+                remaining = offset
+                while remaining > 0:
+                    chunk = f.read(min(remaining, 1024 * 1024))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn final line after a crash
+
+    def _segments(self) -> List[Dict[str, Any]]:
+        index = self._load_index() if self.index_path.exists() else self._rebuild_index()
+        return index["segments"]
+
+    def read(
+        self,
+        since: Optional[Any] = None,
+        until: Optional[Any] = None,
+        record_type: Optional[str] = None,
+    ) -> Iterator[Record]:
+        """
+        Stream records with ``since <= ts < until`` in append order.
+
+        Records are assumed to be appended in time order (as ``append()``
+        does), which lets reads stop at the first record past ``until``.
+
+        Args:
+            since: Start (datetime or ISO date/time), inclusive
+            until: End (datetime or ISO date/time), exclusive
+            record_type: Only records of this type
+        """
+        start = _parse_ts(since) if since is not None else None
+        end = _parse_ts(until) if until is not None else None
+
+        segments = self._segments()
+        for i, segment in enumerate(segments):
+            is_active = i == len(segments) - 1 and segment["name"].endswith(".jsonl")
+            if not is_active:
+                if not segment.get("records"):
+                    continue
+                if start and _parse_ts(segment["last_ts"]) < start:
+                    continue
+                if end and _parse_ts(segment["first_ts"]) >= end:
+                    break
+
+            offset = 0
+            if start is not None:
+                day = start.date().isoformat()
+                later = [o for d, (o, _) in segment.get("dates", {}).items() if d >= day]
+                if later:
+                    offset = min(later)
+
+            for record in self._iter_segment(segment["name"], offset):
+                ts = _parse_ts(record["ts"])
+                if start and ts < start:
+                    continue
+                if end and ts >= end:
+                    return
+                if record_type and record.get("type") != record_type:
+                    continue
+                yield record
+
+    def latest(self, record_type: Optional[str] = None) -> Optional[Record]:
+        """Most recent record (of ``record_type``), or None."""
+        for segment in reversed(self._segments()):
+            last: Optional[Record] = None
+            for record in self._iter_segment(segment["name"]):
+                if record_type is None or record.get("type") == record_type:
+                    last = record
+            if last is not None:
+                return last
+        return None
+
+
+def import_legacy(store: AuditStore, paths: List[Path], record_type: str, delete: bool = False) -> int:
+    """Append legacy per-run audit JSON files (oldest first) to the store."""
+    count = 0
+    for path in sorted(paths, key=lambda p: p.stat().st_mtime):
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Skipping {path}: {e}")
+            continue
+        stamp = data.get("created_at") or data.get("timestamp")
+        ts = _parse_ts(stamp) if stamp else datetime.fromtimestamp(path.stat().st_mtime, timezone.utc)
+        store.append(data, record_type=record_type, ts=ts)
+        count += 1
+        if delete:
+            path.unlink()
+    return count
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Query or populate an audit store")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    read = sub.add_parser("read", help="Print records as JSON Lines")
+    read.add_argument("directory", type=Path)
+    read.add_argument("--since", help="Start date/time (inclusive)")
+    read.add_argument("--until", help="End date/time (exclusive)")
+    read.add_argument("--type", dest="record_type", help="Only records of this type")
+
+    imp = sub.add_parser("import", help="Append legacy audit_*.json files")
+    imp.add_argument("directory", type=Path)
+    imp.add_argument("pattern", help="Glob for legacy files, e.g. 'output/audit_*.json'")
+    imp.add_argument("--type", dest="record_type", required=True)
+    imp.add_argument("--delete", action="store_true", help="Delete files after importing")
+
+    args = parser.parse_args(argv)
+    store = AuditStore(args.directory)
+
+    if args.command == "read":
+        for record in store.read(args.since, args.until, args.record_type):
+            sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return 0
+
+    pattern = Path(args.pattern)
+    paths = sorted(pattern.parent.glob(pattern.name))
+    count = import_legacy(store, paths, args.record_type, delete=args.delete)
+    print(f"Imported {count} records into {args.directory}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
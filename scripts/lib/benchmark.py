@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+# pyright: strict
+"""
+Benchmark Harness
+==================
+
+Building blocks for ``scripts/benchmark_daily.py``:
+
+- ``generate_notes`` writes a reproducible synthetic notes tree: nested
+  directories of Markdown and text notes from a few hundred bytes to 64 KiB,
+  with headings, bullets and ``- [ ]`` action items. A tree that already
+  matches the requested count and seed is reused.
+- ``StandInBackends`` is a local HTTP server answering the OpenAI chat
+  completions, GitHub REST and Salesforce query endpoints the daily runner
+  calls, after a configurable per-request latency. ``env()`` returns the
+  variables that point a run at it, so every request goes through the real
+  SDKs, sessions and retry logic.
+- ``compare_reports`` lists the metrics of a benchmark report that regressed
+  beyond a threshold relative to a baseline report.
+"""
+
+import json
+import random
+import re
+import shutil
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+TREE_MARKER = ".benchmark.json"
+TREE_VERSION = 1
+NOTES_PER_DIR = 100
+
+# (share of notes, min bytes, max bytes)
+NOTE_SIZES = ((0.74, 128, 1024), (0.25, 1024, 8192), (0.01, 8192, 65536))
+
+# Differences below these are noise, whatever the relative change
+MIN_TIME_DELTA_SEC = 0.05
+MIN_RSS_DELTA_KB = 8192
+
+STEP_FIELDS = ("status", "duration_sec", "cpu_sec", "rss_peak_delta_kb", "http_calls")
+
+_WORDS = (
+    "pipeline report export customer onboarding invoice renewal forecast deploy "
+    "review migrate dashboard latency retry webhook schema backfill audit quota "
+    "churn upsell demo contract pricing roadmap sprint release hotfix incident "
+    "postmortem alert metric cohort funnel campaign partner integration sync "
+    "token cache index shard queue worker cron summary investor board hiring "
+    "budget vendor security compliance backup restore staging production"
+).split()
+_VERBS = ("Fix", "Draft", "Review", "Ship", "Investigate", "Follow up on", "Automate", "Document")
+
+_TODO_RE = re.compile(r"- \[ \] ([^\n]+)")
+_ACTION_ITEMS_RE = re.compile(r'"action_items": \[(.*?)\]', re.DOTALL)
+_HEADING_RE = re.compile(r"^(?:\d+\. )?# (.+)$", re.MULTILINE)
+
+
+# ── synthetic notes ───────────────────────────────────────────
+
+@dataclass(frozen=True)
+class NotesTree:
+    """A generated notes directory."""
+
+    root: Path
+    count: int
+    total_bytes: int
+
+
+def _sentence(rng: random.Random) -> str:
+    words = rng.choices(_WORDS, k=rng.randint(6, 16))
+    return " ".join(words).capitalize() + "."
+
+
+def _note_size(rng: random.Random) -> int:
+    roll = rng.random()
+    for share, low, high in NOTE_SIZES:
+        if roll < share:
+            return rng.randint(low, high)
+        roll -= share
+    return NOTE_SIZES[-1][2]
+
+
+def _note(index: int, rng: random.Random, sentences: List[str]) -> str:
+    target = _note_size(rng)
+    topic = " ".join(rng.choices(_WORDS, k=3))
+    lines = [f"# Note {index}: {topic}", "", f"_2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}_", ""]
+    size = sum(len(line) + 1 for line in lines)
+    while size < target:
+        roll = rng.random()
+        if roll < 0.15:
+            line = f"- [ ] {rng.choice(_VERBS)} {' '.join(rng.choices(_WORDS, k=rng.randint(2, 5)))}"
+        elif roll < 0.45:
+            line = f"- {rng.choice(sentences)}"
+        elif roll < 0.5:
+            line = f"\n## {' '.join(rng.choices(_WORDS, k=2)).title()}\n"
+        else:
+            line = " ".join(rng.choices(sentences, k=rng.randint(1, 4)))
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines) + "\n"
+
+
+def generate_notes(root: Path, count: int, seed: int = 0) -> NotesTree:
+    """
+    Write ``count`` synthetic notes under ``root`` (reused if already there).
+
+    Notes are spread over ``area-NN/batch-NNNN/`` directories of at most
+    ``NOTES_PER_DIR`` files; one in twenty is a ``.txt`` file. The same
+    count and seed always produce the same tree.
+    """
+    marker = root / TREE_MARKER
+    try:
+        meta = json.loads(marker.read_text(encoding="utf-8"))
+        if (meta.get("version"), meta.get("count"), meta.get("seed")) == (TREE_VERSION, count, seed):
+            return NotesTree(root, count, int(meta["total_bytes"]))
+    except (OSError, ValueError, KeyError):
+        pass
+
+    if root.exists():
+        shutil.rmtree(root)
+    rng = random.Random(seed)
+    sentences = [_sentence(rng) for _ in range(2000)]
+    total = 0
+    directory: Optional[Path] = None
+    for index in range(count):
+        if index % NOTES_PER_DIR == 0:
+            batch = index // NOTES_PER_DIR
+            directory = root / f"area-{batch % 16:02d}" / f"batch-{batch:04d}"
+            directory.mkdir(parents=True, exist_ok=True)
+        assert directory is not None
+        suffix = ".txt" if index % 20 == 19 else ".md"
+        data = _note(index, rng, sentences).encode("utf-8")
+        (directory / f"note-{index:06d}{suffix}").write_bytes(data)
+        total += len(data)
+
+    root.mkdir(parents=True, exist_ok=True)
+    marker.write_text(
+        json.dumps({"version": TREE_VERSION, "count": count, "seed": seed, "total_bytes": total}),
+        encoding="utf-8",
+    )
+    return NotesTree(root, count, total)
+
+
+# ── stand-in backends ─────────────────────────────────────────
+
+@dataclass(frozen=True)
+class Latency:
+    """Seconds each stand-in backend waits before answering a request."""
+
+    openai: float = 0.0
+    github: float = 0.0
+    crm: float = 0.0
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real APIs
+    server: "_Server"
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        path = self.path.split("?", 1)[0]
+        backends = self.server.backends
+        route = backends.route(method, path)
+        if route is None:
+            self._reply(404, {"message": "Not Found"})
+            return
+        backend, handle = route
+        backends.count(backend)
+        time.sleep(getattr(backends.latency, backend))
+        try:
+            payload: Any = json.loads(body) if body else {}
+        except ValueError:
+            payload = {}
+        status, response, headers = handle(path, payload)
+        self._reply(status, response, headers)
+
+    def _reply(self, status: int, response: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        headers = dict(headers or {})
+        data = response if isinstance(response, bytes) else json.dumps(response).encode("utf-8")
+        headers.setdefault("Content-Type", "application/json")
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    backends: "StandInBackends"
+
+
+Reply = Tuple[int, Any, Dict[str, str]]
+
+
+@dataclass
+class StandInBackends:
+    """
+    Local OpenAI, GitHub and Salesforce stand-ins with injected latency.
+
+    Completions return a JSON summary whose action items are the first
+    ``action_items`` ``- [ ]`` lines of the prompt (or of the partial
+    summaries, for reduce prompts). Salesforce serves ``crm_records``
+    opportunities in pages of ``crm_page_size``.
+    """
+
+    latency: Latency = field(default_factory=Latency)
+    action_items: int = 3
+    crm_records: int = 500
+    crm_page_size: int = 200
+    repo_name: str = "benchmark/notes"
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {"openai": 0, "github": 0, "crm": 0}
+        self._issue_number = 0
+        self._server: Optional[_Server] = None
+
+    # lifecycle
+
+    def start(self) -> "StandInBackends":
+        server = _Server(("127.0.0.1", 0), _Handler)
+        server.backends = self
+        threading.Thread(target=server.serve_forever, name="stand-in-backends", daemon=True).start()
+        self._server = server
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "StandInBackends":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("Stand-in backends are not running")
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def env(self) -> Dict[str, str]:
+        """Environment that points the daily runner at these backends."""
+        return {
+            "OPENAI_API_KEY": "sk-benchmark",
+            "OPENAI_BASE_URL": f"{self.url}/v1",
+            "GITHUB_TOKEN": "ghp_benchmark",
+            "GITHUB_API_URL": f"{self.url}/api/v3",
+            "REPO_NAME": self.repo_name,
+            "SALES_PIPELINE_SOURCE": "salesforce",
+            "SALESFORCE_ACCESS_TOKEN": "benchmark",
+            "SALESFORCE_INSTANCE_URL": self.url,
+            # Set (empty) so .env.local cannot enable the real Supabase mirror
+            "SUPABASE_URL": "",
+            "NEXT_PUBLIC_SUPABASE_URL": "",
+            "SUPABASE_SERVICE_ROLE_KEY": "",
+        }
+
+    # request accounting
+
+    def count(self, backend: str) -> None:
+        with self._lock:
+            self._counts[backend] += 1
+
+    def counts(self) -> Dict[str, int]:
+        """Requests served per backend since the last ``reset_counts()``."""
+        with self._lock:
+            return dict(self._counts)
+
+    def reset_counts(self) -> None:
+        with self._lock:
+            self._counts = dict.fromkeys(self._counts, 0)
+
+    # routing
+
+    def route(self, method: str, path: str) -> Optional[Tuple[str, Any]]:
+        repo = f"/api/v3/repos/{self.repo_name}"
+        if method == "POST" and path == "/v1/chat/completions":
+            return "openai", self._completion
+        if method == "GET" and path == "/api/v3/rate_limit":
+            return "github", self._rate_limit
+        if method == "GET" and path == repo:
+            return "github", self._repo
+        if path == f"{repo}/issues":
+            return "github", self._create_issue if method == "POST" else self._list_issues
+        if method == "GET" and re.fullmatch(r"/services/data/v[\d.]+/query(/01gBENCH-\d+)?", path):
+            return "crm", self._query
+        return None
+
+    # OpenAI
+
+    def _completion(self, path: str, payload: Dict[str, Any]) -> Reply:
+        prompt = "\n".join(str(m.get("content", "")) for m in payload.get("messages", []))
+        model = str(payload.get("model") or "gpt-4-turbo-preview")
+        content = json.dumps(self._summary(prompt))
+        created = int(time.time())
+        if not payload.get("stream"):
+            return 200, {
+                "id": "chatcmpl-benchmark",
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }],
+                "usage": {
+                    "prompt_tokens": len(prompt) // 4,
+                    "completion_tokens": len(content) // 4,
+                    "total_tokens": (len(prompt) + len(content)) // 4,
+                },
+            }, {}
+
+        events: List[str] = []
+        for start in range(0, len(content), 16):
+            chunk = {
+                "id": "chatcmpl-benchmark",
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": content[start:start + 16]}, "finish_reason": None}],
+            }
+            events.append(f"data: {json.dumps(chunk)}\n\n")
+        events.append("data: [DONE]\n\n")
+        return 200, "".join(events).encode("utf-8"), {"Content-Type": "text/event-stream"}
+
+    def _summary(self, prompt: str) -> Dict[str, Any]:
+        items: List[str] = _TODO_RE.findall(prompt)
+        if not items:
+            for block in _ACTION_ITEMS_RE.findall(prompt):
+                try:
+                    items.extend(str(item) for item in json.loads(f"[{block}]"))
+                except ValueError:
+                    continue
+        action_items = list(dict.fromkeys(item.strip() for item in items))[: self.action_items]
+        highlights = _HEADING_RE.findall(prompt)[:3] or ["Reviewed partial summaries"]
+        return {
+            "highlights": highlights,
+            "action_items": action_items,
+            "assessment": f"{len(action_items)} action items identified.",
+        }
+
+    # GitHub
+
+    def _github_headers(self) -> Dict[str, str]:
+        return {
+            "X-RateLimit-Limit": "5000",
+            "X-RateLimit-Remaining": "4999",
+            "X-RateLimit-Reset": str(int(time.time()) + 3600),
+        }
+
+    def _rate_limit(self, path: str, payload: Dict[str, Any]) -> Reply:
+        core = {"limit": 5000, "remaining": 4999, "reset": int(time.time()) + 3600, "used": 1}
+        return 200, {"resources": {"core": core}, "rate": core}, self._github_headers()
+
+    def _repo(self, path: str, payload: Dict[str, Any]) -> Reply:
+        owner, name = self.repo_name.split("/", 1)
+        return 200, {
+            "id": 1,
+            "name": name,
+            "full_name": self.repo_name,
+            "owner": {"login": owner},
+            "url": f"{self.url}/api/v3/repos/{self.repo_name}",
+            "html_url": f"{self.url}/{self.repo_name}",
+        }, self._github_headers()
+
+    def _list_issues(self, path: str, payload: Dict[str, Any]) -> Reply:
+        headers = self._github_headers()
+        headers["ETag"] = '"benchmark"'
+        return 200, [], headers
+
+    def _create_issue(self, path: str, payload: Dict[str, Any]) -> Reply:
+        with self._lock:
+            self._issue_number += 1
+            number = self._issue_number
+        labels = [{"name": str(name)} for name in payload.get("labels", [])]
+        return 201, {
+            "id": number,
+            "number": number,
+            "title": payload.get("title", ""),
+            "body": payload.get("body", ""),
+            "state": "open",
+            "labels": labels,
+            "url": f"{self.url}/api/v3/repos/{self.repo_name}/issues/{number}",
+            "html_url": f"{self.url}/{self.repo_name}/issues/{number}",
+        }, self._github_headers()
+
+    # Salesforce
+
+    def _query(self, path: str, payload: Dict[str, Any]) -> Reply:
+        match = re.search(r"/01gBENCH-(\d+)$", path)
+        offset = int(match.group(1)) if match else 0
+        end = min(offset + self.crm_page_size, self.crm_records)
+        stages = ("Prospecting", "Qualification", "Proposal", "Negotiation")
+        records = [
+            {
+                "Id": f"006BENCH{i:07d}",
+                "Name": f"Opportunity {i}",
+                "Account": {"Name": f"Account {i % 97}"},
+                "Owner": {"Name": f"Owner {i % 13}"},
+                "StageName": stages[i % len(stages)],
+                "Amount": 1000.0 + (i * 37) % 50000,
+                "Probability": (i * 7) % 100,
+                "CreatedDate": "2024-01-01T00:00:00.000+0000",
+                "LastModifiedDate": "2024-06-01T00:00:00.000+0000",
+            }
+            for i in range(offset, end)
+        ]
+        response: Dict[str, Any] = {"totalSize": self.crm_records, "done": end >= self.crm_records, "records": records}
+        if end < self.crm_records:
+            version = path.split("/")[3]
+            response["nextRecordsUrl"] = f"/services/data/{version}/query/01gBENCH-{end}"
+        return 200, response, {}
+
+
+# ── regression check ──────────────────────────────────────────
+
+def case_metrics(case: Dict[str, Any]) -> Dict[str, float]:
+    """Comparable metrics of one benchmark case: wall time, peak RSS and step durations."""
+    metrics: Dict[str, float] = {}
+    for key in ("wall_sec", "peak_rss_kb"):
+        if isinstance(case.get(key), (int, float)):
+            metrics[key] = float(case[key])
+    for name, step in (case.get("steps") or {}).items():
+        if isinstance(step, dict) and isinstance(step.get("duration_sec"), (int, float)):
+            metrics[f"{name}.duration_sec"] = float(step["duration_sec"])
+    return metrics
+
+
+def compare_reports(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    List metrics that grew by more than ``threshold`` (0.2 = 20%) over the baseline.
+
+    Cases are matched by note count; cases or metrics missing from the
+    baseline are skipped. Changes smaller than ``MIN_TIME_DELTA_SEC`` /
+    ``MIN_RSS_DELTA_KB`` are ignored as noise. A step that succeeded in the
+    baseline and failed now is always reported.
+    """
+    baseline_cases = {case.get("notes"): case for case in baseline.get("cases", [])}
+    regressions: List[str] = []
+    for case in current.get("cases", []):
+        before_case = baseline_cases.get(case.get("notes"))
+        if before_case is None:
+            continue
+        label = f"{case.get('notes')} notes"
+        before = case_metrics(before_case)
+        for key, value in case_metrics(case).items():
+            old = before.get(key)
+            if old is None:
+                continue
+            floor = MIN_RSS_DELTA_KB if key == "peak_rss_kb" else MIN_TIME_DELTA_SEC
+            if value - old > floor and value > old * (1 + threshold):
+                change = f"+{(value / old - 1) * 100:.0f}%" if old > 0 else "new cost"
+                regressions.append(f"{label}: {key} {old:g} -> {value:g} ({change})")
+        for name, step in (case.get("steps") or {}).items():
+            old_step = (before_case.get("steps") or {}).get(name) or {}
+            if old_step.get("status") == "success" and step.get("status") != "success":
+                regressions.append(f"{label}: step {name} now {step.get('status')}")
+    return regressions
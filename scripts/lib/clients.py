@@ -13,6 +13,8 @@ import logging
 from typing import Optional, List, Dict, Any
 from pathlib import Path
 
+from .transport import github_client, openai_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,8 +31,7 @@ class OpenAIClient:
             api_key: OpenAI API key
         """
         try:
-            from openai import OpenAI
-            self._client = OpenAI(api_key=api_key)
+            self._client = openai_client(api_key)
         except ImportError:
             raise RuntimeError("OpenAI package not installed. Run: pip install openai")
     
@@ -123,8 +124,8 @@ class GitHubClient:
             repo_name: Repository in format "owner/repo"
         """
         try:
-            from github import Github, GithubException
-            self._client = Github(token)
+            from github import GithubException
+            self._client = github_client(token)
             self._repo = self._client.get_repo(repo_name)
             self._exception_class = GithubException
             logger.info(f"✓ GitHub client initialized (repo: {repo_name})")
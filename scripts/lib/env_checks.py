@@ -9,10 +9,37 @@ Validates environment variables, dependencies, and runtime requirements
 for the automation scripts.
 """
 
+import importlib.util
 import os
 import sys
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Mapping, Tuple
+
+# Import name -> pip package name of the runner's third-party SDKs
+REQUIRED_MODULES: Dict[str, str] = {
+    "dotenv": "python-dotenv",
+    "openai": "openai",
+    "github": "PyGithub",
+}
+
+
+def has_module(name: str) -> bool:
+    """
+    Check whether a top-level module is installed without importing it.
+
+    Importing an SDK just to test for it costs as much as using it (openai
+    takes over half a second), so this only asks the import system for a
+    spec.
+    """
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def missing_modules(modules: Mapping[str, str]) -> List[str]:
+    """Return the package names of the ``{import name: package}`` entries that are not installed."""
+    return [package for name, package in modules.items() if not has_module(name)]
 
 
 def check_dependencies() -> Tuple[bool, List[str]]:
@@ -22,26 +49,7 @@ def check_dependencies() -> Tuple[bool, List[str]]:
     Returns:
         Tuple of (has_all_deps, missing_packages)
     """
-    missing: List[str] = []
-    
-    try:
-        import dotenv as _dotenv  # noqa: F401
-        _ = _dotenv
-    except ImportError:
-        missing.append("python-dotenv")
-    
-    try:
-        import openai as _openai  # noqa: F401
-        _ = _openai
-    except ImportError:
-        missing.append("openai")
-    
-    try:
-        import github as _github  # noqa: F401
-        _ = _github
-    except ImportError:
-        missing.append("PyGithub")
-    
+    missing = missing_modules(REQUIRED_MODULES)
     return (len(missing) == 0, missing)
 
 
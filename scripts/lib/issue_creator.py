@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# pyright: strict
+"""
+Concurrent GitHub Issue Creation
+=================================
+
+Creates GitHub issues on a bounded thread pool while respecting GitHub's
+rate limits:
+
+- ``MutationPacer`` spaces out content-creating requests (GitHub's secondary
+  rate limits expect roughly one mutation per second) and lets any thread pause
+  all others until a rate-limit window resets.
+- ``IssueCreator`` retries items that hit a rate limit after sleeping until the
+  reset indicated by ``Retry-After`` / ``X-RateLimit-Reset`` instead of dropping
+  them, checks the remaining primary quota before each request, and returns
+  results in submission order.
+
+The module has no PyGithub dependency; callers pass the function that creates
+one issue and the exception types that signal a rate limit.
+"""
+
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_INTERVAL = 1.0
+DEFAULT_SECONDARY_BACKOFF = 60.0
+DEFAULT_MAX_WAIT = 3600.0
+
+
+class MutationPacer:
+    """Thread-safe pacing for mutating API requests."""
+
+    def __init__(
+        self,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.min_interval = min_interval
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self._paused_until = 0.0
+
+    def pause_until(self, timestamp: float) -> None:
+        """Block all callers of ``acquire()`` until ``timestamp`` (epoch seconds)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, timestamp)
+
+    def acquire(self) -> None:
+        """Wait for the next request slot."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                start = max(now, self._next_slot, self._paused_until)
+                if start <= now:
+                    self._next_slot = now + self.min_interval
+                    return
+                delay = start - now
+            self._sleep(delay)
+
+
+def _headers(exc: BaseException) -> Dict[str, str]:
+    raw: Any = getattr(exc, "headers", None) or {}
+    try:
+        return {str(k).lower(): str(v) for k, v in dict(raw).items()}
+    except Exception:
+        return {}
+
+
+def retry_delay(exc: BaseException, now: Optional[float] = None) -> Optional[float]:
+    """
+    Seconds to wait before retrying, from rate-limit response headers.
+
+    Returns:
+        Delay in seconds, or None if the response carries no rate-limit hint
+    """
+    headers = _headers(exc)
+    now = time.time() if now is None else now
+
+    retry_after = headers.get("retry-after")
+    if retry_after is not None:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+
+    if headers.get("x-ratelimit-remaining") == "0" and "x-ratelimit-reset" in headers:
+        try:
+            return max(0.0, float(headers["x-ratelimit-reset"]) - now) + 1.0
+        except ValueError:
+            pass
+
+    return None
+
+
+@dataclass
+class IssueResult:
+    """Outcome of creating one issue."""
+
+    item: str
+    issue: Any = None
+    error: Optional[BaseException] = None
+    attempts: int = 0
+
+
+class IssueCreator:
+    """
+    Bounded thread-pool issue creator with rate-limit aware retries.
+
+    Items can be passed all at once with ``create_all()`` or submitted one by
+    one with ``submit()`` (e.g. while a summary is still streaming) and then
+    collected with ``results()``. Use it as a context manager (or call
+    ``close()``) so its worker threads stop even when ``results()`` is never
+    reached.
+    """
+
+    def __init__(
+        self,
+        create_fn: Callable[[str], Any],
+        *,
+        max_workers: int = 4,
+        pacer: Optional[MutationPacer] = None,
+        rate_limit_errors: Tuple[Type[BaseException], ...] = (),
+        quota_fn: Optional[Callable[[], Optional[Tuple[int, float]]]] = None,
+        quota_reserve: int = 2,
+        max_retries: int = 3,
+        max_wait: float = DEFAULT_MAX_WAIT,
+    ) -> None:
+        """
+        Args:
+            create_fn: Creates one issue from an action item string
+            max_workers: Maximum concurrent requests
+            pacer: Shared mutation pacer (a private one is created if omitted)
+            rate_limit_errors: Exception types that always mean "rate limited"
+            quota_fn: Returns (remaining, reset_epoch) of the primary quota
+            quota_reserve: Pause until reset when remaining drops to this
+            max_retries: Retries per item after a rate limit
+            max_wait: Longest single sleep for a rate-limit reset, in seconds
+        """
+        self._create_fn = create_fn
+        self._pacer = pacer or MutationPacer()
+        self._rate_limit_errors = rate_limit_errors
+        self._quota_fn = quota_fn
+        self._quota_reserve = quota_reserve
+        self._max_retries = max_retries
+        self._max_wait = max_wait
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="issues")
+        self._futures: List[Future[IssueResult]] = []
+        self._quota_lock = threading.Lock()
+
+    def _is_rate_limited(self, exc: BaseException) -> bool:
+        if self._rate_limit_errors and isinstance(exc, self._rate_limit_errors):
+            return True
+        status = getattr(exc, "status", None)
+        if status in (403, 429):
+            return retry_delay(exc) is not None or "rate limit" in str(exc).lower()
+        return False
+
+    def _check_quota(self) -> None:
+        if self._quota_fn is None:
+            return
+        with self._quota_lock:
+            try:
+                quota = self._quota_fn()
+            except Exception:
+                logger.debug("Could not read GitHub rate-limit quota", exc_info=True)
+                return
+        if quota is None:
+            return
+        remaining, reset_at = quota
+        if 0 <= remaining <= self._quota_reserve:
+            wait = min(max(0.0, reset_at - time.time()) + 1.0, self._max_wait)
+            logger.warning(f"GitHub quota nearly exhausted ({remaining} left); pausing {wait:.0f}s until reset")
+            self._pacer.pause_until(time.time() + wait)
+
+    def _create_one(self, item: str) -> IssueResult:
+        result = IssueResult(item=item)
+        while True:
+            self._check_quota()
+            self._pacer.acquire()
+            result.attempts += 1
+            try:
+                result.issue = self._create_fn(item)
+                result.error = None
+                return result
+            except Exception as e:
+                result.error = e
+                if not self._is_rate_limited(e) or result.attempts > self._max_retries:
+                    return result
+                delay = retry_delay(e)
+                if delay is None:
+                    delay = DEFAULT_SECONDARY_BACKOFF * result.attempts
+                delay = min(delay, self._max_wait)
+                logger.warning(
+                    f"GitHub rate limit hit for '{item[:50]}'; retrying in {delay:.0f}s "
+                    f"(attempt {result.attempts}/{self._max_retries + 1})"
+                )
+                self._pacer.pause_until(time.time() + delay)
+
+    def submit(self, item: str) -> None:
+        """Queue one item for creation."""
+        # Run in a copy of the caller's context so per-step metrics see the request
+        ctx = contextvars.copy_context()
+        self._futures.append(self._pool.submit(ctx.run, self._create_one, item))
+
+    def results(self) -> List[IssueResult]:
+        """Wait for all submitted items; results are in submission order."""
+        try:
+            return [f.result() for f in self._futures]
+        finally:
+            self._pool.shutdown(wait=True)
+
+    def close(self) -> None:
+        """Stop the worker threads, cancelling items that have not started."""
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "IssueCreator":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def create_all(self, items: Iterable[str]) -> List[IssueResult]:
+        """Create issues for all items and return results in input order."""
+        for item in items:
+            self.submit(item)
+        return self.results()
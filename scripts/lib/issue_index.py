@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# pyright: strict
+"""
+Local GitHub Issue Index
+=========================
+
+A small on-disk mirror of the repository's open ``automation``-labelled issues,
+used to avoid filing the same action item as a new issue on every daily run.
+
+Syncing is incremental and cheap on API quota:
+
+- only issues updated since the last sync are requested (``since=``)
+- the first page is requested with ``If-None-Match``; an unchanged listing
+  returns ``304 Not Modified``, which GitHub does not count against the quota
+
+Titles are normalized (case, punctuation, whitespace) and hashed for exact
+matching; near-duplicates are found over candidates sharing at least one
+word, and must pass both a word-overlap and a character-similarity check (so
+"Fix export for Q3 report" does not match "Fix export for Q4 report").
+"""
+
+import hashlib
+import json
+import logging
+import re
+from datetime import datetime, timezone
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+from .output_writer import write_json
+from .transport import github_api_url, session_for, timeouts
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+DEFAULT_MATCH_THRESHOLD = 0.9
+
+_PUNCT_RE = re.compile(r"[^\w\s]", re.UNICODE)
+_WS_RE = re.compile(r"\s+")
+
+# Ignored by the word-overlap check ("Draft the update" ~ "Draft update")
+_STOPWORDS = frozenset({"a", "an", "and", "for", "in", "of", "on", "the", "to", "with"})
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase, strip punctuation and collapse whitespace."""
+    text = _PUNCT_RE.sub(" ", (title or "").lower())
+    return _WS_RE.sub(" ", text).strip()
+
+
+def title_hash(title: str) -> str:
+    return hashlib.sha1(normalize_title(title).encode("utf-8")).hexdigest()
+
+
+def title_similarity(a: str, b: str) -> float:
+    """
+    Similarity in [0, 1] between two normalized titles.
+
+    The lower of the word overlap (Jaccard, ignoring stopwords) and the
+    character similarity: a one-word difference such as Q3/Q4 keeps the
+    characters almost identical, but not the words.
+    """
+    if a == b:
+        return 1.0
+    tokens_a = set(a.split()) - _STOPWORDS or set(a.split())
+    tokens_b = set(b.split()) - _STOPWORDS or set(b.split())
+    if not tokens_a or not tokens_b:
+        return 0.0
+    jaccard = len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+    ratio = SequenceMatcher(None, a, b).ratio()
+    return min(jaccard, ratio)
+
+
+def _next_link(link_header: str) -> Optional[str]:
+    for part in link_header.split(","):
+        section = part.split(";")
+        if len(section) >= 2 and 'rel="next"' in section[1]:
+            return section[0].strip().strip("<>")
+    return None
+
+
+class IssueIndex:
+    """On-disk index of open issues carrying a given label."""
+
+    def __init__(
+        self,
+        path: Path,
+        repo_name: str,
+        token: Optional[str],
+        label: str = "automation",
+        match_threshold: float = DEFAULT_MATCH_THRESHOLD,
+        session: Any = None,
+    ) -> None:
+        self.path = path
+        self.repo_name = repo_name
+        self.label = label
+        self.match_threshold = match_threshold
+        self._token = token
+        self._session = session
+        self.etag: Optional[str] = None
+        self.since: Optional[str] = None
+        self.issues: Dict[str, Dict[str, Any]] = {}
+        self._by_hash: Dict[str, str] = {}
+        self._by_token: Dict[str, Set[str]] = {}
+        self._load()
+
+    # ── persistence ────────────────────────────────────────────
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable issue index {self.path}: {e}")
+            return
+        if data.get("version") != INDEX_VERSION or data.get("repo") != self.repo_name or data.get("label") != self.label:
+            logger.info("Issue index is for a different repo/label or version; rebuilding")
+            return
+        self.etag = data.get("etag")
+        self.since = data.get("since")
+        for number, entry in (data.get("issues") or {}).items():
+            self._put(str(number), entry)
+
+    def save(self) -> None:
+        """Atomically write the index to disk."""
+        payload = {
+            "version": INDEX_VERSION,
+            "repo": self.repo_name,
+            "label": self.label,
+            "etag": self.etag,
+            "since": self.since,
+            "issues": self.issues,
+        }
+        write_json(self.path, payload)
+
+    # ── in-memory index ────────────────────────────────────────
+
+    def _put(self, number: str, entry: Dict[str, Any]) -> None:
+        self._drop(number)
+        norm = normalize_title(entry.get("title", ""))
+        entry["hash"] = hashlib.sha1(norm.encode("utf-8")).hexdigest()
+        self.issues[number] = entry
+        self._by_hash[entry["hash"]] = number
+        for token in set(norm.split()):
+            self._by_token.setdefault(token, set()).add(number)
+
+    def _drop(self, number: str) -> None:
+        old = self.issues.pop(number, None)
+        if old is None:
+            return
+        if self._by_hash.get(old.get("hash", "")) == number:
+            del self._by_hash[old["hash"]]
+        for token in set(normalize_title(old.get("title", "")).split()):
+            self._by_token.get(token, set()).discard(number)
+
+    def add(self, number: int, title: str, url: str = "") -> None:
+        """Record an issue created during this run."""
+        self._put(str(number), {
+            "title": title,
+            "url": url,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        })
+
+    def find_duplicate(self, title: str) -> Optional[Dict[str, Any]]:
+        """
+        Find an open issue whose title matches ``title`` exactly or fuzzily.
+
+        Returns:
+            The matching index entry (with ``number``), or None
+        """
+        norm = normalize_title(title)
+        if not norm:
+            return None
+
+        number = self._by_hash.get(hashlib.sha1(norm.encode("utf-8")).hexdigest())
+        if number is None:
+            candidates: Set[str] = set()
+            for token in set(norm.split()):
+                candidates |= self._by_token.get(token, set())
+            best_score = 0.0
+            for candidate in candidates:
+                score = title_similarity(norm, normalize_title(self.issues[candidate]["title"]))
+                if score >= self.match_threshold and score > best_score:
+                    number, best_score = candidate, score
+        if number is None:
+            return None
+        return {"number": int(number), **self.issues[number]}
+
+    # ── sync ───────────────────────────────────────────────────
+
+    def _http(self) -> Any:
+        if self._session is None:
+            self._session = session_for(github_api_url())
+        return self._session
+
+    def sync(self) -> int:
+        """
+        Incrementally refresh the index from the GitHub API.
+
+        Returns:
+            Number of issues added, updated or removed
+
+        Raises:
+            RuntimeError: If the GitHub API request fails
+        """
+        headers = {
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28",
+        }
+        if self._token:
+            headers["Authorization"] = f"Bearer {self._token}"
+
+        params: Dict[str, Any] = {
+            "labels": self.label,
+            "state": "all" if self.since else "open",
+            "per_page": 100,
+            "sort": "updated",
+            "direction": "asc",
+        }
+        if self.since:
+            params["since"] = self.since
+
+        url: Optional[str] = f"{github_api_url()}/repos/{self.repo_name}/issues"
+        first = True
+        changed = 0
+        newest = self.since
+        etag = self.etag
+        http = self._http()
+
+        while url:
+            page_headers = dict(headers)
+            if first and self.etag:
+                page_headers["If-None-Match"] = self.etag
+            resp = http.get(url, headers=page_headers, params=params if first else None, timeout=timeouts())
+
+            if resp.status_code == 304:
+                logger.debug("Issue index unchanged (304 Not Modified)")
+                return 0
+            if not resp.ok:
+                raise RuntimeError(f"GitHub issue listing failed (HTTP {resp.status_code})")
+            if first:
+                etag = resp.headers.get("ETag")
+
+            for issue in resp.json():
+                if "pull_request" in issue:
+                    continue
+                number = str(issue["number"])
+                if issue.get("state") == "open":
+                    self._put(number, {
+                        "title": issue.get("title", ""),
+                        "url": issue.get("html_url", ""),
+                        "updated_at": issue.get("updated_at", ""),
+                    })
+                else:
+                    self._drop(number)
+                changed += 1
+                updated_at = issue.get("updated_at")
+                if updated_at and (newest is None or updated_at > newest):
+                    newest = updated_at
+
+            url = _next_link(resp.headers.get("Link", ""))
+            first = False
+
+        # Only after every page arrived: a partial sync must not be remembered
+        # as current, or the next one would get a 304 and skip the rest
+        self.etag = etag
+        self.since = newest
+        logger.info(f"✓ Issue index synced ({changed} changes, {len(self.issues)} open issues)")
+        return changed
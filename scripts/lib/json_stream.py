@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# pyright: strict
+"""
+Incremental JSON Parsing
+=========================
+
+Parses a JSON object as it streams in, chunk by chunk, and reports each
+element of selected top-level arrays as soon as the element is complete.
+
+Used with streamed chat completions so that, for a response like::
+
+    {"highlights": ["...", "..."], "action_items": ["...", ...], ...}
+
+every highlight and action item is available before the model has finished
+writing the rest of the object. Text before the first ``{`` (e.g. a Markdown
+code fence) is ignored. The full text is still parsed normally at the end;
+this parser only provides early access.
+"""
+
+import json
+from typing import Any, Iterable, List, Optional, Tuple
+
+
+class JsonStreamParser:
+    """Character-level scanner emitting ``(key, element)`` pairs."""
+
+    def __init__(self, keys: Iterable[str]) -> None:
+        self.keys = set(keys)
+        self._started = False
+        self._done = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string: List[str] = []
+        self._last_string: Optional[str] = None
+        self._current_key: Optional[str] = None
+        self._array_key: Optional[str] = None
+        self._element: List[str] = []
+
+    @property
+    def done(self) -> bool:
+        """True once the top-level object has been closed."""
+        return self._done
+
+    def _emit(self, events: List[Tuple[str, Any]]) -> None:
+        text = "".join(self._element).strip()
+        self._element = []
+        if not text or self._array_key is None:
+            return
+        try:
+            events.append((self._array_key, json.loads(text)))
+        except json.JSONDecodeError:
+            pass
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Consume the next chunk of text.
+
+        Returns:
+            ``(key, element)`` for every array element completed in this chunk
+        """
+        events: List[Tuple[str, Any]] = []
+        capturing = self._array_key is not None
+
+        for ch in chunk:
+            if self._done:
+                break
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if capturing:
+                    self._element.append(ch)
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        try:
+                            self._last_string = json.loads('"' + "".join(self._string) + '"')
+                        except json.JSONDecodeError:
+                            self._last_string = None
+                    continue
+                if self._depth == 1:
+                    self._string.append(ch)
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                if self._depth == 1:
+                    self._string = []
+                if capturing:
+                    self._element.append(ch)
+            elif ch == ":" and self._depth == 1:
+                self._current_key = self._last_string
+            elif ch in "{[":
+                self._depth += 1
+                if self._depth == 2 and ch == "[" and self._current_key in self.keys:
+                    self._array_key = self._current_key
+                    self._element = []
+                    capturing = True
+                elif capturing:
+                    self._element.append(ch)
+            elif ch in "}]":
+                if ch == "]" and self._depth == 2 and capturing:
+                    self._emit(events)
+                    self._array_key = None
+                    capturing = False
+                elif capturing:
+                    self._element.append(ch)
+                self._depth -= 1
+                if self._depth == 0:
+                    self._done = True
+            elif ch == "," and capturing and self._depth == 2:
+                self._emit(events)
+            else:
+                if ch == "," and self._depth == 1:
+                    self._current_key = None
+                if capturing:
+                    self._element.append(ch)
+
+        return events
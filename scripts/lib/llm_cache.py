@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# pyright: strict
+"""
+LLM Response Cache
+===================
+
+Disk cache for chat-completion responses, so re-running the daily automation
+on an unchanged note set (cron retries, re-runs after a GitHub failure) is
+near-instant and returns the same summary instead of a fresh sample.
+
+- Entries are keyed by a SHA-256 of (model, temperature, system prompt,
+  prompt); any change to the notes or the prompt template is a miss.
+- Each entry is one JSON file; entries older than ``ttl_seconds`` are misses
+  and are deleted on access.
+- The cache directory is bounded by ``max_bytes``: after each write the least
+  recently used entries (by file mtime, refreshed on every hit) are evicted.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .output_writer import dumps_json, write_atomic
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+
+def cache_key(model: str, temperature: float, system_prompt: str, prompt: str) -> str:
+    """Stable key for one chat-completion request."""
+    payload = json.dumps(
+        {"model": model, "temperature": temperature, "system": system_prompt, "prompt": prompt},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """TTL + size-bounded LRU cache of LLM responses on disk."""
+
+    def __init__(
+        self,
+        directory: Path,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached entry for ``key``, or None on a miss.
+
+        The entry is a dict with ``content``, ``model`` and ``created_at``.
+        """
+        path = self._path(key)
+        with self._lock:
+            try:
+                entry: Dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                self.misses += 1
+                return None
+            except (OSError, json.JSONDecodeError) as e:
+                logger.debug("Dropping unreadable cache entry %s: %s", path.name, e)
+                path.unlink(missing_ok=True)
+                self.misses += 1
+                return None
+
+            if time.time() - float(entry.get("created_at", 0)) > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                self.misses += 1
+                return None
+
+            try:
+                os.utime(path)  # mark as recently used
+            except OSError:
+                pass
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, content: str, model: str) -> None:
+        """Store a response and evict least recently used entries if over budget."""
+        entry = {"content": content, "model": model, "created_at": time.time()}
+        with self._lock:
+            # A cache entry is cheap to lose, so skip the fsync
+            write_atomic(self._path(key), dumps_json(entry, indent=False), skip_unchanged=False, fsync=False)
+            self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".json") and entry.is_file():
+                    st = entry.stat()
+                    entries.append((st.st_mtime_ns, st.st_size, entry.path))
+                    total += st.st_size
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
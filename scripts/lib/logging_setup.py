@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# pyright: strict
+"""
+Logging Setup
+==============
+
+Non-blocking logging shared by the entry points:
+
+- callers only enqueue records (``QueueHandler``); a ``QueueListener``
+  thread formats and writes them, so a slow terminal, pipe or log collector
+  never stalls a step
+- ``LOG_FORMAT=json`` writes one JSON object per line with the timestamp,
+  level, logger, message and every ``extra`` field (``run_id``, ``stage``,
+  ``step``, ``tenant``, ...); the default ``text`` format is unchanged
+- ``LOG_LEVEL`` sets the root level (default ``INFO``)
+
+Filters passed to ``setup_logging`` run on the calling thread, before the
+record is queued, so filters that read context variables (such as
+``lib.tracing.TraceContextFilter``) still see the caller's span.
+
+Messages are merged with their ``%`` arguments when enqueued, so hot paths
+should log with ``logger.debug("... %s", value)`` rather than f-strings:
+a disabled level then costs one level check.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Optional, TextIO
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
+
+# Attributes every LogRecord has; anything else came from ``extra``
+_RECORD_ATTRS = frozenset(
+    vars(logging.LogRecord("", logging.INFO, "", 0, "", None, None)).keys()
+) | {"message", "asctime", "taskName", "trace_context"}
+
+_lock = threading.Lock()
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, including ``extra`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Enqueues records with their message merged and traceback rendered."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # Render now, while the frames are as they were when logged
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup_logging(
+    text_format: str = TEXT_FORMAT,
+    filters: Iterable[logging.Filter] = (),
+    stream: Optional[TextIO] = None,
+    level: Optional[str] = None,
+    log_format: Optional[str] = None,
+) -> logging.handlers.QueueListener:
+    """
+    Route the root logger through a queue to a background writer.
+
+    Replaces any root handlers (like ``logging.basicConfig(force=True)``).
+    Calling it again stops the previous listener first, after flushing it.
+
+    Args:
+        text_format: ``%``-style format for the text output.
+        filters: Filters run on the calling thread for every record.
+        stream: Where to write (default ``sys.stderr``).
+        level: Root level name (default ``LOG_LEVEL`` or ``INFO``).
+        log_format: ``text`` or ``json`` (default ``LOG_FORMAT`` or ``text``).
+    """
+    global _listener
+
+    level_name = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+    fmt = (log_format or os.getenv("LOG_FORMAT", "text")).lower()
+
+    writer = logging.StreamHandler(stream or sys.stderr)
+    writer.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(text_format, DATE_FORMAT))
+
+    records: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+    handler = _QueueHandler(records)
+    for log_filter in filters:
+        handler.addFilter(log_filter)
+
+    with _lock:
+        _stop_locked()
+        root = logging.getLogger()
+        for old in root.handlers[:]:
+            root.removeHandler(old)
+            old.close()
+        root.addHandler(handler)
+        root.setLevel(getattr(logging, level_name, logging.INFO))
+        _listener = logging.handlers.QueueListener(records, writer, respect_handler_level=True)
+        _listener.start()
+        return _listener
+
+
+def _stop_locked() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()  # drains the queue before returning
+        for handler in _listener.handlers:
+            try:
+                handler.flush()
+            except (OSError, ValueError):
+                pass  # stream already closed (like logging.shutdown, ignore at exit)
+        _listener = None
+
+
+def stop_logging() -> None:
+    """Flush and stop the background writer (also runs at exit)."""
+    with _lock:
+        _stop_locked()
+
+
+atexit.register(stop_logging)
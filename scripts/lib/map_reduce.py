@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# pyright: strict
+"""
+Map-Reduce Summarization
+=========================
+
+Helpers for summarizing note sets that do not fit in one prompt.
+
+- ``TokenCounter`` counts tokens with tiktoken when it is installed and its
+  encoding can be loaded, and falls back to a ~4 characters/token estimate.
+- ``batch_notes`` packs notes, in order, into batches under a token budget;
+  a single note larger than the budget is split on line boundaries.
+- ``map_reduce`` summarizes batches concurrently, then reduces the partial
+  summaries in rounds until one remains. Latency grows with the number of
+  reduce rounds (logarithmic in note volume), not with the number of batches.
+- ``merge_partials`` is a deterministic reducer, used when an LLM reduce call
+  is not possible.
+"""
+
+import contextvars
+import json
+import logging
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Sequence, TypeVar
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4
+
+Summary = Dict[str, Any]
+
+
+class TokenCounter:
+    """Token counting with an optional tiktoken backend."""
+
+    def __init__(self, model: str) -> None:
+        self.model = model
+        self._encoding: Any = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> Any:
+        with self._lock:
+            if not self._loaded:
+                self._loaded = True
+                try:
+                    import tiktoken  # type: ignore
+
+                    try:
+                        self._encoding = tiktoken.encoding_for_model(self.model)
+                    except KeyError:
+                        self._encoding = tiktoken.get_encoding("cl100k_base")
+                except Exception as e:
+                    # Not installed, or the encoding file cannot be downloaded
+                    logger.debug(f"tiktoken unavailable, estimating tokens from length: {e}")
+        return self._encoding
+
+    def count(self, text: str) -> int:
+        encoding = self._load()
+        if encoding is not None:
+            return len(encoding.encode(text))
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _split_oversized(note: str, budget: int, counter: TokenCounter) -> List[str]:
+    """Split a note that exceeds the budget into budget-sized pieces."""
+    pieces: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for line in note.splitlines() or [note]:
+        tokens = counter.count(line) + 1
+        if tokens > budget:
+            # A single enormous line: cut it by characters
+            step = max(1, budget * CHARS_PER_TOKEN)
+            for i in range(0, len(line), step):
+                pieces.append(line[i:i + step])
+            continue
+        if current and current_tokens + tokens > budget:
+            pieces.append("\n".join(current))
+            current, current_tokens = [], 0
+        current.append(line)
+        current_tokens += tokens
+    if current:
+        pieces.append("\n".join(current))
+    return pieces
+
+
+def batch_notes(notes: List[str], budget: int, counter: TokenCounter) -> List[List[str]]:
+    """
+    Pack notes into consecutive batches of at most ``budget`` tokens.
+
+    Returns:
+        Batches in note order; never empty for non-empty input
+    """
+    batches: List[List[str]] = []
+    current: List[str] = []
+    current_tokens = 0
+    for note in notes:
+        tokens = counter.count(note) + 4  # numbering / separator overhead
+        parts = [note] if tokens <= budget else _split_oversized(note, budget - 4, counter)
+        for part in parts:
+            part_tokens = counter.count(part) + 4
+            if current and current_tokens + part_tokens > budget:
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(part)
+            current_tokens += part_tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def merge_partials(partials: List[Summary], max_highlights: int = 4) -> Summary:
+    """Deterministically combine partial summaries into the final schema."""
+    highlights: List[str] = []
+    action_items: List[Any] = []
+    assessments: List[str] = []
+    seen: set[str] = set()
+
+    for partial in partials:
+        for highlight in partial.get("highlights") or []:
+            if highlight and len(highlights) < max_highlights:
+                highlights.append(str(highlight))
+        for item in partial.get("action_items") or []:
+            text = item if isinstance(item, str) else json.dumps(item, ensure_ascii=False)
+            key = text.strip().lower()
+            if key and key not in seen:
+                seen.add(key)
+                action_items.append(item)
+        if partial.get("assessment"):
+            assessments.append(str(partial["assessment"]))
+
+    return {
+        "highlights": highlights,
+        "action_items": action_items,
+        "assessment": " ".join(assessments),
+    }
+
+
+_T = TypeVar("_T")
+
+
+def _map_in_context(executor: ThreadPoolExecutor, fn: Callable[[_T], Any], items: Sequence[_T]) -> List[Any]:
+    """``executor.map`` with each call run in a copy of the caller's context."""
+    futures = [executor.submit(contextvars.copy_context().run, fn, item) for item in items]
+    return [f.result() for f in futures]
+
+
+def map_reduce(
+    batches: List[List[str]],
+    summarize: Callable[[List[str]], Summary],
+    reduce: Callable[[List[Summary]], Summary],
+    fan_in: int = 4,
+    max_workers: int = 4,
+) -> Summary:
+    """
+    Summarize batches concurrently, then reduce partials ``fan_in`` at a time.
+
+    Args:
+        batches: Note batches from ``batch_notes``
+        summarize: Summarizes one batch of notes
+        reduce: Combines up to ``fan_in`` partial summaries into one
+        fan_in: Partials combined per reduce call
+        max_workers: Concurrent summarize/reduce calls
+    """
+    if not batches:
+        return merge_partials([])
+    fan_in = max(2, fan_in)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="summarize") as executor:
+        partials = _map_in_context(executor, summarize, batches)
+        logger.info(f"  Summarized {len(batches)} batches")
+        rounds = 0
+        while len(partials) > 1:
+            groups = [partials[i:i + fan_in] for i in range(0, len(partials), fan_in)]
+            partials = _map_in_context(executor, lambda g: g[0] if len(g) == 1 else reduce(g), groups)
+            rounds += 1
+        logger.info(f"  Reduced partial summaries in {rounds} round(s)")
+        return partials[0]
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# pyright: strict
+"""
+Parallel Note Reader
+=====================
+
+Reads note files on a thread pool, for note trees on network filesystems
+where ingest time is dominated by per-file open/read latency rather than
+bandwidth.
+
+- Results are returned in the order the paths were given, regardless of
+  which read finishes first.
+- Files larger than ``max_bytes`` are truncated to that size (and flagged),
+  so one runaway export cannot stall the run or blow up the prompt.
+- Files of ``mmap_threshold`` bytes or more are read through ``mmap``.
+- Bytes are decoded by BOM, then strict UTF-8, then cp1252, then Latin-1, so
+  a note in a legacy encoding is kept instead of dropped.
+"""
+
+import codecs
+import logging
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_MMAP_THRESHOLD = 1024 * 1024
+DEFAULT_WORKERS = 8
+
+_BOMS: Tuple[Tuple[bytes, str], ...] = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+@dataclass
+class NoteRead:
+    """Outcome of reading one note file."""
+
+    path: Path
+    raw: bytes = b""
+    content: str = ""
+    encoding: str = ""
+    truncated: bool = False
+    error: Optional[str] = None
+
+
+def decode_note(raw: bytes, truncated: bool = False) -> Tuple[str, str]:
+    """
+    Decode note bytes, detecting the encoding cheaply.
+
+    Args:
+        raw: File content
+        truncated: The bytes were cut at a size limit, so a trailing partial
+            UTF-8 sequence is dropped rather than treated as invalid
+
+    Returns:
+        (text, encoding name)
+    """
+    for bom, encoding in _BOMS:
+        if raw.startswith(bom):
+            return raw.decode(encoding, errors="replace"), encoding
+
+    try:
+        return raw.decode("utf-8"), "utf-8"
+    except UnicodeDecodeError as e:
+        if truncated and e.start >= len(raw) - 3 and e.reason == "unexpected end of data":
+            return raw[:e.start].decode("utf-8"), "utf-8"
+
+    try:
+        return raw.decode("cp1252"), "cp1252"
+    except UnicodeDecodeError:
+        return raw.decode("latin-1"), "latin-1"
+
+
+def read_note(
+    path: Path,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    mmap_threshold: int = DEFAULT_MMAP_THRESHOLD,
+) -> NoteRead:
+    """Read and decode one note; errors are returned, not raised."""
+    result = NoteRead(path=path)
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            limit = min(size, max_bytes)
+            if limit >= mmap_threshold:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    raw = mm[:limit]
+            else:
+                raw = f.read(limit)
+        result.truncated = size > max_bytes
+        result.raw = raw
+        result.content, result.encoding = decode_note(raw, truncated=result.truncated)
+        if result.truncated:
+            logger.warning(f"  Truncated {path.name} to {max_bytes:,} of {size:,} bytes")
+        elif result.encoding not in ("utf-8", "utf-8-sig"):
+            logger.debug("  Decoded %s as %s", path.name, result.encoding)
+    except (OSError, ValueError) as e:
+        result.error = str(e)
+    return result
+
+
+def read_notes(
+    paths: Sequence[Path],
+    max_workers: int = DEFAULT_WORKERS,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    mmap_threshold: int = DEFAULT_MMAP_THRESHOLD,
+) -> List[NoteRead]:
+    """Read many notes concurrently; results are in the order of ``paths``."""
+    if len(paths) <= 1 or max_workers <= 1:
+        return [read_note(p, max_bytes, mmap_threshold) for p in paths]
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="notes") as pool:
+        return list(pool.map(lambda p: read_note(p, max_bytes, mmap_threshold), paths))
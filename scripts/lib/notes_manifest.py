@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# pyright: strict
+"""
+Notes Manifest
+===============
+
+Tracks the notes directory between daily runs so only new or changed files
+need to be read.
+
+The manifest (``notes_manifest.json`` in the output directory) records the
+path, size, ``mtime_ns`` and SHA-256 of every note. A scan is a single
+``os.scandir`` walk over ``.md`` and ``.txt`` files:
+
+- files whose size and mtime match the manifest are not opened at all
+- other files are read and hashed; a file that was only touched (same hash)
+  counts as unchanged
+- files in the manifest but no longer on disk are reported as removed
+
+The new manifest is only written by ``NotesManifest.commit()``, so a run that
+fails after ingest sees the same delta again next time.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from .note_reader import DEFAULT_MAX_BYTES, DEFAULT_WORKERS, read_notes
+from .output_writer import write_json
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+NOTE_SUFFIXES = (".md", ".txt")
+
+
+@dataclass
+class NoteFile:
+    """A note read during a scan."""
+
+    path: str  # relative to the notes root, '/'-separated
+    content: str
+
+
+@dataclass
+class NotesDelta:
+    """What changed in the notes directory since the last committed scan."""
+
+    new: List[NoteFile] = field(default_factory=lambda: [])
+    changed: List[NoteFile] = field(default_factory=lambda: [])
+    unchanged: List[str] = field(default_factory=lambda: [])
+    unchanged_notes: List[NoteFile] = field(default_factory=lambda: [])
+    removed: List[str] = field(default_factory=lambda: [])
+    errors: List[str] = field(default_factory=lambda: [])
+
+    @property
+    def modified(self) -> List[NoteFile]:
+        """New and changed notes, in path order."""
+        return sorted(self.new + self.changed, key=lambda n: n.path)
+
+    @property
+    def all_notes(self) -> List[NoteFile]:
+        """Every note read during the scan, in path order."""
+        return sorted(self.new + self.changed + self.unchanged_notes, key=lambda n: n.path)
+
+    def summary(self) -> Dict[str, object]:
+        """Counts and paths suitable for run.json."""
+        return {
+            "new": len(self.new),
+            "changed": len(self.changed),
+            "unchanged": len(self.unchanged),
+            "removed": len(self.removed),
+            "new_files": [n.path for n in self.new],
+            "changed_files": [n.path for n in self.changed],
+            "removed_files": list(self.removed),
+        }
+
+
+def iter_note_files(root: Path, suffixes: Tuple[str, ...] = NOTE_SUFFIXES) -> Iterator[Tuple[str, os.stat_result]]:
+    """
+    Walk ``root`` once with ``os.scandir``, yielding (relative path, stat).
+
+    Symlinked directories are not followed, to avoid cycles.
+    """
+    stack = [(str(root), "")]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    rel = f"{prefix}{entry.name}"
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append((entry.path, f"{rel}/"))
+                        elif entry.name.lower().endswith(suffixes) and entry.is_file():
+                            yield rel, entry.stat()
+                    except OSError as e:
+                        logger.warning(f"  Skipping {entry.path}: {e}")
+        except OSError as e:
+            logger.warning(f"  Cannot scan {directory}: {e}")
+
+
+class NotesManifest:
+    """Persistent record of the notes directory used for incremental ingest."""
+
+    def __init__(
+        self,
+        path: Path,
+        notes_root: Path,
+        max_workers: int = DEFAULT_WORKERS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.path = path
+        self.notes_root = notes_root
+        self.max_workers = max_workers
+        self.max_bytes = max_bytes
+        self.entries: Dict[str, Dict[str, object]] = {}
+        self._pending: Optional[Dict[str, Dict[str, object]]] = None
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable notes manifest {self.path}: {e}")
+            return
+        if data.get("version") != MANIFEST_VERSION or data.get("root") != str(self.notes_root):
+            logger.info("Notes manifest is for a different directory or version; rescanning")
+            return
+        self.entries = data.get("files") or {}
+
+    def scan(self, read_unchanged: bool = False) -> NotesDelta:
+        """
+        Compare the notes directory against the manifest.
+
+        Args:
+            read_unchanged: Also load the content of unchanged files (into
+                ``unchanged_notes``) for callers that need the full set
+
+        Only new or modified files are read and hashed otherwise; reads run
+        concurrently (see note_reader.py). Call ``commit()`` once the delta
+        has been processed to make it the new baseline.
+        """
+        delta = NotesDelta()
+        pending: Dict[str, Dict[str, object]] = {}
+
+        listing = sorted(iter_note_files(self.notes_root))
+        to_read: List[str] = []
+        stat_unchanged: Set[str] = set()
+        for rel, st in listing:
+            previous = self.entries.get(rel)
+            if previous and previous.get("size") == st.st_size and previous.get("mtime_ns") == st.st_mtime_ns:
+                stat_unchanged.add(rel)
+                if not read_unchanged:
+                    continue
+            to_read.append(rel)
+
+        reads = dict(zip(to_read, read_notes(
+            [self.notes_root / rel for rel in to_read],
+            max_workers=self.max_workers,
+            max_bytes=self.max_bytes,
+        )))
+
+        for rel, st in listing:
+            previous = self.entries.get(rel)
+            read = reads.get(rel)
+            if read is not None and read.error is not None:
+                logger.warning(f"  Failed to read {rel}: {read.error}")
+                delta.errors.append(rel)
+                if previous:
+                    pending[rel] = previous
+                continue
+
+            if rel in stat_unchanged and previous is not None:
+                pending[rel] = previous
+                delta.unchanged.append(rel)
+                if read is not None:
+                    delta.unchanged_notes.append(NoteFile(rel, read.content))
+                continue
+
+            assert read is not None
+            digest = hashlib.sha256(read.raw).hexdigest()
+            pending[rel] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+            if previous is None:
+                delta.new.append(NoteFile(rel, read.content))
+            elif previous.get("sha256") != digest:
+                delta.changed.append(NoteFile(rel, read.content))
+            else:
+                delta.unchanged.append(rel)
+                if read_unchanged:
+                    delta.unchanged_notes.append(NoteFile(rel, read.content))
+
+        delta.removed = sorted(set(self.entries) - set(pending))
+        self._pending = pending
+        return delta
+
+    def commit(self) -> None:
+        """Atomically persist the state from the last ``scan()``."""
+        if self._pending is None:
+            return
+        payload = {
+            "version": MANIFEST_VERSION,
+            "root": str(self.notes_root),
+            "files": self._pending,
+        }
+        write_json(self.path, payload)
+        self.entries = self._pending
+        self._pending = None
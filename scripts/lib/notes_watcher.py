@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# pyright: strict
+"""
+Notes Watcher
+==============
+
+Waits for edits in the notes directory so ``daily_v2.py --watch`` can
+re-run as soon as a note is saved instead of on the next cron tick.
+
+Two implementations share the ``NotesWatcher`` interface:
+
+- ``InotifyWatcher`` (Linux): kernel notifications via ``libc`` through
+  ``ctypes``, one watch per directory, so an idle watcher costs nothing
+- ``PollingWatcher`` (everywhere else): compares the size and ``mtime_ns``
+  of every ``.md``/``.txt`` file every few seconds
+
+``create_watcher()`` picks inotify when it is available and falls back to
+polling. ``wait_for_changes()`` debounces a burst of events (an editor's
+save-as-rename, ``git pull``, a sync client) into a single re-run.
+"""
+
+import abc
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+from .notes_manifest import NOTE_SUFFIXES, iter_note_files
+
+logger = logging.getLogger(__name__)
+
+# <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+_WATCH_MASK = (
+    IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+)
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len
+_READ_SIZE = 64 * 1024
+
+
+class NotesWatcher(abc.ABC):
+    """Blocks until a note under ``root`` is created, changed or removed."""
+
+    def __init__(self, root: Path, exclude: Sequence[Path] = ()) -> None:
+        self.root = root
+        self.exclude = tuple(str(p.resolve()) for p in exclude)
+
+    def _excluded(self, path: str) -> bool:
+        return any(path == p or path.startswith(p + os.sep) for p in self.exclude)
+
+    @abc.abstractmethod
+    def wait(self, timeout: Optional[float]) -> bool:
+        """Return True once a change is seen, False after ``timeout`` seconds without one."""
+
+    def close(self) -> None:
+        pass
+
+
+class PollingWatcher(NotesWatcher):
+    """Detects changes by comparing note sizes and mtimes every ``interval`` seconds."""
+
+    def __init__(self, root: Path, interval: float = 2.0, exclude: Sequence[Path] = ()) -> None:
+        super().__init__(root, exclude)
+        self.interval = interval
+        self._snapshot = self._scan()
+        self._next_scan = time.monotonic() + interval
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        snapshot: Dict[str, Tuple[int, int]] = {}
+        for rel, st in iter_note_files(self.root):
+            if self.exclude and self._excluded(str((self.root / rel).resolve())):
+                continue
+            snapshot[rel] = (st.st_size, st.st_mtime_ns)
+        return snapshot
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            now = time.monotonic()
+            if now >= self._next_scan:
+                self._next_scan = now + self.interval
+                snapshot = self._scan()
+                if snapshot != self._snapshot:
+                    self._snapshot = snapshot
+                    return True
+            if deadline is not None and now >= deadline:
+                return False
+            wake = self._next_scan if deadline is None else min(self._next_scan, deadline)
+            time.sleep(max(0.0, wake - time.monotonic()))
+
+
+class InotifyWatcher(NotesWatcher):
+    """Linux inotify watches on ``root`` and every directory below it."""
+
+    def __init__(self, root: Path, exclude: Sequence[Path] = ()) -> None:
+        super().__init__(root, exclude)
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._add_watch.restype = ctypes.c_int
+        self._fd: int = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_init1: {os.strerror(err)}")
+        self._dirs: Dict[int, str] = {}
+        try:
+            self._watch_tree(str(root))
+        except OSError:
+            self.close()
+            raise
+
+    def _watch_tree(self, top: str) -> None:
+        for directory, subdirs, _ in os.walk(top):
+            if self._excluded(os.path.realpath(directory)):
+                subdirs[:] = []
+                continue
+            wd = self._add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                if directory == top and err != errno.ENOENT:
+                    raise OSError(err, f"inotify_add_watch {directory}: {os.strerror(err)}")
+                logger.warning(f"  Cannot watch {directory}: {os.strerror(err)}")
+                continue
+            self._dirs[wd] = directory
+
+    def _drain(self) -> bool:
+        """Read pending events; True if any concerns a note or a directory."""
+        relevant = False
+        while True:
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                return relevant
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = data[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+                offset += length
+
+                if mask & IN_Q_OVERFLOW:
+                    relevant = True  # events were dropped; assume something changed
+                    continue
+                if mask & IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    continue
+                directory = self._dirs.get(wd)
+                if directory is None:
+                    continue
+                path = os.path.join(directory, name) if name else directory
+                if self._excluded(os.path.realpath(path)):
+                    continue
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        try:
+                            self._watch_tree(path)  # new folder, possibly with notes in it
+                        except OSError as e:
+                            logger.warning(f"  Cannot watch {path}: {e}")
+                    relevant = True
+                elif name.lower().endswith(NOTE_SUFFIXES) and not name.startswith("."):
+                    relevant = True
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            readable, _, _ = select.select([self._fd], [], [], remaining)
+            if readable and self._drain():
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watcher(root: Path, poll_interval: float = 2.0, exclude: Sequence[Path] = ()) -> NotesWatcher:
+    """An ``InotifyWatcher`` on Linux, otherwise (or if inotify fails) a ``PollingWatcher``."""
+    if sys.platform.startswith("linux"):
+        try:
+            watcher = InotifyWatcher(root, exclude=exclude)
+            logger.info(f"👀 Watching {root} (inotify)")
+            return watcher
+        except (OSError, AttributeError) as e:
+            logger.warning(f"⚠️  inotify unavailable ({e}); polling every {poll_interval:g}s")
+    watcher = PollingWatcher(root, interval=poll_interval, exclude=exclude)
+    logger.info(f"👀 Watching {root} (polling every {poll_interval:g}s)")
+    return watcher
+
+
+def wait_for_changes(
+    watcher: NotesWatcher,
+    debounce: float,
+    stop: threading.Event,
+    max_delay: float = 30.0,
+) -> bool:
+    """
+    Block until notes change and then stay quiet for ``debounce`` seconds.
+
+    A steady stream of edits is cut off ``max_delay`` seconds after the first
+    one, so summaries still refresh while someone is typing with autosave.
+    Returns False once ``stop`` is set.
+    """
+    while not stop.is_set():
+        if watcher.wait(1.0):
+            break
+    else:
+        return False
+
+    first = time.monotonic()
+    while not stop.is_set():
+        remaining = max_delay - (time.monotonic() - first)
+        if remaining <= 0 or not watcher.wait(min(debounce, remaining)):
+            break
+    return not stop.is_set()
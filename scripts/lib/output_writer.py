@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# pyright: strict
+"""
+Atomic Output Writer
+=====================
+
+Writes the runner's JSON artifacts so readers (the Next.js frontend, other
+cron jobs) never see a half-written file:
+
+- payloads are serialized once (``dumps_json``) and the same bytes can be
+  written to several files
+- writes go to a temp file in the target directory, are fsync'd, and are
+  moved into place with ``os.replace``
+- a file whose existing content is byte-identical is left untouched, so its
+  mtime and any watchers are not disturbed
+
+``orjson`` is used for serialization when installed (set ``JSON_ENCODER=stdlib``
+to disable it); the output format matches ``json.dumps(indent=2,
+ensure_ascii=False)`` either way.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+_orjson: Any = None
+if os.getenv("JSON_ENCODER", "auto").lower() != "stdlib":
+    try:
+        import orjson as _orjson  # type: ignore
+    except ImportError:
+        _orjson = None
+
+
+_mode_lock = threading.Lock()
+_default_mode: Optional[int] = None
+
+
+def _new_file_mode() -> int:
+    """
+    Permissions for files created by ``write_atomic``.
+
+    mkstemp creates files as 0600; new outputs get the normal ``0666 & ~umask``
+    so other users (e.g. the web server) can still read them. The umask is
+    read on first use, not at import: reading it means briefly setting it,
+    which would race with files being created on other threads.
+    """
+    global _default_mode
+    with _mode_lock:
+        if _default_mode is None:
+            umask: Optional[int] = None
+            try:
+                with open("/proc/self/status", encoding="ascii") as f:
+                    for line in f:
+                        if line.startswith("Umask:"):
+                            umask = int(line.split()[1], 8)
+                            break
+            except (OSError, ValueError):
+                pass
+            if umask is None:
+                umask = os.umask(0o022)
+                os.umask(umask)
+            _default_mode = 0o666 & ~umask
+        return _default_mode
+
+
+def encoder_name() -> str:
+    return "orjson" if _orjson is not None else "json"
+
+
+def dumps_json(data: Any, indent: bool = True, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Serialize ``data`` to UTF-8 JSON bytes."""
+    if _orjson is not None:
+        option = _orjson.OPT_NON_STR_KEYS | (_orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return _orjson.dumps(data, option=option, default=default)
+        except TypeError:
+            # e.g. integers beyond 64 bits; the stdlib encoder handles these
+            pass
+    text = json.dumps(data, indent=2 if indent else None, ensure_ascii=False, default=default)
+    return text.encode("utf-8")
+
+
+def _fsync_dir(directory: Path) -> None:
+    try:
+        fd = os.open(str(directory), os.O_RDONLY)
+    except OSError:
+        return  # not supported on this platform
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _unchanged(path: Path, payload: bytes) -> bool:
+    try:
+        if path.stat().st_size != len(payload):
+            return False
+        return hashlib.sha256(path.read_bytes()).digest() == hashlib.sha256(payload).digest()
+    except OSError:
+        return False
+
+
+def write_atomic(path: Path, payload: bytes, skip_unchanged: bool = True, fsync: bool = True) -> bool:
+    """
+    Atomically replace ``path`` with ``payload``.
+
+    Returns:
+        True if the file was written, False if it already had this content
+    """
+    if skip_unchanged and _unchanged(path, payload):
+        logger.debug("  Unchanged: %s", path)
+        return False
+
+    try:
+        mode = path.stat().st_mode & 0o777
+    except OSError:
+        mode = _new_file_mode()
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.")
+    try:
+        os.fchmod(fd, mode)
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except Exception:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    if fsync:
+        _fsync_dir(path.parent)
+    return True
+
+
+def write_json(path: Path, data: Any, skip_unchanged: bool = True, fsync: bool = True) -> bool:
+    """Serialize and atomically write ``data``; see ``write_atomic``."""
+    return write_atomic(path, dumps_json(data), skip_unchanged=skip_unchanged, fsync=fsync)
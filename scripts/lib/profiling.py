@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# pyright: strict
+"""
+Step Profiling
+===============
+
+Opt-in deep profiling for the daily runner (``daily_v2.py --profile``).
+Each step is run under cProfile, tracemalloc and a stack sampler, and three
+files are written per step to the profile directory:
+
+- ``<step>.prof``: cProfile stats (``python -m pstats`` / snakeviz)
+- ``<step>.speedscope.json``: sampled stacks of every thread, one profile
+  per thread, for https://www.speedscope.app
+- ``<step>.allocations.txt``: peak traced memory and the top-N source lines
+  by net memory growth over the step
+
+cProfile only sees the thread running the step and tracemalloc is process
+wide, so steps should run one at a time while profiling. Nothing here is
+imported or started unless profiling is requested.
+"""
+
+import cProfile
+import logging
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from types import FrameType
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from .output_writer import write_json
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_SAMPLE_INTERVAL = 0.001
+DEFAULT_TOP_N = 25
+
+FrameKey = Tuple[str, str, int]
+
+
+class StackSampler:
+    """Background thread recording the stacks of all other threads."""
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL) -> None:
+        self.interval = interval
+        self.frames: List[FrameKey] = []
+        self._frame_index: Dict[FrameKey, int] = {}
+        # thread name -> (stacks, weights)
+        self.samples: Dict[str, Tuple[List[List[int]], List[float]]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.started_at = 0.0
+        self.duration = 0.0
+
+    def _stack(self, frame: Optional[FrameType]) -> List[int]:
+        stack: List[int] = []
+        while frame is not None:
+            code = frame.f_code
+            key = (code.co_name, code.co_filename, code.co_firstlineno)
+            index = self._frame_index.get(key)
+            if index is None:
+                index = self._frame_index[key] = len(self.frames)
+                self.frames.append(key)
+            stack.append(index)
+            frame = frame.f_back
+        stack.reverse()  # speedscope wants root first
+        return stack
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():  # pyright: ignore[reportPrivateUsage]
+                if ident == me:
+                    continue
+                stacks, weights = self.samples.setdefault(names.get(ident, str(ident)), ([], []))
+                stacks.append(self._stack(frame))
+                weights.append(elapsed)
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.perf_counter() - self.started_at
+
+    def speedscope(self, name: str) -> Dict[str, Any]:
+        """The samples in speedscope's file format."""
+        samples = self.samples or {threading.current_thread().name: ([], [])}
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "avidelta-daily-runner",
+            "activeProfileIndex": 0,
+            "shared": {
+                "frames": [{"name": fn, "file": file, "line": line} for fn, file, line in self.frames],
+            },
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": thread,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": round(self.duration, 6),
+                    "samples": stacks,
+                    "weights": [round(w, 6) for w in weights],
+                }
+                for thread, (stacks, weights) in samples.items()
+            ],
+        }
+
+
+def _allocation_report(
+    step: str,
+    before: tracemalloc.Snapshot,
+    after: tracemalloc.Snapshot,
+    peak: int,
+    top_n: int,
+) -> str:
+    filters = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),  # the sampler's own bookkeeping
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ]
+    stats = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+    lines = [
+        f"Step: {step}",
+        f"Peak traced memory: {peak / 1024:.1f} KiB",
+        f"Top {top_n} lines by memory still allocated at the end of the step (net growth):",
+        "",
+    ]
+    for stat in stats[:top_n]:
+        lines.append(str(stat))
+    return "\n".join(lines) + "\n"
+
+
+class StepProfiler:
+    """Profiles steps into one directory (``output/profiles/<run_id>/``)."""
+
+    def __init__(
+        self,
+        directory: Path,
+        top_n: int = DEFAULT_TOP_N,
+        sample_interval: float = DEFAULT_SAMPLE_INTERVAL,
+    ) -> None:
+        self.directory = directory
+        self.top_n = top_n
+        self.sample_interval = sample_interval
+        self._lock = threading.Lock()
+
+    def _path(self, step: str, suffix: str) -> Path:
+        return self.directory / (re.sub(r"[^A-Za-z0-9_-]+", "_", step) + suffix)
+
+    def run(self, step: str, fn: Callable[[], T]) -> T:
+        """Run ``fn`` under the profilers and write its reports, even if it raises."""
+        # Only one step at a time: tracemalloc and the sampler are process wide
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            was_tracing = tracemalloc.is_tracing()
+            if not was_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot()
+            sampler = StackSampler(self.sample_interval)
+            profile = cProfile.Profile()
+
+            sampler.start()
+            profile.enable()
+            try:
+                return fn()
+            finally:
+                profile.disable()
+                sampler.stop()
+                after = tracemalloc.take_snapshot()
+                _, peak = tracemalloc.get_traced_memory()
+                if not was_tracing:
+                    tracemalloc.stop()
+                self._write(step, profile, sampler, before, after, peak)
+
+    def _write(
+        self,
+        step: str,
+        profile: cProfile.Profile,
+        sampler: StackSampler,
+        before: tracemalloc.Snapshot,
+        after: tracemalloc.Snapshot,
+        peak: int,
+    ) -> None:
+        try:
+            profile.dump_stats(str(self._path(step, ".prof")))
+            write_json(self._path(step, ".speedscope.json"), sampler.speedscope(step), fsync=False)
+            self._path(step, ".allocations.txt").write_text(
+                _allocation_report(step, before, after, peak, self.top_n), encoding="utf-8"
+            )
+            logger.info(f"🔬 Profiled {step}: {self._path(step, '.*')}")
+        except Exception as e:
+            logger.warning(f"⚠️  Could not write profile for {step}: {e}")
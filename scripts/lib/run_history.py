@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# pyright: strict
+"""
+Run History Database
+=====================
+
+Keeps every daily-automation run in a local SQLite database, next to the
+single ``run.json`` that only describes the latest run, so step durations
+and failure rates can be compared across days:
+
+- ``runs``: one row per run (status, timestamps, duration, artifacts)
+- ``steps``: one row per step of each run (status, duration, error, and the
+  CPU/memory/HTTP metrics from ``lib.step_metrics``)
+
+Re-recording a run with the same ``run_id`` replaces its rows. Timestamps are
+stored as UTC ISO-8601 text, which sorts chronologically.
+
+Usage:
+    python scripts/lib/run_history.py steps --days 30
+    python scripts/lib/run_history.py failures --days 30
+    python scripts/lib/run_history.py slowest --days 30 --limit 10
+"""
+
+import argparse
+import json
+import logging
+import sqlite3
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 2
+DEFAULT_PERCENTILES = (50.0, 90.0, 95.0, 99.0)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id       TEXT PRIMARY KEY,
+    started_at   TEXT NOT NULL,
+    ended_at     TEXT,
+    duration_sec REAL,
+    status       TEXT NOT NULL,
+    demo_mode    INTEGER NOT NULL DEFAULT 0,
+    artifacts    TEXT NOT NULL DEFAULT '{}',
+    extra        TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_runs_started_at ON runs (started_at);
+CREATE INDEX IF NOT EXISTS idx_runs_status ON runs (status, started_at);
+
+CREATE TABLE IF NOT EXISTS steps (
+    run_id       TEXT NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    seq          INTEGER NOT NULL,
+    started_at   TEXT NOT NULL,
+    stage        TEXT NOT NULL,
+    step         TEXT NOT NULL,
+    status       TEXT NOT NULL,
+    duration_sec REAL,
+    error        TEXT,
+    cpu_sec             REAL,
+    rss_peak_delta_kb   INTEGER,
+    http_calls          INTEGER,
+    http_bytes_sent     INTEGER,
+    http_bytes_received INTEGER,
+    PRIMARY KEY (run_id, seq)
+);
+CREATE INDEX IF NOT EXISTS idx_steps_step_started_at ON steps (step, started_at);
+"""
+
+# Step metric columns added in schema v2 (see lib/step_metrics.py)
+_STEP_METRIC_COLUMNS = (
+    ("cpu_sec", "REAL"),
+    ("rss_peak_delta_kb", "INTEGER"),
+    ("http_calls", "INTEGER"),
+    ("http_bytes_sent", "INTEGER"),
+    ("http_bytes_received", "INTEGER"),
+)
+
+# Top-level run.json keys stored in their own columns; anything else goes to ``extra``
+_RUN_COLUMNS = {"run_id", "started_at", "ended_at", "duration_sec", "status", "demo_mode", "steps", "artifacts"}
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Linear-interpolated percentile of an already sorted, non-empty sequence."""
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    rank = (len(sorted_values) - 1) * pct / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+def since_days(days: float, now: Optional[datetime] = None) -> str:
+    """ISO timestamp ``days`` before ``now`` (UTC), for the ``since`` arguments."""
+    return ((now or datetime.now(timezone.utc)) - timedelta(days=days)).isoformat()
+
+
+class RunHistory:
+    """SQLite store of run summaries."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._migrate()
+
+    def _migrate(self) -> None:
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            raise RuntimeError(f"{self.path} has schema v{version}; this code supports v{SCHEMA_VERSION}")
+        with self._conn:
+            if version == 1:
+                for column, sql_type in _STEP_METRIC_COLUMNS:
+                    self._conn.execute(f"ALTER TABLE steps ADD COLUMN {column} {sql_type}")
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "RunHistory":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def record_run(self, summary: Mapping[str, Any]) -> None:
+        """Insert (or replace) a run from its run.json summary."""
+        run_id = str(summary["run_id"])
+        started_at = str(summary["started_at"])
+        extra = {k: v for k, v in summary.items() if k not in _RUN_COLUMNS}
+        steps: List[Mapping[str, Any]] = list(summary.get("steps") or [])
+
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+            self._conn.execute(
+                "INSERT INTO runs (run_id, started_at, ended_at, duration_sec, status, demo_mode, artifacts, extra)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_id,
+                    started_at,
+                    summary.get("ended_at"),
+                    summary.get("duration_sec"),
+                    str(summary.get("status", "unknown")),
+                    1 if summary.get("demo_mode") else 0,
+                    json.dumps(summary.get("artifacts") or {}, ensure_ascii=False),
+                    json.dumps(extra, ensure_ascii=False, default=str),
+                ),
+            )
+            self._conn.executemany(
+                "INSERT INTO steps (run_id, seq, started_at, stage, step, status, duration_sec, error,"
+                " cpu_sec, rss_peak_delta_kb, http_calls, http_bytes_sent, http_bytes_received)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        run_id,
+                        seq,
+                        started_at,
+                        str(s.get("stage", "")),
+                        str(s.get("step", "")),
+                        str(s.get("status", "unknown")),
+                        s.get("duration_sec"),
+                        s.get("error"),
+                        *(s.get(column) for column, _ in _STEP_METRIC_COLUMNS),
+                    )
+                    for seq, s in enumerate(steps)
+                ],
+            )
+
+    def step_durations(
+        self,
+        since: Optional[str] = None,
+        percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+        include_demo: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Duration percentiles per step since ``since``.
+
+        Returns:
+            One dict per step with ``stage``, ``step``, ``count``, ``mean``,
+            ``max`` and ``p<N>`` keys, ordered by mean duration descending
+        """
+        rows = self._conn.execute(
+            "SELECT s.stage, s.step, s.duration_sec FROM steps s JOIN runs r USING (run_id)"
+            " WHERE s.duration_sec IS NOT NULL AND s.started_at >= ? AND (? OR r.demo_mode = 0)"
+            " ORDER BY s.step, s.duration_sec",
+            (since or "", 1 if include_demo else 0),
+        ).fetchall()
+
+        grouped: Dict[str, List[float]] = {}
+        stages: Dict[str, str] = {}
+        for row in rows:
+            grouped.setdefault(row["step"], []).append(float(row["duration_sec"]))
+            stages[row["step"]] = row["stage"]
+
+        report: List[Dict[str, Any]] = []
+        for step, values in grouped.items():
+            entry: Dict[str, Any] = {
+                "stage": stages[step],
+                "step": step,
+                "count": len(values),
+                "mean": round(sum(values) / len(values), 3),
+            }
+            for pct in percentiles:
+                entry[f"p{pct:g}"] = round(percentile(values, pct), 3)
+            entry["max"] = round(values[-1], 3)
+            report.append(entry)
+        report.sort(key=lambda e: e["mean"], reverse=True)
+        return report
+
+    def failure_rates(self, since: Optional[str] = None, include_demo: bool = False) -> Dict[str, Any]:
+        """Run-level and per-step failure rates since ``since``."""
+        params = (since or "", 1 if include_demo else 0)
+        run_rows = self._conn.execute(
+            "SELECT status, COUNT(*) AS n FROM runs"
+            " WHERE started_at >= ? AND (? OR demo_mode = 0) GROUP BY status",
+            params,
+        ).fetchall()
+        by_status = {row["status"]: row["n"] for row in run_rows}
+        total = sum(by_status.values())
+
+        step_rows = self._conn.execute(
+            "SELECT s.stage, s.step, COUNT(*) AS total,"
+            " SUM(CASE WHEN s.status = 'success' THEN 0 ELSE 1 END) AS failed"
+            " FROM steps s JOIN runs r USING (run_id)"
+            " WHERE s.started_at >= ? AND (? OR r.demo_mode = 0)"
+            " GROUP BY s.stage, s.step ORDER BY failed * 1.0 / COUNT(*) DESC, s.step",
+            params,
+        ).fetchall()
+
+        return {
+            "runs": {
+                "total": total,
+                "by_status": by_status,
+                "failure_rate": round(by_status.get("failed", 0) / total, 4) if total else 0.0,
+            },
+            "steps": [
+                {
+                    "stage": row["stage"],
+                    "step": row["step"],
+                    "total": row["total"],
+                    "failed": row["failed"],
+                    "failure_rate": round(row["failed"] / row["total"], 4),
+                }
+                for row in step_rows
+            ],
+        }
+
+    def slowest_runs(self, since: Optional[str] = None, limit: int = 10, include_demo: bool = False) -> List[Dict[str, Any]]:
+        """The ``limit`` longest runs since ``since``, with their step durations."""
+        runs = self._conn.execute(
+            "SELECT run_id, started_at, duration_sec, status FROM runs"
+            " WHERE duration_sec IS NOT NULL AND started_at >= ? AND (? OR demo_mode = 0)"
+            " ORDER BY duration_sec DESC LIMIT ?",
+            (since or "", 1 if include_demo else 0, limit),
+        ).fetchall()
+
+        report: List[Dict[str, Any]] = []
+        for run in runs:
+            steps = self._conn.execute(
+                "SELECT step, status, duration_sec FROM steps WHERE run_id = ? ORDER BY seq",
+                (run["run_id"],),
+            ).fetchall()
+            report.append({
+                "run_id": run["run_id"],
+                "started_at": run["started_at"],
+                "duration_sec": run["duration_sec"],
+                "status": run["status"],
+                "steps": {s["step"]: s["duration_sec"] for s in steps},
+            })
+        return report
+
+
+# ── CLI ────────────────────────────────────────────────────────────
+
+
+def _print_table(rows: List[Dict[str, Any]], columns: Sequence[str]) -> None:
+    if not rows:
+        print("(no runs in range)")
+        return
+    cells = [[("" if row.get(c) is None else str(row.get(c))) for c in columns] for row in rows]
+    widths = [max(len(c), *(len(r[i]) for r in cells)) for i, c in enumerate(columns)]
+    print("  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    print("  ".join("-" * w for w in widths))
+    for r in cells:
+        print("  ".join(v.ljust(w) for v, w in zip(r, widths)))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Query the daily automation run history")
+    parser.add_argument("--db", type=Path, default=Path("output") / "run_history.sqlite3", help="History database")
+    parser.add_argument("--days", type=float, default=30, help="Only include runs from the last N days (default: 30)")
+    parser.add_argument("--include-demo", action="store_true", help="Include --demo runs")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    sub = parser.add_subparsers(dest="command", required=True)
+    steps_p = sub.add_parser("steps", help="Duration percentiles per step")
+    steps_p.add_argument("--percentiles", default="50,90,95,99", help="Comma-separated percentiles")
+    sub.add_parser("failures", help="Run and step failure rates")
+    slow_p = sub.add_parser("slowest", help="Slowest runs")
+    slow_p.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if not args.db.exists():
+        print(f"No run history at {args.db}", file=sys.stderr)
+        return 1
+
+    since = since_days(args.days)
+    with RunHistory(args.db) as history:
+        if args.command == "steps":
+            pcts = [float(p) for p in args.percentiles.split(",") if p.strip()]
+            result: Any = history.step_durations(since, pcts, include_demo=args.include_demo)
+            columns = ["stage", "step", "count", "mean", *(f"p{p:g}" for p in pcts), "max"]
+            rows = result
+        elif args.command == "failures":
+            result = history.failure_rates(since, include_demo=args.include_demo)
+            runs = result["runs"]
+            if not args.json:
+                print(f"Runs: {runs['total']}  failure rate: {runs['failure_rate']:.1%}  {runs['by_status']}")
+            columns = ["stage", "step", "total", "failed", "failure_rate"]
+            rows = result["steps"]
+        else:
+            result = history.slowest_runs(since, args.limit, include_demo=args.include_demo)
+            step_names: List[str] = []
+            for run in result:
+                step_names.extend(s for s in run["steps"] if s not in step_names)
+            columns = ["run_id", "status", "duration_sec", *step_names]
+            rows = [{**{k: v for k, v in run.items() if k != "steps"}, **run["steps"]} for run in result]
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        _print_table(rows, columns)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
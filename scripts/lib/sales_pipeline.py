@@ -17,6 +17,10 @@ from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
+from .env_checks import has_module
+from .output_writer import write_json
+from .transport import session_for
+
 logger = logging.getLogger(__name__)
 
 # Constants
@@ -351,13 +355,11 @@ class SalesPipelineDataSource:
            - SALESFORCE_PASSWORD
            - SALESFORCE_SECURITY_TOKEN (optional depending on org policy)
         """
-        try:
-            import requests  # type: ignore
-        except Exception as e:
+        if not has_module("requests"):
             raise RuntimeError(
                 "Missing 'requests' dependency for Salesforce integration. "
                 "Install with: pip install -r scripts/requirements.txt"
-            ) from e
+            )
 
         access_token = os.getenv("SALESFORCE_ACCESS_TOKEN") or self.config.api_key
         instance_url = self.config.salesforce_instance_url
@@ -387,7 +389,7 @@ class SalesPipelineDataSource:
                 password = f"{password}{self.config.salesforce_security_token}"
 
             logger.info("Authenticating to Salesforce (password grant)...")
-            resp = requests.post(
+            resp = session_for(token_url).post(
                 token_url,
                 data={
                     "grant_type": "password",
@@ -396,7 +398,6 @@ class SalesPipelineDataSource:
                     "username": self.config.salesforce_username,
                     "password": password,
                 },
-                timeout=30,
             )
             if not resp.ok:
                 raise RuntimeError(
@@ -423,8 +424,10 @@ class SalesPipelineDataSource:
         logger.info("Querying Salesforce Opportunities...")
         records: List[Dict[str, Any]] = []
         next_url: Optional[str] = query_url
+        # Every page goes to the same instance host, over one kept-alive connection
+        http = session_for(base)
         while next_url:
-            resp = requests.get(next_url, headers=headers, timeout=30)
+            resp = http.get(next_url, headers=headers)
             if not resp.ok:
                 raise RuntimeError(
                     f"Salesforce query failed (HTTP {resp.status_code}). "
@@ -512,9 +515,7 @@ class SalesPipelineDataSource:
             logger.debug("Supabase not configured; skipping sales pipeline upsert")
             return False
 
-        try:
-            import requests  # type: ignore
-        except Exception:
+        if not has_module("requests"):
             logger.warning("Missing 'requests'; cannot upsert sales pipeline to Supabase")
             return False
 
@@ -535,7 +536,7 @@ class SalesPipelineDataSource:
         }
 
         try:
-            resp = requests.post(endpoint, headers=headers, json=[row], timeout=30)
+            resp = session_for(endpoint).post(endpoint, headers=headers, json=[row])
             if not resp.ok:
                 logger.warning(
                     "Supabase upsert failed for sales pipeline snapshot",
@@ -572,8 +573,7 @@ class SalesPipelineDataSource:
         timestamp_str = datetime.now(timezone.utc).strftime(TIMESTAMP_FORMAT)
         cache_file = self.config.cache_dir / f"sales_pipeline_{timestamp_str}.json"
         
-        with open(cache_file, "w", encoding="utf-8") as f:
-            json.dump(data.to_dict(), f, indent=2, ensure_ascii=False)
+        write_json(cache_file, data.to_dict(), skip_unchanged=False)
         
         logger.info(f"✓ Cached sales pipeline data to {cache_file}")
         return cache_file
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# pyright: strict
+"""
+Step Graph Executor
+====================
+
+Runs automation steps as a small dependency graph: every step declares the
+steps it depends on, and steps whose dependencies are complete run
+concurrently on a bounded thread pool.
+
+Each step is executed through a caller-supplied runner (``run_step`` in
+daily_v2.py), so structured logging and ``allow_failure`` semantics stay in
+one place:
+
+- a step that fails with ``allow_failure=True`` completes with ``ok=False``;
+  its ``fallback`` (if any) provides the result passed to dependents
+- a step that fails with ``allow_failure=False`` aborts the graph: no new
+  steps are started, running steps are awaited, and ``StepGraphError`` is
+  raised with the outcomes recorded so far
+"""
+
+import contextvars
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+@dataclass
+class StepSpec:
+    """A node in the step graph."""
+
+    stage: str
+    step: str
+    fn: Callable[[Dict[str, Any]], Any]
+    depends_on: Tuple[str, ...] = ()
+    allow_failure: bool = True
+    fallback: Optional[Callable[[], Any]] = None
+
+
+@dataclass
+class StepOutcome:
+    """Result of executing one step."""
+
+    spec: StepSpec
+    ok: bool
+    result: Any = None
+    error: Optional[BaseException] = field(default=None)
+    duration_sec: Optional[float] = None
+
+
+# (spec, thunk) -> (ok, result); the thunk calls spec.fn with its dependencies
+StepRunner = Callable[[StepSpec, Callable[[], Any]], Tuple[bool, Any]]
+
+
+class StepGraphError(Exception):
+    """Raised when a mandatory step fails; carries the outcomes so far."""
+
+    def __init__(self, failed: StepOutcome, outcomes: List[StepOutcome]) -> None:
+        super().__init__(f"Step '{failed.spec.step}' failed: {failed.error}")
+        self.failed = failed
+        self.outcomes = outcomes
+
+
+def validate_graph(steps: Sequence[StepSpec]) -> None:
+    """
+    Check step names are unique, dependencies exist, and there are no cycles.
+
+    Raises:
+        ValueError: If the graph is invalid
+    """
+    names = [s.step for s in steps]
+    if len(names) != len(set(names)):
+        raise ValueError(f"Duplicate step names in graph: {names}")
+
+    by_name = {s.step: s for s in steps}
+    for spec in steps:
+        for dep in spec.depends_on:
+            if dep not in by_name:
+                raise ValueError(f"Step '{spec.step}' depends on unknown step '{dep}'")
+
+    visiting: set[str] = set()
+    done: set[str] = set()
+
+    def visit(name: str) -> None:
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Dependency cycle through step '{name}'")
+        visiting.add(name)
+        for dep in by_name[name].depends_on:
+            visit(dep)
+        visiting.discard(name)
+        done.add(name)
+
+    for name in names:
+        visit(name)
+
+
+def run_graph(
+    steps: Sequence[StepSpec],
+    runner: StepRunner,
+    max_workers: int = 4,
+) -> List[StepOutcome]:
+    """
+    Execute steps respecting dependencies, running independent steps concurrently.
+
+    Args:
+        steps: Step specs, in the order outcomes should be reported
+        runner: Executes one step and returns ``(ok, result)``
+        max_workers: Maximum number of steps running at once
+
+    Returns:
+        Outcomes of all steps, in declaration order
+
+    Raises:
+        StepGraphError: If a step with ``allow_failure=False`` fails
+        ValueError: If the graph is invalid
+    """
+    validate_graph(steps)
+
+    outcomes: Dict[str, StepOutcome] = {}
+    results: Dict[str, Any] = {}
+    pending = list(steps)
+    running: Dict[Future[Tuple[bool, Any]], StepSpec] = {}
+    fatal: Optional[StepOutcome] = None
+    durations: Dict[str, float] = {}
+
+    def timed(spec: StepSpec, thunk: Callable[[], Any]) -> Tuple[bool, Any]:
+        start = time.perf_counter()
+        try:
+            return runner(spec, thunk)
+        finally:
+            durations[spec.step] = time.perf_counter() - start
+
+    def submit(pool: ThreadPoolExecutor, spec: StepSpec) -> None:
+        deps = {name: results[name] for name in spec.depends_on}
+        thunk: Callable[[], Any] = lambda: spec.fn(deps)
+        # Run in a copy of the caller's context so context-local state
+        # (e.g. the active run/step) propagates into worker threads.
+        ctx = contextvars.copy_context()
+        running[pool.submit(ctx.run, timed, spec, thunk)] = spec
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="step") as pool:
+        while pending or running:
+            if fatal is None:
+                ready = [s for s in pending if all(d in outcomes for d in s.depends_on)]
+                for spec in ready:
+                    pending.remove(spec)
+                    submit(pool, spec)
+            else:
+                pending.clear()
+
+            if not running:
+                break
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                spec = running.pop(future)
+                try:
+                    ok, result = future.result()
+                    outcome = StepOutcome(spec, ok, result)
+                except Exception as e:
+                    outcome = StepOutcome(spec, False, None, e)
+                    if fatal is None:
+                        fatal = outcome
+                outcome.duration_sec = durations.get(spec.step)
+                if not outcome.ok and spec.fallback is not None:
+                    outcome.result = spec.fallback()
+                outcomes[spec.step] = outcome
+                results[spec.step] = outcome.result
+
+    ordered = [outcomes[s.step] for s in steps if s.step in outcomes]
+    if fatal is not None:
+        raise StepGraphError(fatal, ordered)
+    return ordered
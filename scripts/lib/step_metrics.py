@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# pyright: strict
+"""
+Per-Step Resource Metrics
+==========================
+
+Measures what each automation step costs, so a slow run can be pinned on
+OpenAI, GitHub, the CRM or disk:
+
+- ``wall_sec``: elapsed time
+- ``cpu_sec``: CPU time of the thread running the step
+- ``rss_peak_delta_kb``: growth of the process peak RSS while the step ran
+- ``http_calls`` / ``http_bytes_sent`` / ``http_bytes_received``: outbound
+  HTTP traffic made through ``requests`` or ``httpx``
+
+HTTP traffic is attributed through a context variable, so it is counted for
+the step whose context made the call, including helper threads that run in a
+copy of that context (the step graph, ``IssueCreator`` and ``map_reduce``
+all do). Call ``install_http_hooks()`` once to start counting (libraries not
+yet imported are patched on first import); other modules (e.g.
+``lib.tracing``) can watch the same calls with ``add_http_observer()``.
+
+Steps run concurrently, so the process-wide peak RSS can grow during one
+step because of another; treat it as an upper bound.
+"""
+
+import contextvars
+import functools
+import importlib.abc
+import logging
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from importlib.machinery import ModuleSpec
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+
+def peak_rss_kb() -> Optional[int]:
+    """Peak resident set size of this process so far, in KiB (None on Windows)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+@dataclass
+class StepMetrics:
+    """Resource usage of one step; filled in by ``start()``/``stop()``."""
+
+    wall_sec: float = 0.0
+    cpu_sec: float = 0.0
+    rss_peak_delta_kb: Optional[int] = None
+    http_calls: int = 0
+    http_bytes_sent: int = 0
+    http_bytes_received: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _started: Optional[Tuple[float, float, Optional[int]]] = field(default=None, repr=False)
+    _token: Optional["contextvars.Token[Optional[StepMetrics]]"] = field(default=None, repr=False)
+
+    def start(self) -> None:
+        """Begin measuring; HTTP calls in this context are counted from now."""
+        self._token = _active.set(self)
+        self._started = (time.perf_counter(), time.thread_time(), peak_rss_kb())
+
+    def stop(self) -> None:
+        """Finish measuring; must be called from the context that called ``start()``."""
+        if self._started is None:
+            return
+        wall0, cpu0, rss0 = self._started
+        self.wall_sec = time.perf_counter() - wall0
+        self.cpu_sec = time.thread_time() - cpu0
+        rss1 = peak_rss_kb()
+        self.rss_peak_delta_kb = rss1 - rss0 if rss0 is not None and rss1 is not None else None
+        self._started = None
+        if self._token is not None:
+            _active.reset(self._token)
+            self._token = None
+
+    def add_http(self, sent: int, received: int) -> None:
+        with self._lock:
+            self.http_calls += 1
+            self.http_bytes_sent += sent
+            self.http_bytes_received += received
+
+    def as_record(self) -> Dict[str, Any]:
+        """Fields for a run.json step record."""
+        record: Dict[str, Any] = {
+            "duration_sec": round(self.wall_sec, 3),
+            "cpu_sec": round(self.cpu_sec, 3),
+            "http_calls": self.http_calls,
+            "http_bytes_sent": self.http_bytes_sent,
+            "http_bytes_received": self.http_bytes_received,
+        }
+        if self.rss_peak_delta_kb is not None:
+            record["rss_peak_delta_kb"] = self.rss_peak_delta_kb
+        return record
+
+
+_active: contextvars.ContextVar[Optional[StepMetrics]] = contextvars.ContextVar("step_metrics", default=None)
+
+
+def _content_length(headers: Any) -> int:
+    try:
+        return int(headers.get("Content-Length") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+# An observer is called as ``observer(method, url)`` before each request, in
+# the caller's context. It may return a callback that is then called as
+# ``finish(status_code, bytes_sent, bytes_received, error)`` when it completes.
+HttpFinish = Callable[[Optional[int], int, int, Optional[BaseException]], None]
+HttpObserver = Callable[[str, str], Optional[HttpFinish]]
+
+_observers: List[HttpObserver] = []
+_hooks_lock = threading.Lock()
+
+
+def add_http_observer(observer: HttpObserver) -> None:
+    """Register ``observer`` for every hooked HTTP request (idempotent)."""
+    with _hooks_lock:
+        if observer not in _observers:
+            _observers.append(observer)
+
+
+def _wrap_send(original: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(original)
+    def send(self: Any, request: Any, *args: Any, **kwargs: Any) -> Any:
+        metrics = _active.get()
+        if metrics is None and not _observers:
+            return original(self, request, *args, **kwargs)
+        finishers = [f for f in (obs(str(request.method), str(request.url)) for obs in _observers) if f is not None]
+        sent = _content_length(request.headers)
+        try:
+            response = original(self, request, *args, **kwargs)
+        except Exception as e:
+            if metrics is not None:
+                metrics.add_http(sent, 0)
+            for finish in finishers:
+                finish(None, sent, 0, e)
+            raise
+        if kwargs.get("stream"):
+            # Reading a streamed body here would defeat streaming
+            received = _content_length(response.headers)
+        else:
+            received = len(response.content or b"")
+        if metrics is not None:
+            metrics.add_http(sent, received)
+        for finish in finishers:
+            finish(response.status_code, sent, received, None)
+        return response
+
+    setattr(send, "_step_metrics_hook", True)
+    return send
+
+
+def _patch(module_name: str, module: Any) -> None:
+    cls = module.Session if module_name == "requests" else module.Client
+    if not getattr(cls.send, "_step_metrics_hook", False):
+        cls.send = _wrap_send(cls.send)
+
+
+class _PatchingLoader(importlib.abc.Loader):
+    """Delegating loader that patches the module once it has executed."""
+
+    def __init__(self, loader: Any, name: str) -> None:
+        self._loader = loader
+        self._name = name
+
+    def create_module(self, spec: ModuleSpec) -> Any:
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: ModuleType) -> None:
+        self._loader.exec_module(module)
+        with _hooks_lock:
+            _pending.discard(self._name)
+            _patch(self._name, module)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+
+class _PatchOnImport(importlib.abc.MetaPathFinder):
+    """Patches ``requests``/``httpx`` when they are first imported."""
+
+    def find_spec(self, fullname: str, path: Any, target: Any = None) -> Optional[ModuleSpec]:
+        if fullname not in _pending:
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None:
+                    spec.loader = _PatchingLoader(spec.loader, fullname)
+                return spec
+        return None
+
+
+_HOOKED_MODULES = ("requests", "httpx")
+_pending: Set[str] = set()
+_finder = _PatchOnImport()
+
+
+def install_http_hooks() -> None:
+    """
+    Count HTTP traffic per step by wrapping ``requests`` and ``httpx`` send (idempotent).
+
+    Modules that are not imported yet are patched when they first are, so
+    calling this does not import either library.
+    """
+    with _hooks_lock:
+        for name in _HOOKED_MODULES:
+            module = sys.modules.get(name)
+            if module is not None:
+                _patch(name, module)
+            else:
+                _pending.add(name)
+        if _pending and _finder not in sys.meta_path:
+            sys.meta_path.insert(0, _finder)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# pyright: strict
+"""
+Multi-Tenant Runs
+==================
+
+Runs the daily automation for several teams in one process
+(``daily_v2.py --tenants tenants.json``) instead of one process per team.
+
+The config file lists one entry per tenant::
+
+    {
+      "tenants": [
+        {"name": "platform", "repo": "acme/platform", "notes": "notes/platform"},
+        {"name": "growth", "repo": "acme/growth", "notes": "notes/growth", "output": "output/growth"}
+      ]
+    }
+
+Relative paths are resolved against the config file's directory. ``output``
+defaults to ``<output_dir>/tenants/<name>``; every tenant needs its own
+output directory because the notes manifest, caches and run history live
+there.
+
+``SharedServices`` holds what the tenants share: the OpenAI and GitHub
+clients (and so their connection pools), the GitHub mutation pacer, a cap on
+concurrent OpenAI requests, and a single sales pipeline pull.
+"""
+
+import json
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .issue_creator import MutationPacer
+
+_NAME_RE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+@dataclass(frozen=True)
+class Tenant:
+    """One team's repository, notes directory and output directory."""
+
+    name: str
+    repo_name: str
+    notes_source: Path
+    output_dir: Path
+
+
+def load_tenants(path: Path, default_output_dir: Path) -> List[Tenant]:
+    """
+    Read and validate a tenants config file.
+
+    Raises:
+        ValueError: if the file is not valid JSON or an entry is malformed,
+            or two tenants share a name or output directory.
+    """
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"{path}: invalid JSON: {e}") from e
+
+    entries: Any = data.get("tenants") if isinstance(data, dict) else data
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"{path}: expected a non-empty \"tenants\" list")
+
+    base = path.parent
+    tenants: List[Tenant] = []
+    names: Dict[str, int] = {}
+    outputs: Dict[Path, str] = {}
+    for i, entry in enumerate(entries):  # type: ignore
+        if not isinstance(entry, dict):
+            raise ValueError(f"{path}: tenant #{i + 1} must be an object")
+        repo = entry.get("repo")  # type: ignore
+        notes = entry.get("notes")  # type: ignore
+        if not isinstance(repo, str) or "/" not in repo:
+            raise ValueError(f"{path}: tenant #{i + 1}: \"repo\" must be \"owner/repo\"")
+        if not isinstance(notes, str) or not notes:
+            raise ValueError(f"{path}: tenant #{i + 1}: \"notes\" is required")
+
+        name = str(entry.get("name") or repo)  # type: ignore
+        if name in names:
+            raise ValueError(f"{path}: tenant name {name!r} is used twice")
+        names[name] = i
+
+        output: Any = entry.get("output")  # type: ignore
+        output_dir = (
+            (base / output).resolve()
+            if isinstance(output, str) and output
+            else (default_output_dir / "tenants" / _NAME_RE.sub("_", name)).resolve()
+        )
+        if output_dir in outputs:
+            raise ValueError(f"{path}: tenants {outputs[output_dir]!r} and {name!r} share output {output_dir}")
+        outputs[output_dir] = name
+
+        tenants.append(Tenant(name=name, repo_name=repo, notes_source=(base / notes).resolve(), output_dir=output_dir))
+    return tenants
+
+
+@dataclass
+class SharedServices:
+    """Clients, limits and data shared by every tenant in a run."""
+
+    github_pacer: MutationPacer
+    openai_slots: threading.BoundedSemaphore
+    openai_client: Any = None
+    github_client: Any = None
+    # Held while the first tenant creates the API clients
+    clients_lock: threading.Lock = field(default_factory=threading.Lock)
+    _sales_lock: threading.Lock = field(default_factory=threading.Lock)
+    _sales_pulled: bool = False
+    _sales_data: Optional[Dict[str, Any]] = None
+
+    def sales_pipeline(self, pull: Callable[[], Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """The sales pipeline data, pulled by whichever tenant asks first."""
+        with self._sales_lock:
+            if not self._sales_pulled:
+                self._sales_data = pull()
+                self._sales_pulled = True
+            return self._sales_data
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# pyright: strict
+"""
+Run Tracing
+============
+
+Lightweight spans for the daily runner, exported as an OTLP/JSON file that
+Jaeger, Grafana Tempo or any OpenTelemetry collector can import:
+
+    daily-run
+    ├── ingest/load-notes
+    ├── transform/generate-summary
+    │   └── POST openai
+    ├── enrich/sales-pipeline
+    │   ├── POST salesforce
+    │   └── GET salesforce
+    └── output/github-issues
+        └── POST github
+
+The current span lives in a context variable, so spans started in step
+threads (and helper pools that copy the context) nest under the right
+parent. HTTP spans come from the ``lib.step_metrics`` request hooks; query
+strings are dropped from recorded URLs so tokens never reach the file.
+
+``TraceContextFilter`` adds the tenant, run id, stage and step of the
+current span to every log record.
+"""
+
+import contextlib
+import contextvars
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+from .output_writer import write_json
+from .step_metrics import HttpFinish, add_http_observer
+
+logger = logging.getLogger(__name__)
+
+# OTLP enum values
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+# Host suffix -> peer.service, for readable HTTP span names
+_SERVICES = (
+    ("api.openai.com", "openai"),
+    ("api.github.com", "github"),
+    ("salesforce.com", "salesforce"),
+    ("force.com", "salesforce"),
+    ("supabase.co", "supabase"),
+    ("hubapi.com", "hubspot"),
+    ("pipedrive.com", "pipedrive"),
+)
+
+# Attributes copied onto log records by TraceContextFilter
+_LOG_KEYS = ("tenant", "run_id", "stage", "step")
+
+
+def _service_for(host: str) -> str:
+    for suffix, service in _SERVICES:
+        if host == suffix or host.endswith("." + suffix):
+            return service
+    return host
+
+
+@dataclass
+class Span:
+    """One timed operation."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: Optional[str] = None
+    kind: int = SPAN_KIND_INTERNAL
+    attributes: Dict[str, Any] = field(default_factory=lambda: {})
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: Optional[int] = None
+    status_code: int = STATUS_OK
+    status_message: str = ""
+    tracer: Optional["Tracer"] = field(default=None, repr=False)
+    parent: Optional["Span"] = field(default=None, repr=False)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_status(self, code: int, message: str = "") -> None:
+        self.status_code = code
+        self.status_message = message
+
+    def record_error(self, error: BaseException) -> None:
+        self.set_status(STATUS_ERROR, f"{type(error).__name__}: {error}")
+
+    def end(self) -> None:
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        if self.tracer is not None:
+            self.tracer.finished(self)
+
+    def lookup(self, key: str) -> Any:
+        """``key`` from this span's attributes or the nearest ancestor's."""
+        span: Optional[Span] = self
+        while span is not None:
+            if key in span.attributes:
+                return span.attributes[key]
+            span = span.parent
+        return None
+
+
+_current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def _new_span(
+    name: str,
+    kind: int,
+    attributes: Optional[Dict[str, Any]],
+    tracer: Optional["Tracer"],
+) -> Span:
+    parent = _current.get()
+    if tracer is None and parent is not None:
+        tracer = parent.tracer
+    return Span(
+        name=name,
+        trace_id=parent.trace_id if parent is not None else os.urandom(16).hex(),
+        span_id=os.urandom(8).hex(),
+        parent_span_id=parent.span_id if parent is not None else None,
+        kind=kind,
+        attributes=dict(attributes or {}),
+        tracer=tracer,
+        parent=parent,
+    )
+
+
+@contextlib.contextmanager
+def start_span(
+    name: str,
+    attributes: Optional[Dict[str, Any]] = None,
+    kind: int = SPAN_KIND_INTERNAL,
+    tracer: Optional["Tracer"] = None,
+) -> Iterator[Span]:
+    """
+    Run a block as a span, child of the current span.
+
+    ``tracer`` is only needed for a root span; children report to their
+    parent's tracer. Spans without a tracer are not recorded but still
+    provide log context.
+    """
+    span = _new_span(name, kind, attributes, tracer)
+    token = _current.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.record_error(e)
+        raise
+    finally:
+        _current.reset(token)
+        span.end()
+
+
+def _http_observer(method: str, url: str) -> Optional[HttpFinish]:
+    parent = _current.get()
+    if parent is None or parent.tracer is None:
+        return None
+    parts = urlsplit(url)
+    host = parts.hostname or ""
+    service = _service_for(host)
+    span = _new_span(
+        f"{method} {service}",
+        SPAN_KIND_CLIENT,
+        {
+            "http.request.method": method,
+            "url.full": f"{parts.scheme}://{parts.netloc}{parts.path}",
+            "server.address": host,
+            "peer.service": service,
+        },
+        None,
+    )
+
+    def finish(status: Optional[int], sent: int, received: int, error: Optional[BaseException]) -> None:
+        span.set_attribute("http.request.body.size", sent)
+        span.set_attribute("http.response.body.size", received)
+        if status is not None:
+            span.set_attribute("http.response.status_code", status)
+            if status >= 400:
+                span.set_status(STATUS_ERROR, f"HTTP {status}")
+        if error is not None:
+            span.record_error(error)
+        span.end()
+
+    return finish
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": k, "value": _otlp_value(v)} for k, v in attributes.items() if v is not None]
+
+
+class Tracer:
+    """Collects finished spans and exports them as OTLP/JSON."""
+
+    def __init__(self, service_name: str, resource_attributes: Optional[Dict[str, Any]] = None) -> None:
+        self.resource_attributes = {"service.name": service_name, **(resource_attributes or {})}
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+        add_http_observer(_http_observer)
+
+    def finished(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def to_otlp(self) -> Dict[str, Any]:
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start_ns)
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": _otlp_attributes(self.resource_attributes)},
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": __name__},
+                            "spans": [
+                                {
+                                    "traceId": s.trace_id,
+                                    "spanId": s.span_id,
+                                    **({"parentSpanId": s.parent_span_id} if s.parent_span_id else {}),
+                                    "name": s.name,
+                                    "kind": s.kind,
+                                    "startTimeUnixNano": str(s.start_ns),
+                                    "endTimeUnixNano": str(s.end_ns or s.start_ns),
+                                    "attributes": _otlp_attributes(s.attributes),
+                                    "status": {
+                                        "code": s.status_code,
+                                        **({"message": s.status_message} if s.status_message else {}),
+                                    },
+                                }
+                                for s in spans
+                            ],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def export(self, path: Path) -> Path:
+        """Write the finished spans to ``path`` as OTLP/JSON."""
+        write_json(path, self.to_otlp(), fsync=False)
+        return path
+
+
+def prune_traces(directory: Path, keep: int) -> None:
+    """Delete all but the ``keep`` most recent trace files in ``directory``."""
+    try:
+        files = sorted(directory.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+    except OSError:
+        return
+    for old in files[keep:]:
+        try:
+            old.unlink()
+        except OSError:
+            pass
+
+
+class TraceContextFilter(logging.Filter):
+    """
+    Adds ``trace_context`` (e.g. `` [run_id=... stage=... step=...]``) to log
+    records, from ``extra`` fields or the current span. Values taken from the
+    span are also set as record attributes, like ``extra`` fields.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        span = _current.get()
+        parts: List[str] = []
+        for key in _LOG_KEYS:
+            value = getattr(record, key, None)
+            if value is None and span is not None:
+                value = span.lookup(key)
+                if value is not None:
+                    setattr(record, key, value)  # a field of its own for JSON logs
+            if value is not None:
+                parts.append(f"{key}={value}")
+        record.trace_context = f" [{' '.join(parts)}]" if parts else ""
+        return True
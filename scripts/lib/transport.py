@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# pyright: strict
+"""
+HTTP Transport
+===============
+
+Shared, pooled HTTP connections for every outbound integration.
+
+``session_for(url)`` returns one keep-alive ``requests.Session`` per scheme
+and host, so paginated pulls (Salesforce query pages, GitHub issue
+listings, Supabase upserts) reuse a TCP+TLS connection instead of
+handshaking for every request. Each session has:
+
+- a connection pool of ``HTTP_POOL_SIZE`` (default 10) connections
+- ``Accept-Encoding: gzip, deflate``
+- default connect/read timeouts (``HTTP_CONNECT_TIMEOUT`` /
+  ``HTTP_READ_TIMEOUT``, default 5s / 30s) when a call passes none
+- ``HTTP_RETRIES`` (default 3) retries with exponential backoff on
+  connection errors, and on 429/5xx for idempotent methods, honouring
+  ``Retry-After``
+
+``openai_client()`` and ``github_client()`` build the SDK clients with the
+same pool size, timeouts and retries, and cache them per credential so all
+callers in a process share one connection pool per API. GitHub requests go
+to ``GITHUB_API_URL`` (set by GitHub Actions, and for GitHub Enterprise
+Server), default ``https://api.github.com``; the OpenAI SDK reads
+``OPENAI_BASE_URL`` itself.
+
+Nothing here imports ``requests``, ``openai`` or ``github`` until a session
+or client is first requested.
+"""
+
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    import requests
+    from github import Github
+    from openai import OpenAI
+
+ACCEPT_ENCODING = "gzip, deflate"
+GITHUB_API = "https://api.github.com"
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_lock = threading.Lock()
+_sessions: Dict[str, "requests.Session"] = {}
+_openai_clients: Dict[Optional[str], "OpenAI"] = {}
+_github_clients: Dict[Optional[str], "Github"] = {}
+
+
+def pool_size() -> int:
+    return int(os.getenv("HTTP_POOL_SIZE", "10"))
+
+
+def timeouts() -> Tuple[float, float]:
+    """Default (connect, read) timeouts in seconds."""
+    return float(os.getenv("HTTP_CONNECT_TIMEOUT", "5")), float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+
+
+def retries() -> int:
+    return int(os.getenv("HTTP_RETRIES", "3"))
+
+
+def github_api_url() -> str:
+    """GitHub REST API root, without a trailing slash."""
+    return (os.getenv("GITHUB_API_URL") or GITHUB_API).rstrip("/")
+
+
+def _host_key(url: str) -> str:
+    parts = urlsplit(url)
+    if not parts.scheme or not parts.netloc:
+        raise ValueError(f"Expected an absolute URL, got {url!r}")
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def _new_session() -> "requests.Session":
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    default_timeout = timeouts()
+
+    class _DefaultTimeoutAdapter(HTTPAdapter):
+        def send(self, request: Any, *args: Any, **kwargs: Any) -> Any:  # type: ignore
+            if kwargs.get("timeout") is None:
+                kwargs["timeout"] = default_timeout
+            return super().send(request, *args, **kwargs)  # type: ignore
+
+    count = retries()
+    adapter = _DefaultTimeoutAdapter(
+        pool_connections=1,  # one host per session
+        pool_maxsize=pool_size(),
+        max_retries=Retry(
+            total=count,
+            connect=count,
+            read=count,
+            status=count,
+            backoff_factor=0.5,
+            status_forcelist=RETRY_STATUSES,
+            respect_retry_after_header=True,
+            raise_on_status=False,  # hand the last response to the caller
+        ),
+    )
+    session = requests.Session()
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def session_for(url: str) -> "requests.Session":
+    """
+    The shared session for ``url``'s scheme and host.
+
+    Sessions carry no credentials; pass auth headers per request.
+    """
+    key = _host_key(url)
+    with _lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _sessions[key] = _new_session()
+        return session
+
+
+def openai_client(api_key: Optional[str]) -> "OpenAI":
+    """An OpenAI client with pooled connections, shared per API key."""
+    with _lock:
+        client = _openai_clients.get(api_key)
+        if client is None:
+            import httpx
+            from openai import DefaultHttpxClient, OpenAI
+
+            connect, read = timeouts()
+            size = pool_size()
+            client = _openai_clients[api_key] = OpenAI(
+                api_key=api_key,
+                timeout=httpx.Timeout(read, connect=connect),
+                max_retries=retries(),
+                http_client=DefaultHttpxClient(
+                    limits=httpx.Limits(max_connections=size, max_keepalive_connections=size),
+                ),
+            )
+        return client
+
+
+def github_client(token: Optional[str]) -> "Github":
+    """A PyGithub client with a pooled session, shared per token."""
+    with _lock:
+        client = _github_clients.get(token)
+        if client is None:
+            from github import Github
+
+            read = int(timeouts()[1])
+            try:
+                # PyGithub >= 2.0: token auth object and a sized connection pool
+                from github import Auth
+
+                auth = Auth.Token(token) if token else None
+                client = Github(auth=auth, base_url=github_api_url(), timeout=read, pool_size=pool_size())
+            except (ImportError, TypeError):
+                client = Github(token, base_url=github_api_url(), timeout=read)
+            _github_clients[token] = client
+        return client
+
+
+def close_all() -> None:
+    """Close every shared session and client (e.g. at the end of a test)."""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        for client in _openai_clients.values():
+            client.close()
+        for gh in _github_clients.values():
+            close = getattr(gh, "close", None)  # PyGithub >= 2.1
+            if callable(close):
+                close()
+        _sessions.clear()
+        _openai_clients.clear()
+        _github_clients.clear()
@@ -28,16 +28,13 @@ from typing import Dict, Any
 sys.path.insert(0, str(Path(__file__).parent))
 
 from lib.clients import create_sales_pipeline_client
+from lib.logging_setup import setup_logging
 from lib.models import SalesPipelineData
 
 
 def configure_logging() -> logging.Logger:
     """Configure logging for the script."""
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-        datefmt="%Y-%m-%dT%H:%M:%S%z",
-    )
+    setup_logging(level="INFO")
     return logging.getLogger(__name__)
 
 
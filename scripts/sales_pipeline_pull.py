@@ -34,12 +34,15 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
+sys.path.insert(0, str(Path(__file__).parent))
+from lib.audit_store import AuditStore
+from lib.env_checks import has_module
+from lib.logging_setup import setup_logging
+
 
 def configure_logging() -> logging.Logger:
     """Configure structured logging with env-driven levels and run identifiers."""
     run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
-    level_name = os.getenv("LOG_LEVEL", "INFO").upper()
-    level = getattr(logging, level_name, logging.INFO)
 
     # Ensure every log record gets the run_id field
     old_factory = logging.getLogRecordFactory()
@@ -52,11 +55,7 @@ def configure_logging() -> logging.Logger:
 
     logging.setLogRecordFactory(record_factory)
 
-    logging.basicConfig(
-        level=level,
-        format="%(asctime)s [%(levelname)s] [run_id=%(run_id)s] %(name)s: %(message)s",
-        datefmt="%Y-%m-%dT%H:%M:%S%z",
-    )
+    setup_logging(text_format="%(asctime)s [%(levelname)s] [run_id=%(run_id)s] %(name)s: %(message)s")
 
     logger = logging.getLogger(__name__)
     logger.debug("Logging configured", extra={"run_id": run_id})
@@ -68,12 +67,10 @@ logger = configure_logging()
 # Standard library imports
 # (csv already imported at top)
 
-# Third-party imports (with fallback for demo mode)
-try:
-    from dotenv import load_dotenv
-    HAS_DEPS = True
-except ImportError:
-    HAS_DEPS = False
+# Third-party imports (with fallback for demo mode); dotenv is imported
+# only when the environment file is loaded
+HAS_DEPS = has_module("dotenv")
+if not HAS_DEPS:
     logger.warning("⚠️  Missing dependencies. Install with: pip install -r scripts/requirements.txt")
     logger.warning("   Running in DEMO MODE (no actual data pulls)")
 
@@ -467,9 +464,8 @@ class SalesPipelinePuller:
     ) -> None:
         """Save audit log for compliance tracking."""
         timestamp = datetime.now(timezone.utc)
-        audit_filename = f"sales_audit_{timestamp.strftime('%Y%m%d_%H%M%S')}.json"
-        audit_path = self.output_dir / audit_filename
-        
+        store = AuditStore(self.output_dir / "audit" / "sales")
+
         audit_data = {
             "timestamp": timestamp.isoformat(),
             "runner_version": "1.0.0",
@@ -481,10 +477,9 @@ class SalesPipelinePuller:
             "status": "success",
         }
         
-        with open(audit_path, 'w', encoding='utf-8') as f:
-            json.dump(audit_data, f, indent=2)
-        
-        logger.info(f"✓ Audit log saved to: {audit_path}")
+        store.append(audit_data, record_type="sales_pull", ts=timestamp)
+
+        logger.info(f"✓ Audit record appended to: {store.directory}")
 
     def run(self) -> int:
         """
@@ -574,6 +569,8 @@ def main() -> int:
     if HAS_DEPS:
         env_file = project_root / ".env.local"
         if env_file.exists():
+            from dotenv import load_dotenv
+
             load_dotenv(env_file)
             logger.debug(f"Loaded environment from {env_file}")
     
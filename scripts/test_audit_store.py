@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Tests for the Append-Only Audit Store
+======================================
+
+Covers appends, rotation/compression, range reads and index recovery in
+lib/audit_store.py
+"""
+
+import json
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lib.audit_store import AuditStore, import_legacy
+from lib.output_writer import dumps_json
+
+T0 = datetime(2025, 12, 1, tzinfo=timezone.utc)
+
+
+def _fill(store, count, step_hours=12):
+    for i in range(count):
+        store.append({"i": i, "pad": "x" * 40}, record_type="daily_summary", ts=T0 + timedelta(hours=step_hours * i))
+
+
+def test_rotation_and_compression():
+    """Test that full segments are rotated and gzip-compressed"""
+    print("Testing rotation...")
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp) / "daily"
+        store = AuditStore(directory, max_segment_bytes=400, compression="gzip")
+        _fill(store, 20)
+
+        names = sorted(p.name for p in directory.glob("segment-*"))
+        assert len(names) > 2
+        assert all(n.endswith(".jsonl.gz") for n in names[:-1])
+        assert names[-1].endswith(".jsonl")
+        assert [r["data"]["i"] for r in store.read()] == list(range(20))
+    print("  ✓ Segments rotated and compressed")
+
+
+def test_time_rotation():
+    """Test that old active segments are rotated"""
+    print("Testing time-based rotation...")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = AuditStore(Path(tmp), rotate_after=timedelta(days=1), compression="gzip")
+        _fill(store, 4)  # 0h, 12h, 24h, 36h
+        index = json.loads((Path(tmp) / "index.json").read_text())
+        assert [s["records"] for s in index["segments"]] == [2, 2]  # rotated at 24h
+    print("  ✓ Rotated by age")
+
+
+def test_range_reads_and_latest():
+    """Test date-range queries, type filters and latest()"""
+    print("Testing range reads...")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = AuditStore(Path(tmp), max_segment_bytes=300)
+        _fill(store, 20)
+        store.append({"i": 99}, record_type="other", ts=T0 + timedelta(days=30))
+
+        got = [r["data"]["i"] for r in store.read("2025-12-04", "2025-12-06")]
+        assert got == [6, 7, 8, 9], got
+        assert [r["data"]["i"] for r in store.read(since="2025-12-10T12:00:00Z", record_type="daily_summary")] == [19]
+        assert store.latest()["data"]["i"] == 99
+        assert store.latest("daily_summary")["data"]["i"] == 19
+    print("  ✓ Range reads correct")
+
+
+def test_index_recovery():
+    """Test that a missing or stale index is rebuilt from segments"""
+    print("Testing index recovery...")
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        store = AuditStore(directory, max_segment_bytes=300)
+        _fill(store, 10)
+        (directory / "index.json").unlink()
+
+        assert len(list(AuditStore(directory).read())) == 10
+        store.append({"i": 10}, ts=T0 + timedelta(days=10))
+        assert [r["data"]["i"] for r in store.read()] == list(range(11))
+    print("  ✓ Index rebuilt")
+
+
+def test_import_legacy_files():
+    """Test importing per-run audit JSON files"""
+    print("Testing legacy import...")
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = Path(tmp) / "audit_20251201_000000.json"
+        legacy.write_text(json.dumps({"created_at": "2025-12-01T00:00:00+00:00", "notes": 3}))
+        store = AuditStore(Path(tmp) / "daily")
+        assert import_legacy(store, [legacy], "daily_summary", delete=True) == 1
+        assert not legacy.exists()
+        assert store.latest()["data"]["notes"] == 3
+    print("  ✓ Legacy files imported")
+
+
+def test_append_serialized_payload():
+    """Test appending bytes already serialized for the output file"""
+    print("Testing serialized payloads...")
+    data = {"notes": 2, "raw_text": "Summary:\nline one\n  indented", "items": [{"a": [1, 2]}, []], "empty": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp) / "daily"
+        store = AuditStore(directory)
+        store.append(data, record_type="daily_summary", ts=T0, payload=dumps_json(data))
+        store.append(data, record_type="daily_summary", ts=T0)
+
+        (segment,) = directory.glob("segment-*.jsonl")
+        lines = segment.read_bytes().splitlines()
+        assert len(lines) == 2, "each record must stay on one line"
+        assert [r["data"] for r in store.read()] == [data, data]
+    print("  ✓ Payload appended on one line")
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("=" * 60)
+    print("Audit Store Tests")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_rotation_and_compression,
+        test_time_rotation,
+        test_range_reads_and_latest,
+        test_index_recovery,
+        test_import_legacy_files,
+        test_append_serialized_payload,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"  ✗ Test failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"  ✗ Test error: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
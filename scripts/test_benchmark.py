@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Tests for the Benchmark Harness
+================================
+
+Covers synthetic notes, the stand-in backends and the regression check in
+lib/benchmark.py, and a small end-to-end run of benchmark_daily.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import requests
+
+import benchmark_daily
+from lib import transport
+from lib.benchmark import Latency, StandInBackends, compare_reports, generate_notes
+from lib.logging_setup import stop_logging
+from lib.sales_pipeline import create_sales_pipeline_source
+
+
+def test_generate_notes():
+    """Test trees are reproducible, nested, varied in size and reused"""
+    print("Testing synthetic notes...")
+    with tempfile.TemporaryDirectory() as tmp:
+        a = generate_notes(Path(tmp) / "a", 250, seed=7)
+        b = generate_notes(Path(tmp) / "b", 250, seed=7)
+        files = sorted(p for p in a.root.rglob("*") if p.is_file() and p.suffix in (".md", ".txt"))
+        assert len(files) == 250
+        assert {p.suffix for p in files} == {".md", ".txt"}
+        assert len({p.parent for p in files}) == 3
+        sizes = [p.stat().st_size for p in files]
+        assert min(sizes) < 1024 < max(sizes)
+        assert a.total_bytes == b.total_bytes == sum(sizes)
+        assert files[0].read_text() == (b.root / files[0].relative_to(a.root)).read_text()
+        assert "- [ ] " in "".join(p.read_text() for p in files[:20])
+
+        files[0].write_text("edited")
+        generate_notes(a.root, 250, seed=7)
+        assert files[0].read_text() == "edited", "matching tree should be reused"
+        generate_notes(a.root, 250, seed=8)
+        assert files[0].read_text() != "edited", "different seed should regenerate"
+    print("  ✓ Trees reproducible and reused")
+
+
+def test_stand_in_backends():
+    """Test completions, GitHub and paginated Salesforce answers, with latency"""
+    print("Testing stand-in backends...")
+    saved = dict(os.environ)
+    with StandInBackends(latency=Latency(openai=0.1), action_items=2, crm_records=450) as backends:
+        try:
+            started = time.perf_counter()
+            resp = requests.post(f"{backends.url}/v1/chat/completions", json={
+                "model": "m",
+                "messages": [{"role": "user", "content": "1. # Note\n- [ ] Fix export\n- [ ] Ship demo\n- [ ] Third"}],
+            })
+            assert time.perf_counter() - started >= 0.1
+            summary = json.loads(resp.json()["choices"][0]["message"]["content"])
+            assert summary["action_items"] == ["Fix export", "Ship demo"]
+
+            reduce_prompt = json.dumps([{"action_items": ["Fix export"]}, {"action_items": ["Call bank"]}], indent=2)
+            resp = requests.post(f"{backends.url}/v1/chat/completions", json={
+                "messages": [{"role": "user", "content": reduce_prompt}],
+                "stream": True,
+            })
+            assert resp.text.endswith("data: [DONE]\n\n")
+
+            api = f"{backends.url}/api/v3/repos/benchmark/notes"
+            assert requests.get(api).json()["full_name"] == "benchmark/notes"
+            issue = requests.post(f"{api}/issues", json={"title": "t", "labels": ["automation"]}).json()
+            assert issue["number"] == 1 and issue["labels"] == [{"name": "automation"}]
+            assert requests.get(f"{backends.url}/unknown").status_code == 404
+
+            os.environ.update(backends.env())
+            pipeline = create_sales_pipeline_source(Path(tempfile.gettempdir())).pull_data()
+            assert pipeline.source == "salesforce" and pipeline.total_leads == 450
+            assert backends.counts() == {"openai": 2, "github": 2, "crm": 3}
+        finally:
+            os.environ.clear()
+            os.environ.update(saved)
+            transport.close_all()
+    print("  ✓ Backends answer like the real APIs")
+
+
+def test_compare_reports():
+    """Test regressions beyond the threshold are reported, noise is not"""
+    print("Testing regression check...")
+    baseline = {"cases": [{
+        "notes": 10,
+        "wall_sec": 2.0,
+        "peak_rss_kb": 100000,
+        "steps": {
+            "transform/generate-summary": {"status": "success", "duration_sec": 1.0},
+            "ingest/load-notes": {"status": "success", "duration_sec": 0.01},
+            "output/github-issues": {"status": "success", "duration_sec": 0.5},
+        },
+    }]}
+    current = {"cases": [
+        {
+            "notes": 10,
+            "wall_sec": 2.3,
+            "peak_rss_kb": 101000,
+            "steps": {
+                "transform/generate-summary": {"status": "success", "duration_sec": 1.5},
+                "ingest/load-notes": {"status": "success", "duration_sec": 0.03},
+                "output/github-issues": {"status": "failure", "duration_sec": 0.1},
+            },
+        },
+        {"notes": 1000, "wall_sec": 60.0},
+    ]}
+    regressions = compare_reports(current, baseline, threshold=0.2)
+    assert len(regressions) == 2, regressions
+    assert regressions[0].startswith("10 notes: transform/generate-summary.duration_sec 1 -> 1.5 (+50%)")
+    assert "output/github-issues now failure" in regressions[1]
+    assert compare_reports(current, baseline, threshold=0.6) == [regressions[1]]
+    print("  ✓ Regressions detected")
+
+
+def test_benchmark_end_to_end():
+    """Test the benchmark runs the real pipeline and gates on a baseline"""
+    print("Testing end-to-end benchmark...")
+    with tempfile.TemporaryDirectory() as tmp:
+        report_file = Path(tmp) / "report.json"
+        argv = [
+            "--sizes", "5", "--work-dir", tmp, "--action-items", "1",
+            "--openai-latency-ms", "0", "--github-latency-ms", "0", "--crm-latency-ms", "0",
+        ]
+        assert benchmark_daily.main(argv + ["--output", str(report_file)]) == 0
+        report = json.loads(report_file.read_text())
+        case = report["cases"][0]
+        assert case["exit_code"] == 0 and case["notes"] == 5
+        assert case["wall_sec"] > 0 and case["peak_rss_kb"] > 0
+        assert case["steps"]["transform/generate-summary"]["status"] == "success"
+        assert case["requests"]["openai"] >= 1 and case["requests"]["crm"] >= 1
+        assert case["requests"]["github"] == 3  # repo, issue listing, one issue
+
+        case["wall_sec"] = case["wall_sec"] / 10
+        Path(tmp, "baseline.json").write_text(json.dumps(report))
+        argv += ["--output", str(report_file), "--baseline", str(Path(tmp) / "baseline.json")]
+        try:
+            assert benchmark_daily.main(argv) == 1
+        finally:
+            stop_logging()
+    print("  ✓ Report complete, regression fails the run")
+
+
+def run_all_tests():
+    """Run all test suites"""
+    print("=" * 60)
+    print("Running Benchmark Harness Tests")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_generate_notes,
+        test_stand_in_backends,
+        test_compare_reports,
+        test_benchmark_end_to_end,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"  ✗ Test failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"  ✗ Test error: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
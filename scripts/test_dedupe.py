@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Tests for Duplicate Detection
+==============================
+
+Covers text normalization, content fingerprints and the duplicate lookup in
+workers/dedupe.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add workers directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "workers"))
+
+from dedupe import content_fingerprint, find_duplicate, normalize_text
+
+
+def _column(row, column):
+    """Resolve ``metadata->>key`` the way PostgREST does (as text)."""
+    if "->>" in column:
+        field, key = column.split("->>")
+        value = (row.get(field) or {}).get(key)
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        return None if value is None else str(value)
+    return row.get(column)
+
+
+class FakeQuery:
+    def __init__(self, rows, calls):
+        self.rows = rows
+        self.calls = calls
+        self.filters = []
+
+    def select(self, *_):
+        return self
+
+    def eq(self, column, value):
+        self.filters.append((column, "eq", value))
+        return self
+
+    def neq(self, column, value):
+        self.filters.append((column, "neq", value))
+        return self
+
+    def limit(self, _):
+        return self
+
+    def execute(self):
+        self.calls.append(self.filters)
+        matched = [
+            r for r in self.rows
+            if all((_column(r, c) == v) == (op == "eq") for c, op, v in self.filters)
+        ]
+        return type("Result", (), {"data": [{"id": r["id"]} for r in matched]})()
+
+
+class FakeSupabase:
+    def __init__(self, rows, error=None):
+        self.rows = rows
+        self.error = error
+        self.calls = []
+
+    def table(self, name):
+        assert name == "knowledge_items"
+        if self.error is not None:
+            raise self.error
+        return FakeQuery(self.rows, self.calls)
+
+
+def test_normalize_text():
+    """Test whitespace, case and Unicode normalization"""
+    print("Testing normalization...")
+    assert normalize_text("  Hello \t\n  World  ") == "hello world"
+    assert normalize_text("STRASSE") == normalize_text("straße"), "casefold, not lower"
+    assert normalize_text("\ufb01le\u3000report") == "file report", "NFKC ligature and ideographic space"
+    assert normalize_text("Cafe\u0301") == normalize_text("Caf\u00e9"), "combining accent"
+    assert normalize_text(None) == ""
+    print("  ✓ Text normalized")
+
+
+def test_fingerprint_collisions():
+    """Test formatting-only differences collide and real edits do not"""
+    print("Testing fingerprints...")
+    base = content_fingerprint("Meeting notes:\nFollow up with Acme on pricing.")
+    assert base == content_fingerprint("meeting NOTES:   follow up with acme on pricing.\r\n")
+    assert base == content_fingerprint("\uff2deeting\u00a0notes: Follow up with Acme on pricing.")
+    assert base != content_fingerprint("Meeting notes:\nFollow up with Acme on pricing!")
+    assert len(base) == 64 and all(c in "0123456789abcdef" for c in base)
+    print("  ✓ Trivial differences collide")
+
+
+def test_find_duplicate():
+    """Test the lookup matches client, fingerprint and processed, excluding the item"""
+    print("Testing duplicate lookup...")
+    fp = content_fingerprint("same text")
+    rows = [
+        {"id": "new", "client_id": "c1", "metadata": {"content_hash": fp}},
+        {"id": "other-client", "client_id": "c2", "metadata": {"content_hash": fp, "processed": True}},
+        {"id": "pending", "client_id": "c1", "metadata": {"content_hash": fp, "processed": False}},
+    ]
+    db = FakeSupabase(rows)
+    assert find_duplicate(db, "c1", fp, "new") is None
+
+    rows.append({"id": "original", "client_id": "c1", "metadata": {"content_hash": fp, "processed": True}})
+    assert find_duplicate(db, "c1", fp, "new") == "original"
+    assert find_duplicate(db, "c1", fp, "original") is None, "the current item must be excluded"
+    assert find_duplicate(db, "c1", content_fingerprint("different"), "new") is None
+    assert ("id", "neq", "original") in db.calls[-2]
+
+    assert find_duplicate(FakeSupabase(rows, error=RuntimeError("timeout")), "c1", fp, "new") is None
+    print("  ✓ Duplicates found, current item excluded")
+
+
+def run_all_tests():
+    """Run all test suites"""
+    print("=" * 60)
+    print("Running Duplicate Detection Tests")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_normalize_text,
+        test_fingerprint_collisions,
+        test_find_duplicate,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"  ✗ Test failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"  ✗ Test error: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
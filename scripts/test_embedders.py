@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Tests for Worker Embedding Backends
+====================================
+
+Covers the local hashing embedder and backend selection in workers/embedders.py
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add workers directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "workers"))
+
+from embedders import Embedder, HashingEmbedder, OpenAIEmbedder, create_embedder
+
+
+def _dot(a, b):
+    return sum(x * y for x, y in zip(a, b))
+
+
+def test_local_embedder_shape_and_norm():
+    """Test fixed dimensionality and unit-length vectors"""
+    print("Testing local embedder shape...")
+
+    embedder = HashingEmbedder(dimensions=256)
+    vectors = embedder.embed_batch(["Follow up with Acme on the proposal", "", "thanks!"])
+
+    assert len(vectors) == 3, f"Expected 3 vectors, got {len(vectors)}"
+    assert all(len(v) == 256 for v in vectors), "Vector dimensionality mismatch"
+    assert abs(_dot(vectors[0], vectors[0]) - 1.0) < 1e-5, "Vector should be unit length"
+    assert not any(vectors[1]), "Empty text should embed to the zero vector"
+
+    print("  ✓ Local embedder shape tests passed")
+
+
+def test_local_embedder_is_deterministic_and_semantic():
+    """Test that similar texts land closer than unrelated ones"""
+    print("Testing local embedder similarity...")
+
+    a = HashingEmbedder().embed("Client wants a migration proposal by Friday")
+    b = HashingEmbedder().embed("The client wants the migration proposal Friday")
+    c = HashingEmbedder().embed("Quarterly security audit checklist")
+
+    assert a == HashingEmbedder().embed("Client wants a migration proposal by Friday"), \
+        "Embeddings should be identical across instances"
+    assert _dot(a, b) > _dot(a, c), "Related texts should be more similar than unrelated ones"
+
+    print("  ✓ Local embedder similarity tests passed")
+
+
+def test_backend_selection():
+    """Test create_embedder config handling"""
+    print("Testing backend selection...")
+
+    assert isinstance(create_embedder(backend="local"), HashingEmbedder), "Expected local backend"
+    assert isinstance(create_embedder(object(), backend="openai"), OpenAIEmbedder), "Expected OpenAI backend"
+
+    for backend, client in (("openai", None), ("bogus", None)):
+        try:
+            create_embedder(client, backend=backend)
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError(f"Backend '{backend}' without a client should fail")
+
+    # Local vectors fit the column sized for the configured OpenAI model
+    assert create_embedder(backend="local", model="text-embedding-3-large").dimensions == 3072
+    assert create_embedder(backend="local", model="text-embedding-3-small").dimensions == 1536
+
+    os.environ["EMBEDDING_BACKEND"] = "local"
+    os.environ["EMBEDDING_DIM"] = "64"
+    try:
+        embedder = create_embedder()
+        assert embedder.dimensions == 64, "EMBEDDING_DIM not honoured"
+    finally:
+        del os.environ["EMBEDDING_BACKEND"]
+        del os.environ["EMBEDDING_DIM"]
+
+    print("  ✓ Backend selection tests passed")
+
+
+def test_backend_interface_is_abstract():
+    """Test a backend without embed_batch() fails at construction"""
+    print("Testing backend interface...")
+
+    class Incomplete(Embedder):
+        model = "incomplete"
+
+    for cls in (Embedder, Incomplete):
+        try:
+            cls()
+        except TypeError:
+            pass
+        else:
+            raise AssertionError(f"{cls.__name__} constructed without embed_batch()")
+
+    print("  ✓ embed_batch() is abstract")
+
+
+def run_all_tests():
+    """Run all test suites"""
+    print("=" * 60)
+    print("Running Embedding Backend Tests")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_local_embedder_shape_and_norm,
+        test_local_embedder_is_deterministic_and_semantic,
+        test_backend_selection,
+        test_backend_interface_is_abstract,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"  ✗ Test failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"  ✗ Test error: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
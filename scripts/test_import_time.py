@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Import-Time Regression Tests
+=============================
+
+Imports each entry point in a fresh interpreter under ``python -X importtime``
+and checks that:
+
+- heavy third-party SDKs are not imported at module load (they must be
+  imported lazily on the code paths that use them)
+- the cumulative import time of the entry point stays within its budget
+
+Both checks fail the suite. Wall-clock budgets depend on the machine and its
+load, so they are several times the measured time (about 80 ms for daily_v2
+on a developer laptop) and only trip on real regressions, such as importing
+``openai`` at module level again (~650 ms on its own). On a machine too slow
+or loaded for that, set ``IMPORT_TIME_BUDGETS=report`` to only print the
+timings.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+SCRIPTS_DIR = Path(__file__).parent
+
+# Modules that must never be imported just by loading an entry point
+HEAVY_MODULES = ("openai", "github", "requests", "httpx", "dotenv", "tiktoken", "numpy", "zstandard")
+
+# Entry point module -> cumulative import time budget (milliseconds)
+BUDGETS_MS = {
+    "daily_v2": 400,
+    "sales_pipeline_pull": 300,
+    "pull_sales_pipeline": 300,
+    "lib.run_history": 200,
+    "lib.audit_store": 200,
+}
+
+
+def import_profile(module):
+    """Import ``module`` in a fresh interpreter; returns {module name: cumulative µs}."""
+    code = f"import sys; sys.path.insert(0, {str(SCRIPTS_DIR)!r}); sys.argv = [{module!r}]; import {module}"
+    env = {**os.environ, "LOG_LEVEL": "ERROR"}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=str(SCRIPTS_DIR),
+        timeout=60,
+    )
+    assert proc.returncode == 0, f"importing {module} failed:\n{proc.stderr[-2000:]}"
+    timings = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = int(cumulative)
+    return timings
+
+
+def test_no_heavy_imports():
+    """Test entry points do not import third-party SDKs at load time"""
+    print("Testing for eager SDK imports...")
+    for module in BUDGETS_MS:
+        timings = import_profile(module)
+        eager = [m for m in HEAVY_MODULES if m in timings]
+        assert not eager, f"{module} imports {eager} at module load"
+    print("  ✓ SDKs are imported lazily")
+
+
+def test_import_time_budgets():
+    """Test each entry point imports within its budget"""
+    print("Testing import-time budgets...")
+    enforce = os.getenv("IMPORT_TIME_BUDGETS", "enforce").lower() != "report"
+    over = []
+    for module, budget_ms in BUDGETS_MS.items():
+        # Best of three: the first run may include writing .pyc files
+        elapsed_ms = min(import_profile(module)[module] for _ in range(3)) / 1000
+        print(f"  {module}: {elapsed_ms:.0f} ms (budget {budget_ms} ms)")
+        if elapsed_ms > budget_ms:
+            over.append(f"{module} took {elapsed_ms:.0f} ms to import (budget {budget_ms} ms)")
+    if over and enforce:
+        raise AssertionError("; ".join(over))
+    for message in over:
+        print(f"  ⚠️  {message} (not enforced: IMPORT_TIME_BUDGETS=report)")
+    if not over:
+        print("  ✓ All entry points within budget")
+
+
+def run_all_tests():
+    """Run all test suites"""
+    print("=" * 60)
+    print("Running Import-Time Tests")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_no_heavy_imports,
+        test_import_time_budgets,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"  ✗ Test failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"  ✗ Test error: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Tests for Concurrent GitHub Issue Creation
+===========================================
+
+Covers rate-limit header parsing, mutation pacing, result ordering,
+retries after secondary rate limits and worker shutdown in
+lib/issue_creator.py
+"""
+
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lib.issue_creator import DEFAULT_SECONDARY_BACKOFF, IssueCreator, MutationPacer, retry_delay
+
+
+class FakeGithubError(Exception):
+    """Shaped like ``github.GithubException``: a status and response headers."""
+
+    def __init__(self, status, message="", headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers
+
+
+class FakeClock:
+    """Epoch-based clock whose sleep advances time instead of blocking."""
+
+    def __init__(self, now=None):
+        self.now = time.time() if now is None else now
+        self.sleeps = []
+        self.lock = threading.Lock()
+
+    def time(self):
+        with self.lock:
+            return self.now
+
+    def sleep(self, seconds):
+        with self.lock:
+            self.sleeps.append(seconds)
+            self.now += seconds
+
+
+def test_retry_delay():
+    """Test Retry-After and X-RateLimit-Reset parsing"""
+    print("Testing retry delay...")
+    now = 1_700_000_000.0
+    assert retry_delay(FakeGithubError(403, headers={"Retry-After": "30"}), now) == 30.0
+    assert retry_delay(FakeGithubError(429, headers={"retry-after": "-5"}), now) == 0.0
+    assert retry_delay(FakeGithubError(403, headers={"Retry-After": "soon"}), now) is None
+
+    reset = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(now) + 10)}
+    assert retry_delay(FakeGithubError(403, headers=reset), now) == 11.0
+    past = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(now) - 10)}
+    assert retry_delay(FakeGithubError(403, headers=past), now) == 1.0
+    both = dict(reset, **{"Retry-After": "5"})
+    assert retry_delay(FakeGithubError(403, headers=both), now) == 5.0, "Retry-After wins"
+
+    left = {"X-RateLimit-Remaining": "12", "X-RateLimit-Reset": str(int(now) + 10)}
+    assert retry_delay(FakeGithubError(403, headers=left), now) is None, "quota left: not a reset"
+    assert retry_delay(FakeGithubError(403, headers=None), now) is None
+    assert retry_delay(ValueError("no headers"), now) is None
+    print("  ✓ Rate-limit headers parsed")
+
+
+def test_mutation_pacer():
+    """Test requests are spaced by min_interval and pauses block everyone"""
+    print("Testing mutation pacer...")
+    clock = FakeClock(now=1000.0)
+    pacer = MutationPacer(min_interval=1.0, clock=clock.time, sleep=clock.sleep)
+
+    pacer.acquire()
+    pacer.acquire()
+    pacer.acquire()
+    assert clock.sleeps == [1.0, 1.0] and clock.now == 1002.0, clock.sleeps
+
+    clock.now += 5.0  # idle time is not banked as extra slots
+    pacer.acquire()
+    assert clock.sleeps == [1.0, 1.0]
+
+    pacer.pause_until(clock.now + 30.0)
+    pacer.pause_until(clock.now + 10.0)  # an earlier pause does not shorten it
+    pacer.acquire()
+    assert clock.sleeps[-1] == 30.0 and clock.now == 1037.0, clock.sleeps
+    print("  ✓ Requests paced and paused")
+
+
+def test_results_in_submission_order():
+    """Test results follow submission order when items finish out of order"""
+    print("Testing result order...")
+    items = ["first", "second", "third"]
+    finished = []
+    release = {item: threading.Event() for item in items}
+
+    def create(item):
+        # Each item waits for the one after it, so they finish in reverse
+        index = items.index(item)
+        if index + 1 < len(items):
+            assert release[items[index + 1]].wait(5), "items should run concurrently"
+        finished.append(item)
+        release[item].set()
+        return f"issue:{item}"
+
+    creator = IssueCreator(create, max_workers=3, pacer=MutationPacer(min_interval=0.0))
+    results = creator.create_all(items)
+    assert finished == ["third", "second", "first"], finished
+    assert [r.item for r in results] == items
+    assert [r.issue for r in results] == [f"issue:{item}" for item in items]
+    assert all(r.error is None and r.attempts == 1 for r in results)
+    print("  ✓ Results in submission order")
+
+
+def test_secondary_rate_limit_then_success():
+    """Test a 403 secondary rate limit is retried after the indicated wait"""
+    print("Testing secondary rate limit...")
+    clock = FakeClock()
+    pacer = MutationPacer(min_interval=0.0, clock=clock.time, sleep=clock.sleep)
+    calls = []
+
+    def create(item):
+        calls.append(item)
+        if len(calls) == 1:
+            raise FakeGithubError(
+                403, "You have exceeded a secondary rate limit", headers={"Retry-After": "60"}
+            )
+        return f"issue:{item}"
+
+    (result,) = IssueCreator(create, pacer=pacer).create_all(["Follow up with Acme"])
+    assert result.issue == "issue:Follow up with Acme" and result.error is None
+    assert result.attempts == 2 and len(calls) == 2
+    assert len(clock.sleeps) == 1 and 59.0 <= clock.sleeps[0] <= 61.0, clock.sleeps
+
+    # No header: fall back to the default secondary backoff
+    calls.clear()
+    clock = FakeClock()
+    pacer = MutationPacer(min_interval=0.0, clock=clock.time, sleep=clock.sleep)
+
+    def create_without_hint(item):
+        calls.append(item)
+        if len(calls) == 1:
+            raise FakeGithubError(403, "secondary rate limit")
+        return "ok"
+
+    (result,) = IssueCreator(create_without_hint, pacer=pacer).create_all(["x"])
+    assert result.issue == "ok" and result.attempts == 2
+    assert abs(clock.sleeps[0] - DEFAULT_SECONDARY_BACKOFF) <= 1.0, clock.sleeps
+    print("  ✓ Rate-limited item retried and created")
+
+
+def test_errors_without_rate_limit_and_retry_cap():
+    """Test plain errors are not retried and retries stop after max_retries"""
+    print("Testing non-retryable errors...")
+    clock = FakeClock()
+    pacer = MutationPacer(min_interval=0.0, clock=clock.time, sleep=clock.sleep)
+    calls = []
+
+    def forbidden(item):
+        calls.append(item)
+        raise FakeGithubError(403, "Resource not accessible by integration")
+
+    (result,) = IssueCreator(forbidden, pacer=pacer).create_all(["x"])
+    assert result.issue is None and result.attempts == 1 and len(calls) == 1
+    assert isinstance(result.error, FakeGithubError) and clock.sleeps == []
+
+    def always_limited(item):
+        raise FakeGithubError(429, "", headers={"Retry-After": "1"})
+
+    (result,) = IssueCreator(always_limited, pacer=pacer, max_retries=2).create_all(["x"])
+    assert result.issue is None and result.attempts == 3
+    assert result.error is not None and len(clock.sleeps) == 2
+    print("  ✓ Errors reported without endless retries")
+
+
+def test_retry_log_counts_all_attempts():
+    """Test the retry warning counts attempts out of max_retries + 1"""
+    print("Testing retry log...")
+    clock = FakeClock()
+    pacer = MutationPacer(min_interval=0.0, clock=clock.time, sleep=clock.sleep)
+    messages = []
+    handler = logging.Handler()
+    handler.emit = lambda record: messages.append(record.getMessage())
+    logger = logging.getLogger("lib.issue_creator")
+    logger.addHandler(handler)
+    try:
+        def always_limited(item):
+            raise FakeGithubError(429, "", headers={"Retry-After": "1"})
+
+        (result,) = IssueCreator(always_limited, pacer=pacer, max_retries=2).create_all(["x"])
+    finally:
+        logger.removeHandler(handler)
+    assert result.attempts == 3
+    attempts = [m[m.index("(attempt"):] for m in messages if "(attempt" in m]
+    assert attempts == ["(attempt 1/3)", "(attempt 2/3)"], attempts
+    print("  ✓ Attempts counted out of the total")
+
+
+def test_context_manager_stops_workers():
+    """Test leaving the context stops the pool without collecting results"""
+    print("Testing worker shutdown...")
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def create(item):
+        calls.append(item)
+        started.set()
+        assert release.wait(5)
+        return item
+
+    with IssueCreator(create, max_workers=1, pacer=MutationPacer(min_interval=0.0)) as creator:
+        creator.submit("running")
+        creator.submit("queued")
+        assert started.wait(5)
+        threading.Timer(0.1, release.set).start()  # finishes after the pool starts shutting down
+    assert calls == ["running"], f"queued item should be cancelled: {calls}"
+    alive = [t.name for t in threading.enumerate() if t.name.startswith("issues")]
+    assert not alive, f"worker threads leaked: {alive}"
+    print("  ✓ Worker threads stopped")
+
+
+def run_all_tests():
+    """Run all test suites"""
+    print("=" * 60)
+    print("Running Issue Creator Tests")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_retry_delay,
+        test_mutation_pacer,
+        test_results_in_submission_order,
+        test_secondary_rate_limit_then_success,
+        test_errors_without_rate_limit_and_retry_cap,
+        test_retry_log_counts_all_attempts,
+        test_context_manager_stops_workers,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"  ✗ Test failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"  ✗ Test error: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
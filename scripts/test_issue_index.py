@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Tests for the Local GitHub Issue Index
+=======================================
+
+Covers title matching, incremental sync and persistence of lib/issue_index.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lib.issue_index import IssueIndex, normalize_title
+
+
+class FakeResponse:
+    def __init__(self, status_code, data=None, headers=None):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.headers = headers or {}
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+class FakeSession:
+    """Serves two pages of issues, then 304 for a matching ETag."""
+
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url, headers, params, timeout):
+        self.calls.append((url, headers.get("If-None-Match"), params))
+        if headers.get("If-None-Match") == '"v1"':
+            return FakeResponse(304)
+        if url.endswith("page=2"):
+            return FakeResponse(200, [
+                {"number": 2, "title": "Closed task", "state": "closed",
+                 "updated_at": "2025-12-02T00:00:00Z", "html_url": "u2"},
+                {"number": 3, "title": "A pull request", "state": "open", "pull_request": {},
+                 "updated_at": "2025-12-02T00:00:00Z", "html_url": "u3"},
+            ])
+        return FakeResponse(200, [
+            {"number": 1, "title": "Fix daily report export script failing on edge cases",
+             "state": "open", "updated_at": "2025-12-01T00:00:00Z", "html_url": "u1"},
+        ], {"ETag": '"v1"', "Link": '<https://api.github.com/repos/o/r/issues?page=2>; rel="next"'})
+
+
+def test_normalize_title():
+    """Test that case, punctuation and whitespace are ignored"""
+    print("Testing title normalization...")
+    assert normalize_title("  Fix: the  BUG!! ") == "fix the bug"
+    print("  ✓ Titles normalized")
+
+
+def test_exact_and_fuzzy_matches():
+    """Test exact, near-duplicate and unrelated titles"""
+    print("Testing duplicate matching...")
+    with tempfile.TemporaryDirectory() as tmp:
+        index = IssueIndex(Path(tmp) / "index.json", "o/r", None, session=FakeSession())
+        index.add(7, "Draft investor update for Q3", "u7")
+
+        assert index.find_duplicate("draft investor update for q3!")["number"] == 7
+        assert index.find_duplicate("Draft the investor update for Q3")["number"] == 7
+        assert index.find_duplicate("Schedule onboarding call") is None
+
+        index.add(8, "Fix export for Q3 report", "u8")
+        assert index.find_duplicate("Fix export for Q4 report") is None, "one differing word is a new item"
+        assert index.find_duplicate("Fix the export for Q3 report")["number"] == 8
+    print("  ✓ Duplicates matched")
+
+
+def test_incremental_sync_and_persistence():
+    """Test pagination, closed-issue removal, ETag reuse and reload"""
+    print("Testing incremental sync...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "index.json"
+        session = FakeSession()
+        index = IssueIndex(path, "o/r", "token", session=session)
+        index.add(2, "Closed task")
+
+        assert index.sync() == 2
+        assert sorted(index.issues) == ["1"]
+        assert index.since == "2025-12-02T00:00:00Z"
+        assert session.calls[0][2]["state"] == "open"
+        index.save()
+
+        reloaded = IssueIndex(path, "o/r", "token", session=session)
+        assert reloaded.find_duplicate("Fix daily report export script failing on edge-cases")["number"] == 1
+        assert reloaded.sync() == 0  # 304 Not Modified
+        assert session.calls[-1][1] == '"v1"'
+        assert session.calls[-1][2]["state"] == "all"
+
+        other_repo = IssueIndex(path, "o/other", "token", session=session)
+        assert not other_repo.issues
+    print("  ✓ Sync is incremental and persisted")
+
+
+def test_failed_page_keeps_previous_etag():
+    """Test a sync that fails on a later page is fully retried next time"""
+    print("Testing failed sync...")
+
+    class FailingSecondPage(FakeSession):
+        def get(self, url, headers, params, timeout):
+            if url.endswith("page=2"):
+                self.calls.append((url, headers.get("If-None-Match"), params))
+                return FakeResponse(502)
+            return super().get(url, headers, params, timeout)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "index.json"
+        index = IssueIndex(path, "o/r", "token", session=FailingSecondPage())
+        try:
+            index.sync()
+            raise AssertionError("a failed page should raise")
+        except RuntimeError:
+            pass
+        assert index.etag is None and index.since is None
+        index.save()
+
+        session = FakeSession()
+        reloaded = IssueIndex(path, "o/r", "token", session=session)
+        assert reloaded.sync() == 2, "missing pages must be fetched, not skipped by a 304"
+        assert session.calls[0][1] is None
+    print("  ✓ Failed sync retried in full")
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("=" * 60)
+    print("Issue Index Tests")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_normalize_title,
+        test_exact_and_fuzzy_matches,
+        test_incremental_sync_and_persistence,
+        test_failed_page_keeps_previous_etag,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"  ✗ Test failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"  ✗ Test error: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
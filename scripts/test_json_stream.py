@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for Incremental JSON Parsing
+===================================
+
+Covers lib/json_stream.py against arbitrary chunk boundaries
+"""
+
+import json
+import random
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lib.json_stream import JsonStreamParser
+
+DOCUMENT = "```json\n" + json.dumps({
+    "note": 'brackets [ ] and "quotes", {braces}',
+    "highlights": ["first", 'second, with "quotes" ]'],
+    "action_items": [{"task": "Fix [export]", "priority": "high"}, "Call Acme é"],
+    "nested": {"action_items": ["ignored"]},
+    "assessment": "ok",
+}, indent=2, ensure_ascii=False) + "\n```"
+
+EXPECTED = [
+    ("highlights", "first"),
+    ("highlights", 'second, with "quotes" ]'),
+    ("action_items", {"task": "Fix [export]", "priority": "high"}),
+    ("action_items", "Call Acme é"),
+]
+
+
+def test_whole_document():
+    """Test parsing the document in one chunk"""
+    print("Testing single chunk...")
+    parser = JsonStreamParser(("highlights", "action_items"))
+    assert parser.feed(DOCUMENT) == EXPECTED
+    assert parser.done
+    print("  ✓ Elements extracted")
+
+
+def test_random_chunk_boundaries():
+    """Test that chunk boundaries never change the result"""
+    print("Testing random chunking...")
+    rng = random.Random(7)
+    for _ in range(200):
+        parser = JsonStreamParser(("highlights", "action_items"))
+        events = []
+        i = 0
+        while i < len(DOCUMENT):
+            size = rng.randint(1, 8)
+            events.extend(parser.feed(DOCUMENT[i:i + size]))
+            i += size
+        assert events == EXPECTED, events
+    print("  ✓ Chunking independent")
+
+
+def test_elements_emitted_before_document_ends():
+    """Test that an element is available once the next one starts"""
+    print("Testing early emission...")
+    parser = JsonStreamParser(("action_items",))
+    assert parser.feed('{"action_items": ["one", "tw') == [("action_items", "one")]
+    assert parser.feed('o"') == []
+    assert parser.feed("]") == [("action_items", "two")]
+    assert not parser.done
+    print("  ✓ Items emitted as they complete")
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("=" * 60)
+    print("JSON Stream Parser Tests")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_whole_document,
+        test_random_chunk_boundaries,
+        test_elements_emitted_before_document_ends,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"  ✗ Test failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"  ✗ Test error: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
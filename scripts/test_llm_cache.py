@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for the LLM Response Cache
+=================================
+
+Covers keying, TTL expiry and LRU eviction of lib/llm_cache.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lib.llm_cache import LLMCache, cache_key
+
+
+def test_key_covers_all_inputs():
+    """Test that every request parameter changes the key"""
+    print("Testing cache keys...")
+    base = cache_key("gpt", 0.7, "system", "prompt")
+    assert base == cache_key("gpt", 0.7, "system", "prompt")
+    assert base != cache_key("gpt-2", 0.7, "system", "prompt")
+    assert base != cache_key("gpt", 0.2, "system", "prompt")
+    assert base != cache_key("gpt", 0.7, "other", "prompt")
+    assert base != cache_key("gpt", 0.7, "system", "prompt!")
+    print("  ✓ Keys are stable and specific")
+
+
+def test_hit_miss_and_ttl():
+    """Test hits, misses and expiry"""
+    print("Testing hit/miss and TTL...")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = LLMCache(Path(tmp), ttl_seconds=60)
+        assert cache.get("k") is None
+        cache.put("k", '{"a": 1}', "gpt")
+        assert cache.get("k")["content"] == '{"a": 1}'
+        assert cache.stats() == {"hits": 1, "misses": 1}
+
+        cache.ttl_seconds = -1
+        assert cache.get("k") is None
+        assert not (Path(tmp) / "k.json").exists()
+    print("  ✓ TTL respected")
+
+
+def test_lru_eviction():
+    """Test that the least recently used entry is evicted first"""
+    print("Testing LRU eviction...")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = LLMCache(Path(tmp), max_bytes=10_000)
+        cache.put("old", "x" * 3000, "gpt")
+        cache.put("used", "y" * 3000, "gpt")
+        past = time.time() - 100
+        os.utime(Path(tmp) / "old.json", (past, past))
+        os.utime(Path(tmp) / "used.json", (past - 50, past - 50))
+        assert cache.get("used") is not None  # refreshes recency
+
+        cache.put("new", "z" * 5000, "gpt")
+        assert cache.get("old") is None
+        assert cache.get("used") is not None
+        assert cache.get("new") is not None
+    print("  ✓ Least recently used evicted")
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("=" * 60)
+    print("LLM Cache Tests")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_key_covers_all_inputs,
+        test_hit_miss_and_ttl,
+        test_lru_eviction,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"  ✗ Test failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"  ✗ Test error: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Tests for Logging Setup
+========================
+
+Covers the queued writer, JSON formatting and trace context of
+lib/logging_setup.py, and its use by the workers
+"""
+
+import io
+import json
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lib.logging_setup import setup_logging, stop_logging
+from lib.tracing import TraceContextFilter, start_span
+
+logger = logging.getLogger("test_logging_setup")
+
+
+class SlowStream(io.StringIO):
+    """A stream whose writes take 50 ms, like a congested pipe."""
+
+    def write(self, s):
+        time.sleep(0.05)
+        return super().write(s)
+
+
+def _json_lines(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines() if line]
+
+
+def test_json_fields_and_trace_context():
+    """Test JSON lines keep extra fields and the caller thread's span context"""
+    print("Testing JSON output...")
+    stream = io.StringIO()
+    setup_logging(filters=[TraceContextFilter()], stream=stream, level="INFO", log_format="json")
+    try:
+        def step():
+            with start_span("daily-run", {"run_id": "r1"}):
+                with start_span("enrich/sales-pipeline", {"stage": "enrich", "step": "sales-pipeline"}):
+                    logger.info("pulled %d deals", 3, extra={"source": "salesforce"})
+
+        thread = threading.Thread(target=step)
+        thread.start()
+        thread.join()
+        try:
+            raise ValueError("bad row")
+        except ValueError:
+            logger.exception("parse failed")
+    finally:
+        stop_logging()
+
+    pulled, failed = _json_lines(stream)
+    assert pulled["message"] == "pulled 3 deals"
+    assert pulled["level"] == "INFO" and pulled["logger"] == "test_logging_setup"
+    assert pulled["source"] == "salesforce"
+    assert (pulled["run_id"], pulled["stage"], pulled["step"]) == ("r1", "enrich", "sales-pipeline")
+    assert "trace_context" not in pulled
+    assert "ValueError: bad row" in failed["exception"]
+    print("  ✓ Extra fields and span context kept")
+
+
+def test_text_format_unchanged():
+    """Test the text format still renders trace context and tracebacks"""
+    print("Testing text output...")
+    stream = io.StringIO()
+    setup_logging(
+        text_format="[%(levelname)s] %(message)s%(trace_context)s",
+        filters=[TraceContextFilter()],
+        stream=stream,
+        level="INFO",
+        log_format="text",
+    )
+    try:
+        with start_span("daily-run", {"run_id": "r2"}):
+            logger.info("hello %s", "world")
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            logger.error("boom", exc_info=True)
+    finally:
+        stop_logging()
+
+    lines = stream.getvalue().splitlines()
+    assert lines[0] == "[INFO] hello world [run_id=r2]", lines[0]
+    assert lines[1] == "[ERROR] boom"
+    assert "ZeroDivisionError" in stream.getvalue()
+    print("  ✓ Text output unchanged")
+
+
+def test_callers_do_not_wait_for_io():
+    """Test logging returns before a slow stream is written, and stop drains it"""
+    print("Testing non-blocking writes...")
+    stream = SlowStream()
+    setup_logging(stream=stream, level="INFO", log_format="text")
+    try:
+        started = time.perf_counter()
+        for i in range(20):
+            logger.info("record %d", i)
+        elapsed = time.perf_counter() - started
+    finally:
+        stop_logging()
+    assert elapsed < 0.25, f"20 records took {elapsed:.2f}s on the calling thread"
+    assert len(stream.getvalue().splitlines()) == 20, "queue not drained on stop"
+    print(f"  ✓ 20 records enqueued in {elapsed * 1000:.1f} ms")
+
+
+def test_workers_use_shared_setup():
+    """Test workers/logging_setup.py is the shared writer with the workers' format"""
+    print("Testing worker logging...")
+    sys.path.insert(0, str(Path(__file__).parent.parent / "workers"))
+    import logging_setup as workers_logging
+
+    assert workers_logging.stop_logging is stop_logging, "workers must not keep their own copy"
+
+    stream = io.StringIO()
+    workers_logging.setup_logging(stream=stream)
+    try:
+        logging.getLogger("ingest_worker").warning("item %s skipped", "i1")
+    finally:
+        stop_logging()
+    assert stream.getvalue().rstrip().endswith(" - ingest_worker - WARNING - item i1 skipped"), stream.getvalue()
+    print("  ✓ Workers share the queued writer")
+
+
+def test_disabled_debug_is_lazy():
+    """Test %-style debug calls do not format their arguments when disabled"""
+    print("Testing lazy formatting...")
+    formatted = []
+
+    class Expensive:
+        def __str__(self):
+            formatted.append(1)
+            return "expensive"
+
+    stream = io.StringIO()
+    setup_logging(stream=stream, level="INFO", log_format="json")
+    try:
+        for _ in range(1000):
+            logger.debug("chunk %s", Expensive())
+    finally:
+        stop_logging()
+    assert not formatted
+    assert stream.getvalue() == ""
+    print("  ✓ Disabled debug calls skip formatting")
+
+
+def run_all_tests():
+    """Run all test suites"""
+    print("=" * 60)
+    print("Running Logging Setup Tests")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_json_fields_and_trace_context,
+        test_text_format_unchanged,
+        test_callers_do_not_wait_for_io,
+        test_workers_use_shared_setup,
+        test_disabled_debug_is_lazy,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"  ✗ Test failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"  ✗ Test error: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
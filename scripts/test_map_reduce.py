@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Tests for Map-Reduce Summarization
+===================================
+
+Covers batching, reduction rounds and local merging in lib/map_reduce.py
+"""
+
+import json
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lib.map_reduce import TokenCounter, batch_notes, map_reduce, merge_partials
+
+
+class CharCounter(TokenCounter):
+    """One token per character, independent of tiktoken availability."""
+
+    def __init__(self):
+        super().__init__("test")
+
+    def count(self, text):
+        return len(text)
+
+
+def test_batches_respect_budget_and_order():
+    """Test that batches stay under budget and keep note order"""
+    print("Testing batching...")
+    counter = CharCounter()
+    notes = [f"note-{i:02d}" for i in range(10)]  # 7 chars + 4 overhead each
+    batches = batch_notes(notes, 25, counter)
+    assert [n for b in batches for n in b] == notes
+    assert all(sum(len(n) + 4 for n in b) <= 25 for b in batches)
+    assert len(batches) == 5
+    print("  ✓ Batches under budget")
+
+
+def test_oversized_note_is_split():
+    """Test that a note larger than the budget is split on lines"""
+    print("Testing oversized notes...")
+    counter = CharCounter()
+    note = "\n".join(["x" * 20] * 6)
+    batches = batch_notes([note], 50, counter)
+    assert len(batches) > 1
+    assert "".join("".join(b) for b in batches).count("x") == 120
+    print("  ✓ Oversized note split")
+
+
+def test_map_runs_concurrently_and_reduces_in_rounds():
+    """Test concurrent map calls and tree reduction"""
+    print("Testing map-reduce...")
+    barrier = threading.Barrier(3, timeout=2)
+    reduce_calls = []
+
+    def summarize(batch):
+        barrier.wait()  # only passes if three batches are in flight at once
+        return {"highlights": batch, "action_items": batch, "assessment": "part"}
+
+    def reduce(partials):
+        reduce_calls.append(len(partials))
+        return merge_partials(partials, max_highlights=100)
+
+    batches = [[f"n{i}"] for i in range(9)]
+    result = map_reduce(batches, summarize, reduce, fan_in=4, max_workers=3)
+    assert result["action_items"] == [f"n{i}" for i in range(9)]
+    assert sorted(reduce_calls) == [3, 4, 4]  # 9 → 3 → 1
+    print("  ✓ Map concurrent, reduce in rounds")
+
+
+def test_merge_partials_dedupes_action_items():
+    """Test the deterministic reducer"""
+    print("Testing local merge...")
+    merged = merge_partials([
+        {"highlights": ["a", "b"], "action_items": ["Fix bug", "Ship"], "assessment": "Busy."},
+        {"highlights": ["c", "d", "e"], "action_items": ["fix bug ", {"task": "Call"}], "assessment": "Good."},
+    ])
+    assert merged["highlights"] == ["a", "b", "c", "d"]
+    assert merged["action_items"] == ["Fix bug", "Ship", {"task": "Call"}]
+    assert merged["assessment"] == "Busy. Good."
+    print("  ✓ Partials merged")
+
+
+def test_runner_rejects_non_json_answers():
+    """Test truncated map/reduce answers never replace the real action items"""
+    print("Testing non-JSON map and reduce answers...")
+    from daily_v2 import NON_JSON_ASSESSMENT, SUMMARY_OUTPUT_TOKEN_LIMIT, DailyAutomation
+    from lib.tenants import Tenant
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tenant = Tenant(name="t", repo_name="acme/notes", notes_source=Path(tmp) / "notes",
+                        output_dir=Path(tmp) / "output")
+        automation = DailyAutomation(demo_mode=True, tenant=tenant)
+        calls = []
+
+        def answer(prompt, on_action_item=None, max_tokens=None):
+            calls.append((prompt, max_tokens))
+            if prompt.startswith("Combine") or "note 1" in prompt and "note 2" in prompt:
+                content = '{"highlights": ["cut off'
+            else:
+                notes = [line.split(". ", 1)[1] for line in prompt.splitlines() if ". note " in line]
+                content = json.dumps({"highlights": [], "action_items": [f"Do {n}" for n in notes], "assessment": "ok"})
+            return automation._parse_summary_content(content, "test")
+
+        automation._cached_summary = answer
+        batch = automation._summarize_batch(["note 1", "note 2"])
+        assert batch["action_items"] == ["Do note 1", "Do note 2"], batch
+        assert len(calls) == 3, "a non-JSON batch is split and summarized again"
+
+        partials = [{"action_items": ["Ship Q3 report"] * 3}, {"action_items": ["Call Acme"]}]
+        merged = automation._reduce_summaries(partials)
+        assert merged["action_items"] == ["Ship Q3 report", "Call Acme"], merged
+        assert merged["assessment"] != NON_JSON_ASSESSMENT
+        prompt, max_tokens = calls[-1]
+        assert prompt.startswith("Combine")
+        assert automation.summary_output_tokens <= max_tokens <= SUMMARY_OUTPUT_TOKEN_LIMIT
+
+        many = [{"action_items": [f"Follow up on account {i} " * 4 for i in range(200)]}]
+        automation._reduce_summaries(many)
+        assert calls[-1][1] == SUMMARY_OUTPUT_TOKEN_LIMIT, "reduce budget grows with the partials"
+    print("  ✓ Non-JSON answers fall back to local merges")
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("=" * 60)
+    print("Map-Reduce Summarization Tests")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_batches_respect_budget_and_order,
+        test_oversized_note_is_split,
+        test_map_runs_concurrently_and_reduces_in_rounds,
+        test_merge_partials_dedupes_action_items,
+        test_runner_rejects_non_json_answers,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"  ✗ Test failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"  ✗ Test error: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for the Parallel Note Reader
+===================================
+
+Covers decoding fallbacks, size caps, mmap reads and ordering in lib/note_reader.py
+"""
+
+import codecs
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lib.note_reader import decode_note, read_note, read_notes
+
+
+def test_encoding_fallbacks():
+    """Test BOM, UTF-8, cp1252 and truncated UTF-8 decoding"""
+    print("Testing encoding detection...")
+    assert decode_note("café".encode("utf-8")) == ("café", "utf-8")
+    assert decode_note(codecs.BOM_UTF8 + b"hi") == ("hi", "utf-8-sig")
+    assert decode_note("naïve".encode("utf-16")) == ("naïve", "utf-16")
+    assert decode_note("“smart” café".encode("cp1252")) == ("“smart” café", "cp1252")
+    assert decode_note(b"\x81\x8d") == ("\x81\x8d", "latin-1")
+    cut = "abcé".encode("utf-8")[:-1]
+    assert decode_note(cut, truncated=True) == ("abc", "utf-8")
+    print("  ✓ Encodings detected")
+
+
+def test_size_cap_and_mmap():
+    """Test that large files are capped and read via mmap"""
+    print("Testing size cap...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "big.md"
+        path.write_text("x" * 5000)
+        result = read_note(path, max_bytes=3000, mmap_threshold=1000)
+        assert result.truncated and len(result.content) == 3000
+        small = read_note(path, max_bytes=10_000, mmap_threshold=100_000)
+        assert not small.truncated and len(small.content) == 5000
+        missing = read_note(Path(tmp) / "missing.md")
+        assert missing.error
+    print("  ✓ Size cap applied")
+
+
+def test_results_keep_input_order():
+    """Test deterministic ordering with many workers"""
+    print("Testing ordering...")
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(50):
+            path = Path(tmp) / f"{i:02d}.txt"
+            path.write_text(f"note {i}" * (50 - i))
+            paths.append(path)
+        results = read_notes(paths, max_workers=8)
+        assert [r.path for r in results] == paths
+        assert all(r.content.startswith(f"note {i}") for i, r in enumerate(results))
+    print("  ✓ Order preserved")
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("=" * 60)
+    print("Note Reader Tests")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_encoding_fallbacks,
+        test_size_cap_and_mmap,
+        test_results_keep_input_order,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"  ✗ Test failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"  ✗ Test error: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
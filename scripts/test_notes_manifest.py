@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Tests for the Notes Manifest
+=============================
+
+Covers change detection and commit semantics of lib/notes_manifest.py
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lib.notes_manifest import NotesManifest, iter_note_files
+
+
+def test_single_walk_filters_suffixes():
+    """Test that only .md/.txt files are found, including subdirectories"""
+    print("Testing notes walk...")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / "sub").mkdir()
+        (root / "a.md").write_text("a")
+        (root / "sub" / "b.TXT").write_text("b")
+        (root / "c.pdf").write_text("c")
+
+        found = sorted(rel for rel, _ in iter_note_files(root))
+        assert found == ["a.md", "sub/b.TXT"], found
+    print("  ✓ Walk finds notes only")
+
+
+def test_delta_between_runs():
+    """Test new, changed, touched and removed files"""
+    print("Testing notes delta...")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "notes"
+        root.mkdir()
+        manifest_path = Path(tmp) / "notes_manifest.json"
+        (root / "a.md").write_text("alpha")
+        (root / "b.md").write_text("beta")
+        (root / "c.md").write_text("gamma")
+
+        first = NotesManifest(manifest_path, root)
+        delta = first.scan()
+        assert [n.path for n in delta.new] == ["a.md", "b.md", "c.md"]
+        first.commit()
+
+        (root / "a.md").write_text("alpha, revised")
+        st = (root / "b.md").stat()
+        os.utime(root / "b.md", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))  # touched only
+        (root / "c.md").unlink()
+        (root / "d.md").write_text("delta")
+
+        second = NotesManifest(manifest_path, root)
+        delta = second.scan()
+        assert [n.path for n in delta.changed] == ["a.md"]
+        assert [n.path for n in delta.new] == ["d.md"]
+        assert delta.unchanged == ["b.md"]
+        assert delta.removed == ["c.md"]
+        assert [n.content for n in delta.modified] == ["alpha, revised", "delta"]
+    print("  ✓ Delta computed")
+
+
+def test_uncommitted_scan_is_repeated():
+    """Test that a scan without commit reports the same delta again"""
+    print("Testing commit semantics...")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "notes"
+        root.mkdir()
+        manifest_path = Path(tmp) / "notes_manifest.json"
+        (root / "a.md").write_text("alpha")
+
+        assert len(NotesManifest(manifest_path, root).scan().new) == 1
+        manifest = NotesManifest(manifest_path, root)
+        assert len(manifest.scan().new) == 1
+        manifest.commit()
+
+        manifest = NotesManifest(manifest_path, root)
+        delta = manifest.scan(read_unchanged=True)
+        assert not delta.new and delta.unchanged == ["a.md"]
+        assert [n.content for n in delta.all_notes] == ["alpha"]
+    print("  ✓ Manifest only advances on commit")
+
+
+def test_failed_summary_keeps_notes_pending():
+    """Test an incremental run only commits the manifest after a real summary"""
+    print("Testing runner commit after failed summaries...")
+    from daily_v2 import DailyAutomation
+    from lib.tenants import Tenant
+
+    def fell_back(automation):
+        return lambda notes: automation._fallback_summary(notes)
+
+    def raised(automation):
+        def fail(notes):
+            raise RuntimeError("OpenAI unavailable")
+        return fail
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "notes"
+        root.mkdir()
+        (root / "a.md").write_text("Follow up with Acme on pricing")
+        output_dir = Path(tmp) / "output"
+        tenant = Tenant(name="test", repo_name="acme/notes", notes_source=root, output_dir=output_dir)
+        os.environ["SALES_PIPELINE_CACHE"] = str(Path(tmp) / "sales_cache")
+        try:
+            for break_summary in (fell_back, raised):
+                automation = DailyAutomation(demo_mode=True, incremental=True, tenant=tenant)
+                automation._build_summary = break_summary(automation)
+                assert automation.run() == 0
+                pending = NotesManifest(output_dir / "notes_manifest.json", root).scan()
+                assert [n.path for n in pending.new] == ["a.md"], f"{break_summary.__name__}: delta lost"
+
+            assert DailyAutomation(demo_mode=True, incremental=True, tenant=tenant).run() == 0
+            done = NotesManifest(output_dir / "notes_manifest.json", root).scan()
+            assert not done.new and done.unchanged == ["a.md"]
+        finally:
+            del os.environ["SALES_PIPELINE_CACHE"]
+    print("  ✓ Notes stay pending until summarized")
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("=" * 60)
+    print("Notes Manifest Tests")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_single_walk_filters_suffixes,
+        test_delta_between_runs,
+        test_uncommitted_scan_is_repeated,
+        test_failed_summary_keeps_notes_pending,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"  ✗ Test failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"  ✗ Test error: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Tests for the Notes Watcher
+============================
+
+Covers change detection (inotify and polling) and debouncing in
+lib/notes_watcher.py, and the issue opt-in of ``daily_v2.py --watch``
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import lib.notes_watcher as notes_watcher
+from lib.notes_watcher import InotifyWatcher, NotesWatcher, PollingWatcher, create_watcher, wait_for_changes
+
+HAS_INOTIFY = sys.platform.startswith("linux")
+
+
+def _check_detection(make_watcher):
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / "old.md").write_text("old")
+        (root / "out").mkdir()
+        watcher = make_watcher(root, [root / "out"])
+        try:
+            assert not watcher.wait(0.3), "change reported with no edits"
+
+            (root / "image.png").write_bytes(b"\x89PNG")
+            (root / "out" / "summary.md").write_text("written by the runner")
+            assert not watcher.wait(0.5), "non-note or excluded file reported"
+
+            (root / "new.md").write_text("new")
+            assert watcher.wait(2.0), "new note not reported"
+            watcher.wait(0.3)  # drain follow-up events
+
+            (root / "sub").mkdir()
+            watcher.wait(0.3)
+            (root / "sub" / "nested.txt").write_text("nested")
+            assert watcher.wait(2.0), "note in new directory not reported"
+            watcher.wait(0.3)
+
+            (root / "old.md").unlink()
+            assert watcher.wait(2.0), "removed note not reported"
+        finally:
+            watcher.close()
+
+
+def test_polling_watcher():
+    """Test polling reports new, nested and removed notes only"""
+    print("Testing polling watcher...")
+    _check_detection(lambda root, exclude: PollingWatcher(root, interval=0.05, exclude=exclude))
+    print("  ✓ Polling detects note changes")
+
+
+def test_inotify_watcher():
+    """Test inotify reports new, nested and removed notes only"""
+    print("Testing inotify watcher...")
+    if not HAS_INOTIFY:
+        print("  - Skipped (not Linux)")
+        return
+    _check_detection(lambda root, exclude: InotifyWatcher(root, exclude=exclude))
+    with tempfile.TemporaryDirectory() as tmp:
+        watcher = create_watcher(Path(tmp))
+        assert isinstance(watcher, InotifyWatcher)
+        watcher.close()
+    print("  ✓ inotify detects note changes")
+
+
+def test_debounce_coalesces_burst():
+    """Test a burst of edits yields one change, after the quiet period"""
+    print("Testing debounce...")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        watcher = PollingWatcher(root, interval=0.02)
+        stop = threading.Event()
+
+        def burst():
+            for i in range(5):
+                (root / f"note{i}.md").write_text(str(i))
+                time.sleep(0.05)
+
+        writer = threading.Thread(target=burst)
+        writer.start()
+        started = time.monotonic()
+        assert wait_for_changes(watcher, debounce=0.3, stop=stop)
+        elapsed = time.monotonic() - started
+        writer.join()
+        assert elapsed >= 0.5, f"returned {elapsed:.2f}s in, before the burst ended"
+        assert not watcher.wait(0.2), "burst not fully consumed"
+    print("  ✓ Burst coalesced into one change")
+
+
+def test_debounce_max_delay_and_stop():
+    """Test continuous edits are cut off at max_delay, and stop ends the wait"""
+    print("Testing max delay and stop...")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        watcher = PollingWatcher(root, interval=0.02)
+        stop = threading.Event()
+        done = threading.Event()
+
+        def autosave():
+            i = 0
+            while not done.is_set():
+                (root / "draft.md").write_text(str(i))
+                i += 1
+                time.sleep(0.05)
+
+        writer = threading.Thread(target=autosave)
+        writer.start()
+        try:
+            started = time.monotonic()
+            assert wait_for_changes(watcher, debounce=0.3, stop=stop, max_delay=0.5)
+            assert time.monotonic() - started < 1.5
+        finally:
+            done.set()
+            writer.join()
+
+        threading.Timer(0.2, stop.set).start()
+        assert not wait_for_changes(watcher, debounce=0.3, stop=stop)
+    print("  ✓ Max delay and stop honoured")
+
+
+def test_watcher_interface_is_abstract():
+    """Test a watcher without wait() cannot be constructed"""
+    print("Testing watcher interface...")
+
+    class Incomplete(NotesWatcher):
+        pass
+
+    for cls in (NotesWatcher, Incomplete):
+        try:
+            cls(Path("."))
+            raise AssertionError(f"{cls.__name__} constructed without wait()")
+        except TypeError:
+            pass
+    print("  ✓ wait() is abstract")
+
+
+def test_watch_skips_issues_unless_opted_in():
+    """Test watch() leaves GitHub issue creation out unless create_issues=True"""
+    print("Testing watch issue opt-in...")
+    from daily_v2 import DailyAutomation
+    from lib.tenants import Tenant
+
+    class OneChange:
+        def __init__(self):
+            self.changes = 1
+
+        def __call__(self, watcher, debounce, stop):
+            self.changes -= 1
+            return self.changes >= 0
+
+    original = notes_watcher.create_watcher, notes_watcher.wait_for_changes
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "notes"
+        root.mkdir()
+        os.environ["SALES_PIPELINE_CACHE"] = str(Path(tmp) / "sales_cache")
+        try:
+            for create_issues, expected in ((False, 0), (True, 1)):
+                (root / f"{create_issues}.md").write_text("Follow up with Acme on pricing")
+                tenant = Tenant(
+                    name="test", repo_name="acme/notes", notes_source=root, output_dir=Path(tmp) / str(create_issues)
+                )
+                automation = DailyAutomation(demo_mode=True, tenant=tenant)
+                handled = []
+                automation._handle_issues = lambda summary: handled.append(summary) or []
+                notes_watcher.create_watcher = lambda *args, **kwargs: PollingWatcher(root)
+                notes_watcher.wait_for_changes = OneChange()
+                assert automation.watch(create_issues=create_issues) == 0
+                assert len(handled) == expected, f"create_issues={create_issues}: {len(handled)} issue steps"
+        finally:
+            notes_watcher.create_watcher, notes_watcher.wait_for_changes = original
+            del os.environ["SALES_PIPELINE_CACHE"]
+    print("  ✓ Issues only filed when opted in")
+
+
+def run_all_tests():
+    """Run all test suites"""
+    print("=" * 60)
+    print("Running Notes Watcher Tests")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_polling_watcher,
+        test_inotify_watcher,
+        test_debounce_coalesces_burst,
+        test_debounce_max_delay_and_stop,
+        test_watcher_interface_is_abstract,
+        test_watch_skips_issues_unless_opted_in,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"  ✗ Test failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"  ✗ Test error: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for the Atomic Output Writer
+===================================
+
+Covers serialization, atomic replacement and unchanged-content skipping in
+lib/output_writer.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lib import output_writer
+from lib.output_writer import dumps_json, write_atomic, write_json
+
+
+def test_serialization_matches_stdlib():
+    """Test that output matches json.dumps(indent=2, ensure_ascii=False)"""
+    print("Testing serialization...")
+    data = {"date": "2025-12-01", "items": ["café", {"n": 1, "ok": True}], "empty": [], "none": None}
+    expected = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    assert dumps_json(data) == expected
+    assert json.loads(dumps_json(data, indent=False)) == data
+    print("  ✓ Format matches")
+
+
+def test_atomic_write_and_skip_unchanged():
+    """Test writes, unchanged skips and that no temp files are left"""
+    print("Testing atomic writes...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "out" / "daily_summary.json"
+        assert write_json(path, {"a": 1}) is True
+        assert json.loads(path.read_text()) == {"a": 1}
+
+        mtime = path.stat().st_mtime_ns
+        assert write_json(path, {"a": 1}) is False
+        assert path.stat().st_mtime_ns == mtime
+
+        assert write_json(path, {"a": 2}) is True
+        assert json.loads(path.read_text()) == {"a": 2}
+        assert write_atomic(path, path.read_bytes(), skip_unchanged=False) is True
+        assert [p.name for p in path.parent.iterdir()] == ["daily_summary.json"]
+    print("  ✓ Atomic replace and skip")
+
+
+def test_file_permissions():
+    """Test new files follow the umask (read lazily) and existing modes are kept"""
+    print("Testing file permissions...")
+    previous = os.umask(0o027)
+    try:
+        output_writer._default_mode = None  # the umask is read on first write
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "daily_summary.json"
+            write_json(path, {"a": 1})
+            assert path.stat().st_mode & 0o777 == 0o640, oct(path.stat().st_mode)
+            assert os.umask(0o027) == 0o027, "umask must be left as it was"
+
+            path.chmod(0o600)
+            write_json(path, {"a": 2})
+            assert path.stat().st_mode & 0o777 == 0o600
+    finally:
+        os.umask(previous)
+        output_writer._default_mode = None
+    print("  ✓ Permissions preserved")
+
+
+def run_all_tests():
+    """Run all tests"""
+    print("=" * 60)
+    print("Output Writer Tests")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_serialization_matches_stdlib,
+        test_atomic_write_and_skip_unchanged,
+        test_file_permissions,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"  ✗ Test failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"  ✗ Test error: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for Step Profiling
+=========================
+
+Covers the per-step reports written by lib/profiling.py
+"""
+
+import json
+import pstats
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lib.profiling import StepProfiler
+
+
+def busy_step():
+    blocks = [bytearray(64 * 1024) for _ in range(32)]
+    deadline = time.perf_counter() + 0.05
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(1000))
+    return blocks, total
+
+
+def test_reports_written():
+    """Test .prof, speedscope and allocation reports are written per step"""
+    print("Testing profile reports...")
+    with tempfile.TemporaryDirectory() as tmp:
+        profiler = StepProfiler(Path(tmp) / "run-1", top_n=5)
+        blocks, _ = profiler.run("generate-summary", busy_step)
+        assert len(blocks) == 32
+
+        base = Path(tmp) / "run-1"
+        stats = pstats.Stats(str(base / "generate-summary.prof"))
+        assert any(func[2] == "busy_step" for func in stats.stats), "busy_step missing from cProfile stats"
+
+        speedscope = json.loads((base / "generate-summary.speedscope.json").read_text())
+        frames = speedscope["shared"]["frames"]
+        assert speedscope["profiles"], "no sampled profiles"
+        sampled = [p for p in speedscope["profiles"] if p["samples"]]
+        assert sampled, "no samples recorded"
+        for profile in sampled:
+            assert profile["type"] == "sampled"
+            assert len(profile["samples"]) == len(profile["weights"])
+            assert all(0 <= i < len(frames) for stack in profile["samples"] for i in stack)
+        assert any(f["name"] == "busy_step" for f in frames)
+
+        report = (base / "generate-summary.allocations.txt").read_text()
+        assert "Peak traced memory" in report
+        assert "test_profiling.py" in report, report
+    print("  ✓ Reports written and readable")
+
+
+def test_failing_step_still_profiled():
+    """Test a step that raises is profiled and the error propagates"""
+    print("Testing failing step...")
+    with tempfile.TemporaryDirectory() as tmp:
+        profiler = StepProfiler(Path(tmp))
+
+        def fail():
+            raise RuntimeError("boom")
+
+        try:
+            profiler.run("sales/pipeline", fail)
+            raise AssertionError("expected RuntimeError")
+        except RuntimeError:
+            pass
+        assert (Path(tmp) / "sales_pipeline.prof").exists()
+        speedscope = json.loads((Path(tmp) / "sales_pipeline.speedscope.json").read_text())
+        assert len(speedscope["profiles"]) >= 1
+    print("  ✓ Failing step profiled")
+
+
+def run_all_tests():
+    """Run all test suites"""
+    print("=" * 60)
+    print("Running Profiling Tests")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_reports_written,
+        test_failing_step_still_profiled,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"  ✗ Test failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"  ✗ Test error: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Tests for the Run History Database
+===================================
+
+Covers recording, percentile/failure/slowest queries and the CLI of
+lib/run_history.py
+"""
+
+import contextlib
+import io
+import json
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lib.run_history import RunHistory, main, percentile, since_days
+
+NOW = datetime(2026, 3, 1, 6, 0, tzinfo=timezone.utc)
+
+
+def make_run(run_id, days_ago, status="success", sales=1.0, summary=2.0, demo=False, failed_step=None):
+    started = NOW - timedelta(days=days_ago)
+    steps = []
+    for stage, step, duration in (
+        ("ingest", "load-notes", 0.1),
+        ("transform", "generate-summary", summary),
+        ("enrich", "sales-pipeline", sales),
+    ):
+        record = {"stage": stage, "step": step, "status": "success", "duration_sec": duration}
+        if step == failed_step:
+            record["status"] = "failure"
+            record["error"] = "boom"
+        steps.append(record)
+    return {
+        "run_id": run_id,
+        "started_at": started.isoformat(),
+        "ended_at": (started + timedelta(seconds=sales + summary)).isoformat(),
+        "duration_sec": sales + summary,
+        "status": status,
+        "demo_mode": demo,
+        "steps": steps,
+        "artifacts": {"daily_summary": "output/daily_summary.json"},
+        "llm_cache": {"enabled": True, "hits": 1, "misses": 0},
+    }
+
+
+def test_percentile():
+    """Test linear-interpolated percentiles"""
+    print("Testing percentile...")
+    assert percentile([5.0], 90) == 5.0
+    assert percentile([1.0, 2.0, 3.0, 4.0, 5.0], 50) == 3.0
+    assert percentile([1.0, 2.0, 3.0, 4.0, 5.0], 100) == 5.0
+    assert abs(percentile([0.0, 10.0], 95) - 9.5) < 1e-9
+    print("  ✓ Percentiles interpolate between ranks")
+
+
+def test_record_and_replace():
+    """Test runs are stored with steps and replaced by run_id"""
+    print("Testing record/replace...")
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "history.sqlite3"
+        with RunHistory(db) as history:
+            history.record_run(make_run("r1", 1, sales=1.0))
+            history.record_run(make_run("r1", 1, sales=4.0))
+        with RunHistory(db) as history:
+            report = history.step_durations()
+            sales = next(e for e in report if e["step"] == "sales-pipeline")
+            assert sales["count"] == 1, sales
+            assert sales["max"] == 4.0
+            row = history._conn.execute("SELECT extra, artifacts FROM runs").fetchone()
+            assert json.loads(row["extra"])["llm_cache"]["hits"] == 1
+            assert json.loads(row["artifacts"])["daily_summary"].endswith("daily_summary.json")
+    print("  ✓ Re-recording a run replaces its rows")
+
+
+def test_migrates_v1_database():
+    """Test a v1 database gains the step metric columns"""
+    print("Testing schema migration...")
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "history.sqlite3"
+        conn = sqlite3.connect(str(db))
+        conn.executescript(
+            "CREATE TABLE runs (run_id TEXT PRIMARY KEY, started_at TEXT NOT NULL, ended_at TEXT,"
+            " duration_sec REAL, status TEXT NOT NULL, demo_mode INTEGER NOT NULL DEFAULT 0,"
+            " artifacts TEXT NOT NULL DEFAULT '{}', extra TEXT NOT NULL DEFAULT '{}');"
+            "CREATE TABLE steps (run_id TEXT NOT NULL, seq INTEGER NOT NULL, started_at TEXT NOT NULL,"
+            " stage TEXT NOT NULL, step TEXT NOT NULL, status TEXT NOT NULL, duration_sec REAL,"
+            " error TEXT, PRIMARY KEY (run_id, seq));"
+            "PRAGMA user_version = 1;"
+        )
+        conn.close()
+
+        run = make_run("r1", 1)
+        run["steps"][2]["http_calls"] = 4
+        with RunHistory(db) as history:
+            history.record_run(run)
+            row = history._conn.execute("SELECT http_calls FROM steps WHERE step = 'sales-pipeline'").fetchone()
+            assert row["http_calls"] == 4
+            assert history._conn.execute("PRAGMA user_version").fetchone()[0] == 2
+    print("  ✓ v1 databases are upgraded in place")
+
+
+def test_queries():
+    """Test percentiles, failure rates and slowest runs over a time window"""
+    print("Testing queries...")
+    with tempfile.TemporaryDirectory() as tmp:
+        with RunHistory(Path(tmp) / "history.sqlite3") as history:
+            for i in range(10):
+                history.record_run(make_run(f"r{i}", i, sales=float(i + 1)))
+            history.record_run(make_run("failed", 2, status="failed", sales=30.0, failed_step="sales-pipeline"))
+            history.record_run(make_run("old", 60, sales=100.0))
+            history.record_run(make_run("demo", 1, sales=50.0, demo=True))
+
+            since = since_days(30, now=NOW)
+            report = history.step_durations(since)
+            assert report[0]["step"] == "sales-pipeline", report
+            sales = report[0]
+            assert sales["count"] == 11
+            assert sales["max"] == 30.0
+            assert sales["p50"] == 6.0
+
+            rates = history.failure_rates(since)
+            assert rates["runs"]["total"] == 11
+            assert rates["runs"]["by_status"] == {"success": 10, "failed": 1}
+            assert rates["steps"][0]["step"] == "sales-pipeline"
+            assert rates["steps"][0]["failed"] == 1
+
+            slowest = history.slowest_runs(since, limit=2)
+            assert [r["run_id"] for r in slowest] == ["failed", "r9"]
+            assert slowest[0]["steps"]["sales-pipeline"] == 30.0
+
+            with_demo = history.slowest_runs(since, limit=1, include_demo=True)
+            assert with_demo[0]["run_id"] == "demo"
+    print("  ✓ Queries respect the window and exclude demo runs")
+
+
+def test_cli():
+    """Test the CLI subcommands"""
+    print("Testing CLI...")
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "history.sqlite3"
+        now = datetime.now(timezone.utc)
+        with RunHistory(db) as history:
+            run = make_run("recent", 0)
+            run["started_at"] = now.isoformat()
+            history.record_run(run)
+
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            assert main(["--db", str(db), "--json", "steps"]) == 0
+        steps = json.loads(out.getvalue())
+        assert {s["step"] for s in steps} == {"load-notes", "generate-summary", "sales-pipeline"}
+
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            assert main(["--db", str(db), "slowest", "--limit", "5"]) == 0
+            assert main(["--db", str(db), "failures"]) == 0
+        text = out.getvalue()
+        assert "recent" in text and "failure rate" in text
+
+        with contextlib.redirect_stderr(io.StringIO()):
+            assert main(["--db", str(Path(tmp) / "missing.sqlite3"), "steps"]) == 1
+    print("  ✓ CLI prints tables and JSON")
+
+
+def run_all_tests():
+    """Run all test suites"""
+    print("=" * 60)
+    print("Running Run History Tests")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_percentile,
+        test_record_and_replace,
+        test_migrates_v1_database,
+        test_queries,
+        test_cli,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"  ✗ Test failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"  ✗ Test error: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Tests for the Step Graph Executor
+==================================
+
+Covers dependency ordering, concurrency and failure semantics of lib/step_graph.py
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lib.step_graph import StepGraphError, StepSpec, run_graph
+
+
+def _runner(spec, thunk):
+    """Minimal stand-in for daily_v2.run_step."""
+    try:
+        return True, thunk()
+    except Exception:
+        if not spec.allow_failure:
+            raise
+        return False, None
+
+
+def test_independent_steps_run_concurrently():
+    """Test that independent slow steps overlap"""
+    print("Testing concurrent execution...")
+
+    barrier = threading.Barrier(2, timeout=2)
+
+    def slow(deps):
+        barrier.wait()  # only passes if both steps are running at once
+        return "done"
+
+    steps = [
+        StepSpec("transform", "summary", slow),
+        StepSpec("enrich", "pipeline", slow),
+        StepSpec("output", "save", lambda deps: sorted(deps.items()), depends_on=("summary", "pipeline")),
+    ]
+    outcomes = run_graph(steps, _runner)
+
+    assert [o.spec.step for o in outcomes] == ["summary", "pipeline", "save"], "Outcomes not in declaration order"
+    assert all(o.ok for o in outcomes), "All steps should succeed"
+    assert outcomes[2].result == [("pipeline", "done"), ("summary", "done")], "Dependencies not passed through"
+
+    print("  ✓ Concurrent execution tests passed")
+
+
+def test_allowed_failure_uses_fallback():
+    """Test allow_failure steps complete with their fallback result"""
+    print("Testing allowed failures...")
+
+    def boom(deps):
+        raise RuntimeError("api down")
+
+    steps = [
+        StepSpec("transform", "summary", boom, fallback=lambda: {"highlights": []}),
+        StepSpec("output", "issues", lambda deps: deps["summary"], depends_on=("summary",)),
+    ]
+    outcomes = run_graph(steps, _runner)
+
+    assert not outcomes[0].ok, "Failed step should be recorded as not ok"
+    assert outcomes[1].ok and outcomes[1].result == {"highlights": []}, "Fallback not passed to dependent"
+
+    print("  ✓ Allowed failure tests passed")
+
+
+def test_mandatory_failure_aborts_graph():
+    """Test that allow_failure=False stops scheduling and raises"""
+    print("Testing mandatory failures...")
+
+    ran = []
+
+    def boom(deps):
+        raise RuntimeError("disk full")
+
+    steps = [
+        StepSpec("output", "save", boom, allow_failure=False),
+        StepSpec("output", "after", lambda deps: ran.append("after"), depends_on=("save",)),
+    ]
+    try:
+        run_graph(steps, _runner)
+    except StepGraphError as e:
+        assert e.failed.spec.step == "save", "Wrong failed step"
+        assert str(e.failed.error) == "disk full", "Original error not preserved"
+        assert [o.spec.step for o in e.outcomes] == ["save"], "Unexpected outcomes recorded"
+    else:
+        raise AssertionError("Expected StepGraphError")
+    assert not ran, "Dependent step should not run after a mandatory failure"
+
+    print("  ✓ Mandatory failure tests passed")
+
+
+def test_invalid_graphs_rejected():
+    """Test unknown dependencies and cycles"""
+    print("Testing graph validation...")
+
+    noop = lambda deps: None
+    for steps in (
+        [StepSpec("a", "a", noop, depends_on=("missing",))],
+        [StepSpec("a", "a", noop, depends_on=("b",)), StepSpec("b", "b", noop, depends_on=("a",))],
+    ):
+        try:
+            run_graph(steps, _runner)
+        except ValueError:
+            continue
+        raise AssertionError("Expected ValueError for invalid graph")
+
+    print("  ✓ Graph validation tests passed")
+
+
+def run_all_tests():
+    """Run all test suites"""
+    print("=" * 60)
+    print("Running Step Graph Tests")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_independent_steps_run_concurrently,
+        test_allowed_failure_uses_fallback,
+        test_mandatory_failure_aborts_graph,
+        test_invalid_graphs_rejected,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"  ✗ Test failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"  ✗ Test error: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
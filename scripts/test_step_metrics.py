@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Tests for Per-Step Resource Metrics
+====================================
+
+Covers timing and HTTP attribution in lib/step_metrics.py, using a local
+HTTP server
+"""
+
+import contextvars
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import requests
+
+from lib.step_metrics import StepMetrics, install_http_hooks
+
+BODY = b"x" * 1000
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def _server():
+    server = HTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/"
+
+
+def test_timing_and_cpu():
+    """Test wall and CPU time are measured"""
+    print("Testing timing...")
+    metrics = StepMetrics()
+    metrics.start()
+    time.sleep(0.05)
+    deadline = time.thread_time() + 0.02
+    while time.thread_time() < deadline:
+        pass
+    metrics.stop()
+    assert metrics.wall_sec >= 0.07, metrics
+    assert 0.015 <= metrics.cpu_sec < metrics.wall_sec, metrics
+    record = metrics.as_record()
+    assert record["duration_sec"] == round(metrics.wall_sec, 3)
+    assert record["http_calls"] == 0
+    print("  ✓ Wall and CPU time recorded")
+
+
+def test_http_attribution():
+    """Test HTTP calls are counted for the active step only, across threads"""
+    print("Testing HTTP attribution...")
+    install_http_hooks()
+    install_http_hooks()  # idempotent
+    server, url = _server()
+    try:
+        session = requests.Session()
+        session.post(url, data=b"y" * 200)  # no active step: not counted
+
+        first, second = StepMetrics(), StepMetrics()
+
+        def step(metrics, calls):
+            metrics.start()
+            try:
+                with ThreadPoolExecutor(max_workers=2) as pool:
+                    futures = [
+                        pool.submit(contextvars.copy_context().run, session.post, url, data=b"y" * 200)
+                        for _ in range(calls)
+                    ]
+                    for f in futures:
+                        f.result()
+            finally:
+                metrics.stop()
+
+        threads = [
+            threading.Thread(target=contextvars.copy_context().run, args=(step, first, 3)),
+            threading.Thread(target=contextvars.copy_context().run, args=(step, second, 1)),
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert first.http_calls == 3, first
+        assert first.http_bytes_sent == 600
+        assert first.http_bytes_received == 3000
+        assert second.http_calls == 1, second
+    finally:
+        server.shutdown()
+    print("  ✓ Calls and bytes attributed per step")
+
+
+def test_hooks_patch_on_first_import():
+    """Test install_http_hooks does not import requests but patches it on import"""
+    print("Testing lazy hook installation...")
+    code = (
+        "import sys; sys.path.insert(0, %r)\n"
+        "from lib.step_metrics import install_http_hooks\n"
+        "install_http_hooks()\n"
+        "assert 'requests' not in sys.modules and 'httpx' not in sys.modules\n"
+        "import requests, httpx\n"
+        "assert requests.Session.send._step_metrics_hook\n"
+        "assert httpx.Client.send._step_metrics_hook\n"
+    ) % str(Path(__file__).parent)
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=60)
+    assert proc.returncode == 0, proc.stderr
+    print("  ✓ Libraries patched on first import")
+
+
+def run_all_tests():
+    """Run all test suites"""
+    print("=" * 60)
+    print("Running Step Metrics Tests")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_timing_and_cpu,
+        test_http_attribution,
+        test_hooks_patch_on_first_import,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"  ✗ Test failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"  ✗ Test error: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
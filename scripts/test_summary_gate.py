@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Tests for the Summary Gate
+===========================
+
+Covers novelty, centroids, configuration, the regeneration decision table
+and error handling in workers/summary_gate.py
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add workers directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "workers"))
+
+from summary_gate import GateConfig, SummaryGate, max_novelty, update_centroid
+
+
+class FakeError(Exception):
+    def __init__(self, message, code=None):
+        super().__init__(message)
+        self.code = code
+
+
+class FakeQuery:
+    """The subset of the PostgREST query builder the gate uses."""
+
+    def __init__(self, table):
+        self.table = table
+        self.filters = []
+        self.op = ("select", None)
+
+    def select(self, *_):
+        return self
+
+    def upsert(self, row):
+        self.op = ("upsert", row)
+        return self
+
+    def update(self, values):
+        self.op = ("update", values)
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda r: r.get(column) == value)
+        return self
+
+    def gt(self, column, value):
+        self.filters.append(lambda r: (r.get(column) or 0) > value)
+        return self
+
+    def lt(self, column, value):
+        self.filters.append(lambda r: r.get(column) is not None and r.get(column) < value)
+        return self
+
+    def limit(self, _):
+        return self
+
+    def execute(self):
+        db = self.table.db
+        error = db.errors.pop(0) if db.errors else None  # None: this call succeeds
+        if error is not None:
+            raise error
+        kind, payload = self.op
+        if kind == "upsert":
+            db.rows[payload["client_id"]] = dict(payload)
+            return FakeResult([payload])
+        matched = [r for r in db.rows.values() if all(f(r) for f in self.filters)]
+        if kind == "update":
+            for row in matched:
+                row.update(payload)
+        return FakeResult([dict(r) for r in matched])
+
+
+class FakeResult:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeTable:
+    def __init__(self, db):
+        self.db = db
+
+    def __getattr__(self, name):
+        return getattr(FakeQuery(self), name)
+
+
+class FakeSupabase:
+    def __init__(self):
+        self.rows = {}
+        self.errors = []
+
+    def table(self, name):
+        assert name == "client_summary_state"
+        return FakeTable(self)
+
+
+def _gate(db):
+    config = GateConfig(min_new_tokens=200, novelty_threshold=0.5, min_novel_tokens=30, max_staleness_hours=24)
+    return SummaryGate(db, config)
+
+
+def test_novelty_and_centroid():
+    """Test cosine novelty against the centroid and the running mean"""
+    print("Testing novelty and centroid...")
+    assert max_novelty([], [1.0, 0.0]) == 0.0
+    assert max_novelty([[1.0, 0.0]], None) == 1.0
+    assert abs(max_novelty([[2.0, 0.0]], [1.0, 0.0])) < 1e-9
+    assert abs(max_novelty([[1.0, 0.0], [0.0, 1.0]], [1.0, 0.0]) - 1.0) < 1e-9
+    assert max_novelty([[1.0, 0.0, 0.0]], [1.0, 0.0]) == 1.0, "dimension change is novel"
+
+    assert update_centroid(None, 0, [[1.0, 0.0], [0.0, 1.0]]) == [0.5, 0.5]
+    assert update_centroid([0.5, 0.5], 2, [[1.0, 1.0]]) == [2 / 3, 2 / 3]
+    assert update_centroid([0.5, 0.5], 2, [[1.0, 0.0, 0.0]]) == [1.0, 0.0, 0.0], "backend change resets"
+    assert update_centroid([0.5, 0.5], 2, []) == [0.5, 0.5]
+    print("  ✓ Novelty and centroid correct")
+
+
+def test_config_from_env():
+    """Test thresholds and the on/off switch come from the environment"""
+    print("Testing configuration...")
+    keys = {
+        "SUMMARY_MIN_NEW_TOKENS": "50",
+        "SUMMARY_NOVELTY_THRESHOLD": "0.3",
+        "SUMMARY_MIN_NOVEL_TOKENS": "5",
+        "SUMMARY_MAX_STALENESS_HOURS": "2.5",
+        "SUMMARY_GATE": "off",
+    }
+    os.environ.update(keys)
+    try:
+        config = GateConfig.from_env()
+    finally:
+        for key in keys:
+            del os.environ[key]
+    assert (config.min_new_tokens, config.novelty_threshold, config.min_novel_tokens) == (50, 0.3, 5)
+    assert config.max_staleness_hours == 2.5 and not config.enabled
+    assert GateConfig.from_env().enabled
+
+    db = FakeSupabase()
+    decision = SummaryGate(db, config).evaluate("c1", [[1.0, 0.0]], 10)
+    assert decision.regenerate and decision.reason == "gate disabled"
+    assert db.rows == {}
+    print("  ✓ Configuration read from environment")
+
+
+def test_decision_table():
+    """Test first summary, token threshold, novelty, staleness and deferral"""
+    print("Testing decision table...")
+    db = FakeSupabase()
+    gate = _gate(db)
+
+    first = gate.evaluate("c1", [[1.0, 0.0]], 40)
+    assert first.regenerate and first.reason == "first summary"
+    gate.mark_summarized("c1")
+    assert db.rows["c1"]["pending_tokens"] == 0
+
+    small = gate.evaluate("c1", [[1.0, 0.05]], 120)
+    assert not small.regenerate and small.pending_tokens == 120, small
+
+    threshold = gate.evaluate("c1", [[1.0, 0.0]], 90)
+    assert threshold.regenerate and threshold.reason == "210 new tokens", threshold
+    gate.mark_summarized("c1")
+
+    novel = gate.evaluate("c1", [[0.0, 1.0]], 30)
+    assert novel.regenerate and novel.reason.startswith("novel content"), novel
+    gate.mark_summarized("c1")
+
+    novel_but_tiny = gate.evaluate("c1", [[-1.0, 0.0]], 10)
+    assert not novel_but_tiny.regenerate, "novel chunks under min_novel_tokens are deferred"
+
+    old = datetime.now(timezone.utc) - timedelta(hours=30)
+    db.rows["c1"]["last_summarized_at"] = old.isoformat()
+    stale = gate.evaluate("c1", [[1.0, 0.0]], 5)
+    assert stale.regenerate and stale.reason.startswith("stale"), stale
+    assert gate.stale_clients() == ["c1"]
+    gate.mark_summarized("c1")
+    assert gate.stale_clients() == []
+    print("  ✓ Every branch decided correctly")
+
+
+def test_transient_errors_fail_open_per_item():
+    """Test transient errors regenerate one item but keep the gate on"""
+    print("Testing transient errors...")
+    db = FakeSupabase()
+    gate = _gate(db)
+    gate.evaluate("c1", [[1.0, 0.0]], 40)
+    gate.mark_summarized("c1")
+
+    db.errors = [FakeError("timed out")]
+    decision = gate.evaluate("c1", [[1.0, 0.0]], 10)
+    assert decision.regenerate and decision.reason == "gate error"
+
+    db.errors = [None, FakeError("connection reset")]  # load succeeds, save fails
+    decision = gate.evaluate("c1", [[1.0, 0.0]], 10)
+    assert decision.regenerate and decision.reason == "gate error"
+
+    db.errors = [FakeError("503")]
+    gate.mark_summarized("c1")
+    assert gate.stale_clients() == []
+
+    after = gate.evaluate("c1", [[1.0, 0.0]], 10)
+    assert not after.regenerate, "gate should still be on after transient errors"
+    print("  ✓ Gate stays on after transient errors")
+
+
+def test_missing_table_disables_gate():
+    """Test a missing state table turns the gate off for good"""
+    print("Testing missing table...")
+    for error in (
+        FakeError('relation "public.client_summary_state" does not exist', code="42P01"),
+        FakeError("Could not find the table 'public.client_summary_state' in the schema cache"),
+    ):
+        db = FakeSupabase()
+        gate = _gate(db)
+        db.errors = [error]
+        assert gate.evaluate("c1", [[1.0, 0.0]], 10).regenerate
+        decision = gate.evaluate("c1", [[1.0, 0.0]], 10)
+        assert decision.reason == "gate disabled", decision
+        assert db.rows == {} and gate.stale_clients() == []
+    print("  ✓ Gate disabled when the table is missing")
+
+
+def run_all_tests():
+    """Run all test suites"""
+    print("=" * 60)
+    print("Running Summary Gate Tests")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_novelty_and_centroid,
+        test_config_from_env,
+        test_decision_table,
+        test_transient_errors_fail_open_per_item,
+        test_missing_table_disables_gate,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"  ✗ Test failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"  ✗ Test error: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
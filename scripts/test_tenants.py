@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Tests for Multi-Tenant Runs
+============================
+
+Covers config loading and the shared sales pull in lib/tenants.py
+"""
+
+import json
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lib.issue_creator import MutationPacer
+from lib.tenants import SharedServices, load_tenants
+
+
+def _write_config(directory, data):
+    path = Path(directory) / "tenants.json"
+    path.write_text(json.dumps(data))
+    return path
+
+
+def test_load_tenants():
+    """Test paths resolve against the config file and output defaults per tenant"""
+    print("Testing tenant config loading...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _write_config(tmp, {"tenants": [
+            {"name": "platform", "repo": "acme/platform", "notes": "notes/platform"},
+            {"repo": "acme/growth team", "notes": "/abs/growth", "output": "out/growth"},
+        ]})
+        platform, growth = load_tenants(path, Path(tmp) / "output")
+        root = Path(tmp).resolve()
+
+        assert platform.name == "platform"
+        assert platform.repo_name == "acme/platform"
+        assert platform.notes_source == root / "notes" / "platform"
+        assert platform.output_dir == root / "output" / "tenants" / "platform"
+
+        assert growth.name == "acme/growth team"
+        assert growth.notes_source == Path("/abs/growth")
+        assert growth.output_dir == root / "out" / "growth"
+    print("  ✓ Tenants loaded")
+
+
+def test_invalid_configs():
+    """Test malformed configs are rejected with the offending entry"""
+    print("Testing invalid configs...")
+    cases = [
+        ({"tenants": []}, "non-empty"),
+        ({"tenants": [{"repo": "acme", "notes": "n"}]}, "owner/repo"),
+        ({"tenants": [{"repo": "acme/a"}]}, "notes"),
+        ({"tenants": [{"repo": "acme/a", "notes": "n"}, {"repo": "acme/a", "notes": "m"}]}, "used twice"),
+        ({"tenants": [
+            {"name": "a", "repo": "acme/a", "notes": "n", "output": "out"},
+            {"name": "b", "repo": "acme/b", "notes": "m", "output": "./out"},
+        ]}, "share output"),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        for data, message in cases:
+            try:
+                load_tenants(_write_config(tmp, data), Path(tmp))
+                raise AssertionError(f"accepted {data}")
+            except ValueError as e:
+                assert message in str(e), f"{message!r} not in {e}"
+
+        bad = Path(tmp) / "bad.json"
+        bad.write_text("{not json")
+        try:
+            load_tenants(bad, Path(tmp))
+            raise AssertionError("accepted invalid JSON")
+        except ValueError as e:
+            assert "invalid JSON" in str(e)
+    print("  ✓ Invalid configs rejected")
+
+
+def test_sales_pipeline_pulled_once():
+    """Test concurrent tenants share a single sales pipeline pull"""
+    print("Testing shared sales pull...")
+    shared = SharedServices(github_pacer=MutationPacer(), openai_slots=threading.BoundedSemaphore(2))
+    calls = []
+
+    def pull():
+        calls.append(1)
+        time.sleep(0.1)
+        return {"deals": 3}
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: shared.sales_pipeline(pull), range(4)))
+    assert len(calls) == 1, calls
+    assert results == [{"deals": 3}] * 4
+
+    failed = SharedServices(github_pacer=MutationPacer(), openai_slots=threading.BoundedSemaphore(2))
+    calls.clear()
+    assert failed.sales_pipeline(lambda: calls.append(1)) is None
+    assert failed.sales_pipeline(lambda: calls.append(1)) is None
+    assert len(calls) == 1, "a failed pull (None) must not be retried by every tenant"
+    print("  ✓ Pulled once for all tenants")
+
+
+def test_profile_rejected():
+    """Test --tenants refuses --profile, whose profilers are process wide"""
+    print("Testing --tenants --profile...")
+    import contextlib
+    import io
+
+    import daily_v2
+
+    stderr = io.StringIO()
+    try:
+        with contextlib.redirect_stderr(stderr):
+            daily_v2.main(["--tenants", "tenants.json", "--profile"])
+        raise AssertionError("--tenants --profile was accepted")
+    except SystemExit as e:
+        assert e.code == 2
+    assert "--tenants cannot be combined with --profile" in stderr.getvalue()
+
+    try:
+        daily_v2.run_tenants(Path("tenants.json"), demo_mode=True, profile=True)
+        raise AssertionError("run_tenants accepted profile=True")
+    except ValueError as e:
+        assert "profile" in str(e)
+    print("  ✓ Profiling tenants rejected")
+
+
+def run_all_tests():
+    """Run all test suites"""
+    print("=" * 60)
+    print("Running Tenant Tests")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_load_tenants,
+        test_invalid_configs,
+        test_sales_pipeline_pulled_once,
+        test_profile_rejected,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"  ✗ Test failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"  ✗ Test error: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Tests for Run Tracing
+======================
+
+Covers span nesting, HTTP client spans, OTLP/JSON export and the log
+context filter of lib/tracing.py
+"""
+
+import contextvars
+import json
+import logging
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import requests
+
+from lib.step_metrics import install_http_hooks
+from lib.tracing import STATUS_ERROR, TraceContextFilter, Tracer, start_span
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        status = 404 if self.path.startswith("/missing") else 200
+        body = b'{"ok": true}'
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _spans_by_name(tracer):
+    return {s.name: s for s in tracer.spans}
+
+
+def test_nesting_across_threads():
+    """Test child spans nest under the run span, also from copied contexts"""
+    print("Testing span nesting...")
+    tracer = Tracer("test")
+    with start_span("daily-run", {"run_id": "r1"}, tracer=tracer) as run:
+        def step():
+            with start_span("enrich/sales-pipeline", {"step": "sales-pipeline"}):
+                pass
+
+        thread = threading.Thread(target=contextvars.copy_context().run, args=(step,))
+        thread.start()
+        thread.join()
+
+        try:
+            with start_span("output/save-output"):
+                raise ValueError("disk full")
+        except ValueError:
+            pass
+
+    spans = _spans_by_name(tracer)
+    assert spans["enrich/sales-pipeline"].parent_span_id == run.span_id
+    assert spans["enrich/sales-pipeline"].trace_id == run.trace_id
+    assert spans["output/save-output"].status_code == STATUS_ERROR
+    assert "disk full" in spans["output/save-output"].status_message
+    assert spans["daily-run"].parent_span_id is None
+    assert all(s.end_ns is not None and s.end_ns >= s.start_ns for s in tracer.spans)
+    print("  ✓ Spans nest and record errors")
+
+
+def test_http_client_spans():
+    """Test requests made inside a span become CLIENT child spans"""
+    print("Testing HTTP spans...")
+    install_http_hooks()
+    server = HTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    try:
+        requests.get(f"{base}/untraced")  # outside any span: ignored
+        tracer = Tracer("test")
+        with start_span("daily-run", tracer=tracer):
+            with start_span("enrich/sales-pipeline") as step:
+                requests.get(f"{base}/data?access_token=secret")
+                requests.get(f"{base}/missing")
+    finally:
+        server.shutdown()
+
+    client = [s for s in tracer.spans if s.kind == 3]
+    assert len(client) == 2, [s.name for s in tracer.spans]
+    ok, missing = sorted(client, key=lambda s: s.start_ns)
+    assert ok.parent_span_id == step.span_id
+    assert ok.name == "GET 127.0.0.1"
+    assert ok.attributes["http.response.status_code"] == 200
+    assert ok.attributes["http.response.body.size"] == 12
+    assert "secret" not in ok.attributes["url.full"]
+    assert missing.status_code == STATUS_ERROR
+    print("  ✓ HTTP calls traced without query strings")
+
+
+def test_otlp_export():
+    """Test the OTLP/JSON file layout"""
+    print("Testing OTLP export...")
+    tracer = Tracer("avidelta-daily", {"deployment.environment": "demo"})
+    with start_span("daily-run", {"run_id": "r1", "demo_mode": True, "notes": 3}, tracer=tracer):
+        with start_span("ingest/load-notes"):
+            pass
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = tracer.export(Path(tmp) / "traces" / "r1.json")
+        data = json.loads(path.read_text())
+
+    resource = data["resourceSpans"][0]
+    assert {"key": "service.name", "value": {"stringValue": "avidelta-daily"}} in resource["resource"]["attributes"]
+    spans = resource["scopeSpans"][0]["spans"]
+    assert [s["name"] for s in spans] == ["daily-run", "ingest/load-notes"]
+    root, child = spans
+    assert "parentSpanId" not in root
+    assert child["parentSpanId"] == root["spanId"]
+    assert len(root["traceId"]) == 32 and len(root["spanId"]) == 16
+    assert isinstance(root["startTimeUnixNano"], str)
+    attrs = {a["key"]: a["value"] for a in root["attributes"]}
+    assert attrs["demo_mode"] == {"boolValue": True}
+    assert attrs["notes"] == {"intValue": "3"}
+    print("  ✓ OTLP/JSON export")
+
+
+def test_log_context_filter():
+    """Test log records get run/stage/step from extra or the current span"""
+    print("Testing log context filter...")
+    log_filter = TraceContextFilter()
+
+    def record(**extra):
+        r = logging.LogRecord("t", logging.INFO, __file__, 1, "msg", None, None)
+        r.__dict__.update(extra)
+        log_filter.filter(r)
+        return r.trace_context
+
+    assert record() == ""
+    with start_span("daily-run", {"run_id": "r1"}):
+        with start_span("enrich/sales-pipeline", {"stage": "enrich", "step": "sales-pipeline"}):
+            assert record() == " [run_id=r1 stage=enrich step=sales-pipeline]"
+            assert record(step="override") == " [run_id=r1 stage=enrich step=override]"
+    print("  ✓ Log lines carry trace context")
+
+
+def run_all_tests():
+    """Run all test suites"""
+    print("=" * 60)
+    print("Running Tracing Tests")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_nesting_across_threads,
+        test_http_client_spans,
+        test_otlp_export,
+        test_log_context_filter,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"  ✗ Test failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"  ✗ Test error: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Tests for the Shared HTTP Transport
+====================================
+
+Covers session pooling, keep-alive, default timeouts, retries and gzip in
+lib/transport.py, using a local HTTP/1.1 server
+"""
+
+import gzip
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import requests
+
+from lib import transport
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    peers = set()
+    flaky_calls = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with _Handler.lock:
+            _Handler.peers.add(self.client_address)
+        if self.path == "/slow":
+            time.sleep(0.5)
+        if self.path == "/flaky":
+            with _Handler.lock:
+                _Handler.flaky_calls += 1
+                fail = _Handler.flaky_calls <= 2
+            if fail:
+                self._reply(503, b"busy", {"Retry-After": "0"})
+                return
+        if self.path == "/gzip" and "gzip" in self.headers.get("Accept-Encoding", ""):
+            self._reply(200, gzip.compress(b"x" * 1000), {"Content-Encoding": "gzip"})
+            return
+        self._reply(200, b"ok")
+
+    def _reply(self, status, body, headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def test_one_session_per_host():
+    """Test sessions are shared per scheme and host, and need absolute URLs"""
+    print("Testing session sharing...")
+    try:
+        a = transport.session_for("https://example.my.salesforce.com/services/data/v59.0/query")
+        b = transport.session_for("HTTPS://Example.my.salesforce.com/services/data/v59.0/query/01g-2000")
+        c = transport.session_for("https://login.salesforce.com/services/oauth2/token")
+        assert a is b
+        assert a is not c
+        assert a.headers["Accept-Encoding"] == transport.ACCEPT_ENCODING
+        try:
+            transport.session_for("/rest/v1/table")
+            raise AssertionError("relative URL accepted")
+        except ValueError:
+            pass
+    finally:
+        transport.close_all()
+    print("  ✓ One session per host")
+
+
+def test_keep_alive_and_gzip():
+    """Test paginated requests reuse one connection and gzip is decoded"""
+    print("Testing keep-alive...")
+    server, base = _server()
+    _Handler.peers.clear()
+    try:
+        session = transport.session_for(base)
+        for page in range(5):
+            assert session.get(f"{base}/page/{page}").text == "ok"
+        assert len(_Handler.peers) == 1, f"{len(_Handler.peers)} connections for 5 requests"
+
+        resp = session.get(f"{base}/gzip")
+        assert resp.headers["Content-Encoding"] == "gzip"
+        assert resp.text == "x" * 1000
+    finally:
+        transport.close_all()
+        server.shutdown()
+    print("  ✓ Connection reused, gzip decoded")
+
+
+def test_default_timeout_and_retries():
+    """Test a default read timeout applies and 503s are retried"""
+    print("Testing timeouts and retries...")
+    server, base = _server()
+    os.environ["HTTP_READ_TIMEOUT"] = "0.2"
+    os.environ["HTTP_RETRIES"] = "0"
+    try:
+        session = transport.session_for(base)
+        try:
+            session.get(f"{base}/slow")
+            raise AssertionError("default read timeout not applied")
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+            pass  # ConnectionError once urllib3 gives up retrying
+        assert session.get(f"{base}/slow", timeout=2).text == "ok"  # explicit timeout wins
+        transport.close_all()
+
+        os.environ["HTTP_RETRIES"] = "3"
+        _Handler.flaky_calls = 0
+        resp = transport.session_for(base).get(f"{base}/flaky")
+        assert resp.status_code == 200, resp.status_code
+        assert _Handler.flaky_calls == 3
+
+        os.environ["HTTP_RETRIES"] = "1"
+        transport.close_all()
+        _Handler.flaky_calls = 0
+        resp = transport.session_for(base).get(f"{base}/flaky")
+        assert resp.status_code == 503, "last response should be returned, not raised"
+    finally:
+        for key in ("HTTP_READ_TIMEOUT", "HTTP_RETRIES"):
+            os.environ.pop(key, None)
+        transport.close_all()
+        server.shutdown()
+    print("  ✓ Timeouts and retries applied")
+
+
+def test_sdk_clients_shared():
+    """Test OpenAI clients are cached per key with the transport settings"""
+    print("Testing SDK client sharing...")
+    try:
+        first = transport.openai_client("sk-test")
+        assert transport.openai_client("sk-test") is first
+        assert transport.openai_client("sk-other") is not first
+        assert first.max_retries == transport.retries()
+        assert first.timeout.read == transport.timeouts()[1]
+
+        gh = transport.github_client("ghp_test")
+        assert transport.github_client("ghp_test") is gh
+    finally:
+        transport.close_all()
+    print("  ✓ Clients shared per credential")
+
+
+def run_all_tests():
+    """Run all test suites"""
+    print("=" * 60)
+    print("Running Transport Tests")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_one_session_per_host,
+        test_keep_alive_and_gzip,
+        test_default_timeout_and_retries,
+        test_sdk_clients_shared,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"  ✗ Test failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"  ✗ Test error: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
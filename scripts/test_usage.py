@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Tests for Token Usage Accounting
+=================================
+
+Covers cost estimates, accumulation, rollup flushing (including the hourly
+increments and retries after a failed flush) and reporting in workers/usage.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add workers directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "workers"))
+
+import usage
+from usage import HOURLY_INCREMENT_FN, HOURLY_TABLE, ITEM_TABLE, UsageAccumulator, build_report, estimate_cost
+
+
+class FakeQuery:
+    def __init__(self, db, name):
+        self.db = db
+        self.name = name
+        self.filters = {}
+        self.rows = None
+
+    def select(self, *_):
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = value
+        return self
+
+    def limit(self, _):
+        return self
+
+    def upsert(self, rows):
+        self.rows = rows if isinstance(rows, list) else [rows]
+        return self
+
+    def execute(self):
+        self.db.calls.append((self.name, "upsert" if self.rows is not None else "select"))
+        error = self.db.errors.pop(0) if self.db.errors else None  # None: this call succeeds
+        if error is not None:
+            raise error
+        table = self.db.tables.setdefault(self.name, {})
+        key_columns = ("item_id", "model") if self.name == ITEM_TABLE else ("client_id", "hour", "model")
+        if self.rows is not None:
+            for row in self.rows:
+                table[tuple(row[c] for c in key_columns)] = dict(row)
+            return type("Result", (), {"data": self.rows})()
+        matched = [r for r in table.values() if all(r.get(c) == v for c, v in self.filters.items())]
+        return type("Result", (), {"data": matched})()
+
+
+class FakeIncrement:
+    """Applies add_token_usage_hourly(): insert, or add to the existing row."""
+
+    def __init__(self, db, deltas):
+        self.db = db
+        self.deltas = deltas
+
+    def execute(self):
+        self.db.calls.append((HOURLY_INCREMENT_FN, "rpc"))
+        error = self.db.errors.pop(0) if self.db.errors else None
+        if error is not None:
+            raise error
+        table = self.db.tables.setdefault(HOURLY_TABLE, {})
+        for delta in self.deltas:
+            row = table.setdefault((delta["client_id"], delta["hour"], delta["model"]), {})
+            for name, value in delta.items():
+                row[name] = row.get(name, 0) + value if isinstance(value, (int, float)) else value
+        return type("Result", (), {"data": None})()
+
+
+class FakeSupabase:
+    def __init__(self):
+        self.tables = {}
+        self.errors = []
+        self.calls = []
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params):
+        assert name == HOURLY_INCREMENT_FN, name
+        return FakeIncrement(self, params["deltas"])
+
+
+def test_estimate_cost():
+    """Test per-model prices per million tokens"""
+    print("Testing cost estimates...")
+    assert abs(estimate_cost("gpt-4o-mini", 1_000_000, 1_000_000) - 0.75) < 1e-9
+    assert abs(estimate_cost("text-embedding-3-small", 500_000, 0) - 0.01) < 1e-9
+    assert estimate_cost("local-hashing", 10_000, 0) == 0.0
+    assert estimate_cost("unknown-model", 10_000, 10_000) == 0.0
+    print("  ✓ Costs estimated")
+
+
+def test_accumulate_and_drain():
+    """Test usage is summed per item and per hour, then drained by a flush"""
+    print("Testing accumulation...")
+    acc = UsageAccumulator()
+    db = FakeSupabase()
+    acc.record(client_id="c1", item_id="i1", model="gpt-4o-mini", tokens_in=1000, tokens_out=200, elapsed_sec=0.5)
+    acc.record(client_id="c1", item_id="i1", model="gpt-4o-mini", tokens_in=500, tokens_out=100, elapsed_sec=0.25)
+    acc.record(client_id="c1", item_id="i2", model="gpt-4o-mini", tokens_in=100)
+    acc.record(client_id="c1", model="gpt-4o-mini", tokens_in=50)  # no item (stale refresh)
+    assert acc.flush(db)
+
+    items = db.tables[ITEM_TABLE]
+    i1 = items[("i1", "gpt-4o-mini")]
+    assert (i1["tokens_in"], i1["tokens_out"], i1["requests"]) == (1500, 300, 2)
+    assert i1["elapsed_sec"] == 0.75
+    assert abs(i1["cost_usd"] - estimate_cost("gpt-4o-mini", 1500, 300)) < 1e-6
+    assert len(items) == 2
+
+    (hourly,) = db.tables[HOURLY_TABLE].values()
+    assert (hourly["tokens_in"], hourly["requests"], hourly["items"]) == (1650, 4, 2)
+
+    calls = len(db.calls)
+    assert acc.flush(db) and len(db.calls) == calls, "nothing pending, nothing written"
+    print("  ✓ Usage accumulated and drained")
+
+
+def test_hourly_increment_of_existing_row():
+    """Test the hourly rollup sends deltas that the database adds to its row"""
+    print("Testing hourly increment...")
+    acc = UsageAccumulator()
+    db = FakeSupabase()
+    acc.record(client_id="c1", item_id="i1", model="text-embedding-3-small", tokens_in=300, elapsed_sec=0.1)
+    hour = next(iter(acc._hourly))[1]
+    db.tables[HOURLY_TABLE] = {("c1", hour, "text-embedding-3-small"): {
+        "client_id": "c1", "hour": hour, "model": "text-embedding-3-small",
+        "tokens_in": 700, "tokens_out": 0, "requests": 3, "elapsed_sec": 0.4, "cost_usd": 0.000014, "items": 2,
+    }}
+    assert acc.flush(db)
+    assert (HOURLY_TABLE, "select") not in db.calls, "hourly rows must not be read back"
+    row = db.tables[HOURLY_TABLE][("c1", hour, "text-embedding-3-small")]
+    assert (row["tokens_in"], row["requests"], row["items"]) == (1000, 4, 3)
+    assert round(row["elapsed_sec"], 6) == 0.5 and round(row["cost_usd"], 6) == 0.00002
+    print("  ✓ Hourly row incremented")
+
+
+def test_failed_flush_keeps_usage_and_retries():
+    """Test a failed flush loses nothing and later flushes retry after a backoff"""
+    print("Testing flush retries...")
+    acc = UsageAccumulator()
+    db = FakeSupabase()
+    acc.record(client_id="c1", item_id="i1", model="gpt-4o-mini", tokens_in=1000)
+
+    db.errors = [None, RuntimeError("502 Bad Gateway")]  # hourly increment fails
+    assert not acc.flush(db)
+    acc.record(client_id="c1", item_id="i1", model="gpt-4o-mini", tokens_in=10)
+
+    calls = len(db.calls)
+    assert not acc.flush(db), "should wait out the backoff"
+    assert len(db.calls) == calls
+
+    db.errors = [RuntimeError("timeout")]
+    acc._retry_at = 0.0
+    assert not acc.flush(db)
+    assert acc._retry_at - usage.time.monotonic() > usage.FLUSH_BACKOFF_SEC, "backoff should grow"
+
+    assert acc.flush(db, force=True), "one exception must not latch the accumulator off"
+    (hourly,) = db.tables[HOURLY_TABLE].values()
+    assert (hourly["tokens_in"], hourly["requests"], hourly["items"]) == (1010, 2, 1)
+    assert db.tables[ITEM_TABLE][("i1", "gpt-4o-mini")]["tokens_in"] == 1010
+    assert acc._failures == 0 and acc._retry_at == 0.0
+    print("  ✓ Usage kept and retried")
+
+
+def test_build_report():
+    """Test totals, throughput and per-client/model/item aggregation"""
+    print("Testing report...")
+    hourly = [
+        {"client_id": "c1", "model": "gpt-4o-mini", "tokens_in": 1000, "tokens_out": 500,
+         "requests": 2, "elapsed_sec": 1.0, "cost_usd": 0.5},
+        {"client_id": "c2", "model": "gpt-4o-mini", "tokens_in": 2000, "tokens_out": 0,
+         "requests": 1, "elapsed_sec": 2.0, "cost_usd": 1.5},
+        {"client_id": "c1", "model": "text-embedding-3-small", "tokens_in": 500, "tokens_out": None,
+         "requests": 1, "elapsed_sec": None, "cost_usd": 0.25},
+    ]
+    items = [
+        {"item_id": "i1", "cost_usd": 0.5},
+        {"item_id": "i1", "cost_usd": 0.25},
+        {"item_id": "i2", "cost_usd": 1.5},
+    ]
+    report = build_report(hourly, items)
+    assert (report["tokens_in"], report["tokens_out"], report["requests"]) == (3500, 500, 4)
+    assert report["cost_usd"] == 2.25 and report["api_seconds"] == 3.0
+    assert report["tokens_per_sec"] == round(4000 / 3.0, 1)
+    assert report["items"] == 2 and report["cost_per_item_usd"] == 1.125
+    assert list(report["by_client"]) == ["c2", "c1"], "sorted by cost"
+    assert report["by_client"]["c1"] == {"tokens": 2000, "cost_usd": 0.75}
+    assert report["by_model"]["text-embedding-3-small"]["tokens"] == 500
+
+    empty = build_report([], [])
+    assert empty["tokens_per_sec"] == 0.0 and empty["cost_per_item_usd"] == 0.0
+    print("  ✓ Report aggregated")
+
+
+def run_all_tests():
+    """Run all test suites"""
+    print("=" * 60)
+    print("Running Token Usage Tests")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_estimate_cost,
+        test_accumulate_and_drain,
+        test_hourly_increment_of_existing_row,
+        test_failed_flush_keeps_usage_and_retries,
+        test_build_report,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"  ✗ Test failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"  ✗ Test error: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
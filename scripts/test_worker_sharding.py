@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for Worker Sharding
+==========================
+
+Covers shard parsing, ownership and rebalancing in workers/sharding.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add workers directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "workers"))
+
+from sharding import Shard, moved_clients
+
+
+CLIENT_IDS = [f"client-{i}" for i in range(2000)]
+
+
+def test_shard_parsing():
+    """Test i/N parsing and validation"""
+    print("Testing shard parsing...")
+
+    assert Shard.parse("2/4") == Shard(2, 4), "Failed to parse 2/4"
+    for bad in ("4/4", "-1/2", "1", "a/b", "0/0"):
+        try:
+            Shard.parse(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"Expected ValueError for '{bad}'")
+
+    print("  ✓ Shard parsing tests passed")
+
+
+def test_every_client_has_exactly_one_owner():
+    """Test that shards partition the client space"""
+    print("Testing shard ownership...")
+
+    shards = [Shard(i, 4) for i in range(4)]
+    for client_id in CLIENT_IDS:
+        owners = [s for s in shards if s.owns(client_id)]
+        assert len(owners) == 1, f"{client_id} has {len(owners)} owners"
+
+    counts = [sum(s.owns(c) for c in CLIENT_IDS) for s in shards]
+    assert min(counts) > len(CLIENT_IDS) / 4 * 0.8, f"Unbalanced shards: {counts}"
+    assert all(Shard().owns(c) for c in CLIENT_IDS[:10]), "Single shard should own everything"
+
+    print("  ✓ Shard ownership tests passed")
+
+
+def test_rebalance_moves_minimal_clients():
+    """Test that growing N only moves clients onto the new shard"""
+    print("Testing rebalancing...")
+
+    moved = moved_clients(CLIENT_IDS, 4, 5)
+    assert len(moved) < len(CLIENT_IDS) * 0.3, f"Too many clients moved: {len(moved)}"
+    assert all(Shard(4, 5).owns(c) for c in moved), "Moved clients should land on the new shard"
+
+    print("  ✓ Rebalancing tests passed")
+
+
+def run_all_tests():
+    """Run all test suites"""
+    print("=" * 60)
+    print("Running Worker Sharding Tests")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_shard_parsing,
+        test_every_client_has_exactly_one_owner,
+        test_rebalance_moves_minimal_clients,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"  ✗ Test failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"  ✗ Test error: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Tests for the Workers' Pooled API Clients
+==========================================
+
+Covers pool sizing, retries, keep-alive reuse and timeouts of the Supabase
+client built by workers/transport.py, using a local PostgREST stand-in, and
+that the workers share the daily runner's HTTP settings
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add workers directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "workers"))
+
+import httpx
+
+import transport
+from lib import transport as lib_transport
+
+SERVICE_KEY = "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoic2VydmljZV9yb2xlIn0.signature"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    peers = set()
+    paths = []
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with _Handler.lock:
+            _Handler.peers.add(self.client_address)
+            _Handler.paths.append(self.path)
+        if self.path.startswith("/rest/v1/slow"):
+            time.sleep(1.0)
+        body = json.dumps([{"id": "a"}]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_supabase_pool_settings():
+    """Test HTTP_POOL_SIZE and HTTP_RETRIES reach the Supabase HTTP client"""
+    print("Testing Supabase pool settings...")
+    os.environ.update({"HTTP_POOL_SIZE": "3", "HTTP_RETRIES": "2"})
+    try:
+        client = transport.supabase_client("http://127.0.0.1:9", SERVICE_KEY)
+    finally:
+        del os.environ["HTTP_POOL_SIZE"], os.environ["HTTP_RETRIES"]
+    http_client = client.options.httpx_client
+    assert http_client is not None, "PostgREST would build its own unpooled client"
+    pool = http_client._transport._pool
+    assert (pool._max_connections, pool._max_keepalive_connections, pool._retries) == (3, 3, 2)
+    assert client.postgrest.session is http_client
+    print("  ✓ Pool size and retries configured")
+
+
+def test_settings_shared_with_daily_runner():
+    """Test the workers use scripts/lib/transport.py rather than a copy"""
+    print("Testing shared HTTP settings...")
+    for name in ("pool_size", "timeouts", "retries", "openai_client"):
+        assert getattr(transport, name) is getattr(lib_transport, name), f"{name} is a copy"
+    print("  ✓ Settings shared")
+
+
+def test_supabase_keep_alive():
+    """Test PostgREST requests share one pooled keep-alive connection"""
+    print("Testing Supabase keep-alive...")
+    server = _serve()
+    _Handler.peers.clear()
+    _Handler.paths.clear()
+    try:
+        client = transport.supabase_client(f"http://127.0.0.1:{server.server_port}", SERVICE_KEY)
+        for _ in range(5):
+            data = client.table("knowledge_items").select("id").eq("client_id", "c1").limit(1).execute().data
+            assert data == [{"id": "a"}]
+        assert len(_Handler.paths) == 5 and _Handler.paths[0].startswith("/rest/v1/knowledge_items?")
+        assert len(_Handler.peers) == 1, f"expected one connection, got {len(_Handler.peers)}"
+    finally:
+        server.shutdown()
+    print("  ✓ Connection reused")
+
+
+def test_supabase_timeouts():
+    """Test HTTP_READ_TIMEOUT applies instead of the SDK's 2 minute default"""
+    print("Testing Supabase timeouts...")
+    server = _serve()
+    os.environ["HTTP_READ_TIMEOUT"] = "0.2"
+    try:
+        client = transport.supabase_client(f"http://127.0.0.1:{server.server_port}", SERVICE_KEY)
+        started = time.monotonic()
+        try:
+            client.table("slow").select("*").execute()
+            raise AssertionError("slow request did not time out")
+        except httpx.ReadTimeout:
+            pass
+        assert time.monotonic() - started < 0.9
+    finally:
+        del os.environ["HTTP_READ_TIMEOUT"]
+        server.shutdown()
+    print("  ✓ Read timeout applied")
+
+
+def run_all_tests():
+    """Run all test suites"""
+    print("=" * 60)
+    print("Running Worker Transport Tests")
+    print("=" * 60)
+    print()
+
+    tests = [
+        test_supabase_pool_settings,
+        test_settings_shared_with_daily_runner,
+        test_supabase_keep_alive,
+        test_supabase_timeouts,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"  ✗ Test failed: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"  ✗ Test error: {e}")
+            failed += 1
+
+    print()
+    print("=" * 60)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 60)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
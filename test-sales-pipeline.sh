@@ -56,7 +56,8 @@ echo ""
 
 # Test 5: Verify audit log created
 echo "Test 5: Checking audit log..."
-if ls output/sales_audit_*.json 1> /dev/null 2>&1; then
+if ls output/audit/sales/segment-*.jsonl* 1> /dev/null 2>&1 && \
+   python3 scripts/lib/audit_store.py read output/audit/sales --type sales_pull | grep -q .; then
     echo "✅ Audit log created"
 else
     echo "❌ Audit log not found"
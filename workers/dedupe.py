@@ -0,0 +1,72 @@
+"""
+Exact-duplicate detection for knowledge items.
+
+The same document often arrives through several ingest paths (forwarded
+emails, re-uploaded files). Each item's ``raw_text`` is normalized and hashed
+into a content fingerprint stored as ``metadata.content_hash``; before chunking,
+the workers look up an already-processed item of the same client with the same
+fingerprint and, if found, mark the new item as a duplicate of it instead of
+re-chunking, re-embedding and re-summarizing.
+
+The lookup is served by the expression index in
+docs/knowledge_items_content_hash.sql.
+"""
+
+import hashlib
+import logging
+import re
+import unicodedata
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text so formatting-only differences hash identically."""
+    text = unicodedata.normalize("NFKC", text or "")
+    return _WHITESPACE_RE.sub(" ", text).strip().casefold()
+
+
+def content_fingerprint(text: str) -> str:
+    """SHA-256 hex digest of the normalized text."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def find_duplicate(
+    supabase: Any,
+    client_id: str,
+    fingerprint: str,
+    exclude_id: str,
+) -> Optional[str]:
+    """
+    Find an already-processed item of the same client with the same content.
+
+    Args:
+        supabase: Supabase client
+        client_id: Client the new item belongs to
+        fingerprint: Content fingerprint of the new item
+        exclude_id: ID of the new item itself
+
+    Returns:
+        ID of the original item, or None if the content is new
+    """
+    try:
+        rows = (
+            supabase.table("knowledge_items")
+            .select("id")
+            .eq("client_id", client_id)
+            .eq("metadata->>content_hash", fingerprint)
+            .eq("metadata->>processed", "true")
+            .neq("id", exclude_id)
+            .limit(1)
+            .execute()
+            .data
+        )
+    except Exception as e:
+        # Never block processing on the duplicate check
+        logger.warning("Duplicate lookup failed, processing item normally: %s", e)
+        return None
+
+    return rows[0]["id"] if rows else None
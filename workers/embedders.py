@@ -0,0 +1,179 @@
+"""
+Pluggable embedding backends for the Nexus workers.
+
+Two backends are available:
+
+- ``openai``: the hosted OpenAI embeddings API (default).
+- ``local``: a CPU-only hashing-vectorizer + random-projection embedder in
+  NumPy. It needs no network access or API key, so the chunk → embed → store
+  path can run offline, in tests, and under load benchmarks.
+
+The backend is selected with ``EMBEDDING_BACKEND`` (``openai`` or ``local``).
+``EMBEDDING_MODEL`` overrides the OpenAI model. Local vectors have the width
+of the configured OpenAI model (1536 for ``text-embedding-3-small``, 3072 for
+``text-embedding-3-large``), so they fit the same pgvector column;
+``EMBEDDING_DIM`` overrides it.
+"""
+
+import abc
+import hashlib
+import os
+import re
+from typing import Any, List, Optional
+
+DEFAULT_OPENAI_MODEL = "text-embedding-3-small"
+DEFAULT_LOCAL_DIM = 1536
+OPENAI_MODEL_DIMENSIONS = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536,
+}
+LOCAL_MODEL_NAME = "local-hashing"
+
+# Size of the hashed feature space before projection. Large enough that
+# collisions between distinct tokens are rare for note-sized texts.
+_HASH_FEATURES = 1 << 18
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class Embedder(abc.ABC):
+    """Base interface for embedding backends."""
+
+    model: str = ""
+    dimensions: int = 0
+
+    def embed(self, text: str) -> List[float]:
+        """Embed a single text."""
+        return self.embed_batch([text])[0]
+
+    @abc.abstractmethod
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed several texts, preserving input order."""
+
+
+class OpenAIEmbedder(Embedder):
+    """Embeddings from the OpenAI API."""
+
+    # The embeddings endpoint accepts at most 2048 inputs per request.
+    max_batch_size = 2048
+
+    def __init__(self, client: Any, model: str = DEFAULT_OPENAI_MODEL) -> None:
+        self._client = client
+        self.model = model
+        self.dimensions = OPENAI_MODEL_DIMENSIONS.get(model, DEFAULT_LOCAL_DIM)
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        vectors: List[List[float]] = []
+        for start in range(0, len(texts), self.max_batch_size):
+            batch = texts[start:start + self.max_batch_size]
+            resp = self._client.embeddings.create(model=self.model, input=batch)
+            # The API returns one item per input with an explicit index.
+            vectors.extend(d.embedding for d in sorted(resp.data, key=lambda d: d.index))
+        return vectors
+
+
+class HashingEmbedder(Embedder):
+    """
+    Deterministic local embedder: hashed unigram/bigram counts projected to a
+    fixed dimensionality with a sparse random (Achlioptas) projection.
+
+    The projection for each hashed feature is derived from the feature index
+    and ``seed`` with an integer mixer, so vectors are stable across processes
+    and machines without materialising a dense projection matrix.
+    """
+
+    def __init__(self, dimensions: int = DEFAULT_LOCAL_DIM, seed: int = 0) -> None:
+        try:
+            import numpy as np
+        except ImportError:
+            raise RuntimeError("NumPy package not installed. Run: pip install numpy")
+
+        self._np = np
+        self.model = LOCAL_MODEL_NAME
+        self.dimensions = dimensions
+        self._seed = seed
+        self._nonzero = max(1, min(dimensions, 8))
+
+    def _features(self, text: str) -> dict:
+        tokens = [t.lower() for t in _TOKEN_RE.findall(text)]
+        grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        counts: dict = {}
+        for gram in grams:
+            digest = hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            index = value % _HASH_FEATURES
+            sign = 1.0 if (value >> 63) & 1 else -1.0
+            counts[index] = counts.get(index, 0.0) + sign
+        return counts
+
+    def _projection(self, features: Any) -> Any:
+        """Return (columns, signs) of shape (len(features), nonzero)."""
+        np = self._np
+        offsets = np.arange(self._nonzero, dtype=np.uint64)
+        keys = (features[:, None] * np.uint64(self._nonzero) + offsets) ^ np.uint64(self._seed)
+        # splitmix64 finaliser: cheap, well-mixed and fully vectorised.
+        z = keys + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z = z ^ (z >> np.uint64(31))
+        columns = (z % np.uint64(self.dimensions)).astype(np.intp)
+        signs = np.where((z >> np.uint64(63)) == 1, 1.0, -1.0).astype(np.float32)
+        return columns, signs
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        np = self._np
+        out = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            counts = self._features(text)
+            if not counts:
+                continue
+            features = np.fromiter(counts.keys(), dtype=np.uint64, count=len(counts))
+            weights = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+            # Sublinear term frequency keeps long notes from being
+            # dominated by a handful of repeated words.
+            scaled = np.sign(weights) * np.log1p(np.abs(weights))
+            columns, signs = self._projection(features)
+            np.add.at(out[row], columns.ravel(), (signs * scaled[:, None]).ravel())
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (out / norms).tolist()
+
+
+def create_embedder(
+    openai_client: Optional[Any] = None,
+    backend: Optional[str] = None,
+    model: Optional[str] = None,
+) -> Embedder:
+    """
+    Create the embedder selected by configuration.
+
+    Args:
+        openai_client: OpenAI client, required for the ``openai`` backend
+        backend: ``openai`` or ``local`` (defaults to ``EMBEDDING_BACKEND``)
+        model: OpenAI embedding model (defaults to ``EMBEDDING_MODEL``); with
+            the ``local`` backend it sets the vector width
+
+    Returns:
+        Configured Embedder instance
+
+    Raises:
+        RuntimeError: If the backend is unknown or misconfigured
+    """
+    backend = (backend or os.getenv("EMBEDDING_BACKEND") or "openai").strip().lower()
+    model = model or os.getenv("EMBEDDING_MODEL") or DEFAULT_OPENAI_MODEL
+
+    if backend == "local":
+        # Match the store's vector column, which is sized for the OpenAI model
+        default_dim = OPENAI_MODEL_DIMENSIONS.get(model, DEFAULT_LOCAL_DIM)
+        dimensions = int(os.getenv("EMBEDDING_DIM", str(default_dim)))
+        return HashingEmbedder(dimensions=dimensions)
+
+    if backend == "openai":
+        if openai_client is None:
+            raise RuntimeError(
+                "OpenAI embedding backend requires OPENAI_API_KEY. "
+                "Set EMBEDDING_BACKEND=local to embed offline."
+            )
+        return OpenAIEmbedder(openai_client, model=model)
+
+    raise RuntimeError(f"Unknown EMBEDDING_BACKEND '{backend}' (expected 'openai' or 'local')")
@@ -13,14 +13,17 @@ from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 
+try:
+    from .logging_setup import setup_logging
+except ImportError:
+    from logging_setup import setup_logging
+
 # ---------------------------------------
 # LOGGING CONFIGURATION
 # ---------------------------------------
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Records are written by a background thread; LOG_FORMAT=json for JSON lines
+setup_logging()
 logger = logging.getLogger(__name__)
 
 # Load environment variables
@@ -43,7 +46,7 @@ def load_credentials_from_supabase():
             token_data = json.loads(response.data["value"])
             return Credentials(**token_data)
     except Exception as e:
-        logger.debug(f"No existing credentials found: {e}")
+        logger.debug("No existing credentials found: %s", e)
     return None
 
 
@@ -85,7 +88,7 @@ def refresh_token_if_needed():
             logger.info("✅ Token refreshed successfully")
             return True
         except Exception as e:
-            logger.info(f"❌ Failed to refresh token: {e}")
+            logger.info("❌ Failed to refresh token: %s", e)
             return False
     else:
         logger.info("✅ Token is valid")
@@ -115,7 +118,7 @@ def run_initial_oauth_flow():
 def main():
     """Main worker function"""
     logger.info("🔐 Google Calendar Token Loader")
-    logger.info(f"⏰ Running at: {datetime.utcnow().isoformat()}")
+    logger.info("⏰ Running at: %s", datetime.utcnow().isoformat())
     
     # Try to refresh existing token
     if not refresh_token_if_needed():
@@ -1,18 +1,34 @@
 import os
+import time
 import logging
+import argparse
 import tiktoken
-from openai import OpenAI
-from supabase import create_client, Client
+from supabase import Client
 from dotenv import load_dotenv
 
+try:
+    from .dedupe import content_fingerprint, find_duplicate
+    from .embedders import create_embedder
+    from .logging_setup import setup_logging
+    from .sharding import Shard
+    from .summary_gate import SummaryGate
+    from .transport import openai_client, supabase_client
+    from .usage import UsageAccumulator
+except ImportError:
+    from dedupe import content_fingerprint, find_duplicate
+    from embedders import create_embedder
+    from logging_setup import setup_logging
+    from sharding import Shard
+    from summary_gate import SummaryGate
+    from transport import openai_client, supabase_client
+    from usage import UsageAccumulator
+
 # ---------------------------------------
 # LOGGING CONFIGURATION
 # ---------------------------------------
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Records are written by a background thread; LOG_FORMAT=json for JSON lines
+setup_logging()
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------
@@ -23,10 +39,25 @@ load_dotenv()
 
 SUPABASE_URL = os.getenv("SUPABASE_URL") or os.getenv("NEXT_PUBLIC_SUPABASE_URL")
 SUPABASE_SERVICE_ROLE_KEY = os.environ["SUPABASE_SERVICE_ROLE_KEY"]
-OPENAI_API_KEY = os.environ["OPENAI_API_KEY"]
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
+# One pooled client each, reused for every item (see transport.py)
+supabase: Client = supabase_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+client = openai_client(OPENAI_API_KEY) if OPENAI_API_KEY else None
+if client is None:
+    logger.warning("OPENAI_API_KEY not set: items are chunked and embedded, client summaries are skipped")
+
+# EMBEDDING_BACKEND=local embeds on CPU without network access or API key.
+embedder = create_embedder(
+    client,
+    model=os.getenv("EMBEDDING_MODEL", "text-embedding-3-small"),
+)
+
+# Skips summary regeneration for semantically negligible additions
+summary_gate = SummaryGate(supabase)
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
-client = OpenAI(api_key=OPENAI_API_KEY)
+# Token usage is accumulated in-process and flushed as rollups per item
+usage = UsageAccumulator()
 
 
 # ---------------------------------------
@@ -54,19 +85,16 @@ def chunk_text(text, max_tokens=350):
 
 
 def embed_text(text):
-    resp = client.embeddings.create(
-        model="text-embedding-3-small",  # 1536 dimensions
-        input=text
-    )
-    return resp.data[0].embedding
+    return embedder.embed(text)
 
 
-def generate_summary(client_id: str):
+def generate_summary(client_id: str, item_id=None):
     """
     Generate an AI-powered summary for all knowledge chunks of a client.
     
     Args:
         client_id: The client UUID to generate summary for
+        item_id: Item that triggered the summary, for usage attribution
         
     Returns:
         Dict with structured summary fields
@@ -82,7 +110,7 @@ def generate_summary(client_id: str):
 
     corpus = "\n\n".join(c["content"] for c in chunks)
 
-    logger.info(f"Generating summary for client {client_id} using {len(chunks)} chunks")
+    logger.info("Generating summary for client %s using %s chunks", client_id, len(chunks))
 
     prompt = f"""
     You are the Nexus Intelligence Engine. Summarize all information about this client.
@@ -104,16 +132,56 @@ def generate_summary(client_id: str):
     Output in JSON format.
     """
 
+    if client is None:
+        raise RuntimeError("OPENAI_API_KEY is required to generate client summaries")
+
+    started = time.monotonic()
     resp = client.chat.completions.create(
         model="gpt-4o-mini",
         messages=[{"role": "user", "content": prompt}],
         response_format={"type": "json_object"}
     )
+    if resp.usage is not None:
+        usage.record(
+            client_id=client_id,
+            item_id=item_id,
+            model=resp.model or "gpt-4o-mini",
+            tokens_in=resp.usage.prompt_tokens,
+            tokens_out=resp.usage.completion_tokens,
+            elapsed_sec=time.monotonic() - started,
+        )
 
     import json
     return json.loads(resp.choices[0].message.content)
 
 
+def update_client_summary(client_id: str, item_id=None):
+    """Regenerate a client's summary and record it in the version history."""
+    logger.info("Generating summary for client %s", client_id)
+    summary = generate_summary(client_id, item_id)
+
+    supabase.table("client_summaries").upsert({
+        "client_id": client_id,
+        "short_summary": summary.get("Short Summary"),
+        "long_summary": summary.get("Long Summary"),
+        "key_insights": "\n".join(summary.get("Key Insights", [])),
+        "next_actions": "\n".join(summary.get("Next Actions", [])),
+        "risks": "\n".join(summary.get("Risks", [])),
+        "opportunities": "\n".join(summary.get("Opportunities", [])),
+        "sentiment": summary.get("Sentiment"),
+        "priority_score": summary.get("Priority Score"),
+    }).execute()
+
+    # Save snapshot to version history
+    supabase.table("summary_versions").insert({
+        "client_id": client_id,
+        "summary_snapshot": summary
+    }).execute()
+
+    summary_gate.mark_summarized(client_id)
+    logger.info("Summary updated for client %s", client_id)
+
+
 # ---------------------------------------
 # PROCESSING PIPELINE
 # ---------------------------------------
@@ -123,16 +191,43 @@ def process_item(item):
     client_id = item["client_id"]
     raw_text = item["raw_text"]
 
-    logger.info(f"Processing item: {item_id}")
+    logger.info("Processing item: %s", item_id)
+
+    # 0. EXACT-DUPLICATE CHECK
+    fingerprint = content_fingerprint(raw_text)
+    original_id = find_duplicate(supabase, client_id, fingerprint, item_id)
+    if original_id:
+        supabase.table("knowledge_items").update({
+            "metadata": {
+                **item.get("metadata", {}),
+                "processed": True,
+                "content_hash": fingerprint,
+                "duplicate_of": original_id,
+            }
+        }).eq("id", item_id).execute()
+        logger.info("Item %s duplicates %s; skipping processing", item_id, original_id)
+        return
 
     # 1. CHUNKING
     chunks = chunk_text(raw_text)
-    logger.info(f"{len(chunks)} chunks generated")
-
-    for idx, chunk in enumerate(chunks):
+    logger.info("%s chunks generated", len(chunks))
+
+    token_counts = [count_tokens(chunk) for chunk in chunks]
+    item_tokens = sum(token_counts)
+
+    # Embed every chunk of the item in one request instead of one per chunk
+    started = time.monotonic()
+    embeddings = embedder.embed_batch(chunks)
+    if chunks:
+        usage.record(
+            client_id=client_id,
+            item_id=item_id,
+            model=embedder.model,
+            tokens_in=item_tokens,
+            elapsed_sec=time.monotonic() - started,
+        )
 
-        # Count tokens
-        tokens = count_tokens(chunk)
+    for idx, (chunk, embedding, tokens) in enumerate(zip(chunks, embeddings, token_counts)):
 
         # 2. INSERT CHUNK
         chunk_row = (
@@ -148,11 +243,9 @@ def process_item(item):
         ).data[0]
 
         chunk_id = chunk_row["id"]
-        logger.debug(f"Chunk {idx} saved ({tokens} tokens)")
+        logger.debug("Chunk %s saved (%s tokens)", idx, tokens)
 
         # 3. EMBEDDINGS → pgvector table
-        embedding = embed_text(chunk)
-
         (
             supabase.table("knowledge_embeddings")
             .insert({
@@ -162,77 +255,96 @@ def process_item(item):
             })
             .execute()
         )
-        logger.debug(f"Embedding stored for chunk {idx}")
-
-        # 4. TOKEN LOGGING (optional - table may not exist)
-        # (
-        #     supabase.table("token_usage")
-        #     .insert({
-        #         "client_id": client_id,
-        #         "item_id": item_id,
-        #         "chunk_id": chunk_id,
-        #         "tokens_in": tokens,
-        #         "tokens_out": 0,
-        #         "model": "text-embedding-3-small"
-        #     })
-        #     .execute()
-        # )
-
-    # 5. MARK AS PROCESSED
+        logger.debug("Embedding stored for chunk %s", idx)
+
+    # 4. MARK AS PROCESSED
     supabase.table("knowledge_items").update({
         "metadata": {
             **item.get("metadata", {}),
-            "processed": True
+            "processed": True,
+            "content_hash": fingerprint,
         }
     }).eq("id", item_id).execute()
 
-    # 6. GENERATE AND SAVE SUMMARY
-    logger.info(f"Generating summary for client {client_id}")
-    summary = generate_summary(client_id)
+    # 5. GENERATE AND SAVE SUMMARY (unless the new content is negligible)
+    if client is None:
+        # Embedding-only mode (EMBEDDING_BACKEND=local without OPENAI_API_KEY)
+        logger.info("Skipping summary for client %s: no OpenAI client configured", client_id)
+    else:
+        decision = summary_gate.evaluate(client_id, embeddings, item_tokens)
+        if decision.regenerate:
+            logger.info("Regenerating summary for client %s: %s", client_id, decision.reason)
+            update_client_summary(client_id, item_id)
+        else:
+            logger.info("Skipping summary for client %s: %s", client_id, decision.reason)
 
-    supabase.table("client_summaries").upsert({
-        "client_id": client_id,
-        "short_summary": summary.get("Short Summary"),
-        "long_summary": summary.get("Long Summary"),
-        "key_insights": "\n".join(summary.get("Key Insights", [])),
-        "next_actions": "\n".join(summary.get("Next Actions", [])),
-        "risks": "\n".join(summary.get("Risks", [])),
-        "opportunities": "\n".join(summary.get("Opportunities", [])),
-        "sentiment": summary.get("Sentiment"),
-        "priority_score": summary.get("Priority Score"),
-    }).execute()
+    # 6. FLUSH TOKEN USAGE ROLLUPS
+    usage.flush(supabase)
 
-    # Save snapshot to version history
-    supabase.table("summary_versions").insert({
-        "client_id": client_id,
-        "summary_snapshot": summary
-    }).execute()
-
-    logger.info(f"Summary updated for client {client_id}")
-    logger.info(f"Finished processing item: {item_id}")
+    logger.info("Finished processing item: %s", item_id)
 
 
 # ---------------------------------------
 # MAIN LOOP
 # ---------------------------------------
 
-def main():
-    logger.info("Nexus Ingest Worker Starting...")
-
-    # Pull unprocessed items
-    items = (
+def fetch_owned_items(shard: Shard, batch_size: int = 200):
+    """Fetch unprocessed items whose client hashes to this replica's shard."""
+    # Only ids and client ids are fetched for the whole queue; full rows
+    # (including raw_text) are pulled for the owned slice only.
+    queue = (
         supabase.table("knowledge_items")
-        .select("*")
+        .select("id, client_id")
         .or_("metadata->>processed.eq.false,metadata->>processed.is.null")
+        .order("created_at")
         .execute()
         .data
     )
+    owned_ids = [row["id"] for row in queue if shard.owns(row["client_id"])]
+    logger.info("Shard %s owns %s of %s queued items", shard, len(owned_ids), len(queue))
+
+    items = []
+    for start in range(0, len(owned_ids), batch_size):
+        batch = owned_ids[start:start + batch_size]
+        rows = supabase.table("knowledge_items").select("*").in_("id", batch).execute().data
+        by_id = {row["id"]: row for row in rows}
+        # Keep created_at order so each client's items are processed in sequence
+        items.extend(by_id[i] for i in batch if i in by_id)
+    return items
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Nexus Ingest Worker")
+    parser.add_argument(
+        "--shard",
+        default=os.getenv("WORKER_SHARD", "0/1"),
+        help="Process only clients hashing to shard i of N (format i/N, default 0/1)",
+    )
+    args = parser.parse_args(argv)
+    try:
+        shard = Shard.parse(args.shard)
+    except ValueError as e:
+        parser.error(str(e))
 
-    logger.info(f"Found {len(items)} items needing processing")
+    logger.info("Nexus Ingest Worker Starting (shard %s)...", shard)
+
+    # Pull unprocessed items owned by this shard
+    items = fetch_owned_items(shard)
+
+    logger.info("Found %s items needing processing", len(items))
 
     for item in items:
         process_item(item)
 
+    # Refresh summaries whose deferred content has exceeded max staleness
+    for client_id in summary_gate.stale_clients() if client is not None else []:
+        if not shard.owns(client_id):
+            continue
+        logger.info("Refreshing stale summary for client %s", client_id)
+        update_client_summary(client_id)
+
+    if not usage.flush(supabase, force=True):
+        logger.error("Token usage of this run could not be written")
     logger.info("Worker complete")
 
 
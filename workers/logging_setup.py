@@ -0,0 +1,27 @@
+"""
+Non-blocking logging for the Nexus workers.
+
+The worker hot loop only enqueues log records; a background thread formats
+and writes them, so log I/O no longer runs between Supabase and OpenAI
+calls. This is the daily runner's ``scripts/lib/logging_setup.py`` (same
+``LOG_LEVEL`` and ``LOG_FORMAT`` variables) with the workers' text format.
+Messages use lazy ``%``-formatting, so disabled levels cost a single level
+check.
+"""
+
+try:
+    from . import shared  # noqa: F401  (makes scripts/lib importable)
+except ImportError:
+    import shared  # noqa: F401
+
+from lib.logging_setup import JsonFormatter, stop_logging
+from lib.logging_setup import setup_logging as _setup_logging
+
+__all__ = ["JsonFormatter", "TEXT_FORMAT", "setup_logging", "stop_logging"]
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+def setup_logging(text_format=TEXT_FORMAT, stream=None):
+    """Route the root logger through a queue to a background writer."""
+    return _setup_logging(text_format, stream=stream)
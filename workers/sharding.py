@@ -0,0 +1,79 @@
+"""
+Client-sharded partitioning for worker replicas.
+
+Each replica started with ``--shard i/N`` (or ``WORKER_SHARD=i/N``) only claims
+knowledge items whose ``client_id`` hashes to shard ``i``. Because every item
+of a client lands on the same replica, per-client processing order is kept and
+replicas never contend on the same ``client_summaries`` row.
+
+Clients are assigned with jump consistent hashing (Lamping & Veach, 2014).
+Ownership is computed on every run rather than stored, so changing ``N`` is a
+rebalance by itself: growing from N to N+1 shards moves only ~1/(N+1) of the
+clients, all of them onto the new shard, and unprocessed items of a moved
+client are simply picked up by its new owner on the next run.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from typing import Iterable, List
+
+
+def client_key(client_id: str) -> int:
+    """Stable 64-bit key for a client id."""
+    digest = hashlib.sha256(str(client_id).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def jump_consistent_hash(key: int, num_buckets: int) -> int:
+    """Map a 64-bit key to a bucket in [0, num_buckets)."""
+    if num_buckets < 1:
+        raise ValueError("num_buckets must be >= 1")
+    b, j = -1, 0
+    while j < num_buckets:
+        b = j
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        j = int((b + 1) * (float(1 << 31) / float((key >> 33) + 1)))
+    return b
+
+
+@dataclass(frozen=True)
+class Shard:
+    """One replica's slice of the client space."""
+
+    index: int = 0
+    count: int = 1
+
+    @classmethod
+    def parse(cls, spec: str) -> "Shard":
+        """
+        Parse an ``i/N`` shard spec.
+
+        Raises:
+            ValueError: If the spec is malformed or out of range
+        """
+        try:
+            index_str, count_str = spec.split("/", 1)
+            index, count = int(index_str), int(count_str)
+        except ValueError:
+            raise ValueError(f"Invalid shard '{spec}' (expected i/N, e.g. 0/4)")
+        if count < 1 or not 0 <= index < count:
+            raise ValueError(f"Invalid shard '{spec}' (need 0 <= i < N)")
+        return cls(index, count)
+
+    def owner_of(self, client_id: str) -> int:
+        return jump_consistent_hash(client_key(client_id), self.count)
+
+    def owns(self, client_id: str) -> bool:
+        return self.count == 1 or self.owner_of(client_id) == self.index
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+
+def moved_clients(client_ids: Iterable[str], old_count: int, new_count: int) -> List[str]:
+    """Clients whose owning shard changes when resizing from old_count to new_count."""
+    return [
+        c for c in client_ids
+        if jump_consistent_hash(client_key(c), old_count)
+        != jump_consistent_hash(client_key(c), new_count)
+    ]
@@ -0,0 +1,16 @@
+"""
+Access to the daily runner's shared library.
+
+Importing this module puts ``scripts/`` on ``sys.path`` so the workers can
+use ``scripts/lib`` (logging, HTTP settings) instead of keeping copies of it
+that drift apart. Both trees live in the same checkout and are deployed
+together.
+"""
+
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
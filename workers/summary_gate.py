@@ -0,0 +1,263 @@
+"""
+Change-significance gate for client summary regeneration.
+
+Regenerating a client summary costs an LLM call over the client's whole corpus
+plus two table writes. Most incremental items ("thanks!", calendar noise) do
+not change the summary, so the gate compares each item's new chunks against
+the client's embedding centroid and counts the new tokens before allowing a
+regeneration.
+
+A regeneration happens when any of these hold:
+
+- the client has no gate state yet (first summary)
+- tokens added since the last summary >= ``SUMMARY_MIN_NEW_TOKENS``
+- a new chunk is far from the centroid (cosine distance >=
+  ``SUMMARY_NOVELTY_THRESHOLD``) and the item adds at least
+  ``SUMMARY_MIN_NOVEL_TOKENS`` tokens
+- content has been deferred for longer than ``SUMMARY_MAX_STALENESS_HOURS``
+
+Otherwise the item's tokens are added to the client's pending count and the
+regeneration is deferred. ``stale_clients()`` lists clients whose deferred
+content has exceeded the staleness limit so the worker can refresh them.
+
+State lives in the ``client_summary_state`` table
+(see docs/client_summary_state.sql). If the table does not exist the gate
+turns itself off and every item regenerates, matching the previous
+behaviour. Other errors (timeouts, transient PostgREST failures) fail open
+for the affected item only.
+"""
+
+import logging
+import math
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+STATE_TABLE = "client_summary_state"
+
+# Postgres "undefined_table" and PostgREST "table not in schema cache"
+_MISSING_TABLE_CODES = ("42P01", "PGRST205")
+
+
+@dataclass
+class GateConfig:
+    """Thresholds for the summary gate."""
+
+    min_new_tokens: int = 200
+    novelty_threshold: float = 0.5
+    min_novel_tokens: int = 30
+    max_staleness_hours: float = 24.0
+    enabled: bool = True
+
+    @classmethod
+    def from_env(cls) -> "GateConfig":
+        return cls(
+            min_new_tokens=int(os.getenv("SUMMARY_MIN_NEW_TOKENS", "200")),
+            novelty_threshold=float(os.getenv("SUMMARY_NOVELTY_THRESHOLD", "0.5")),
+            min_novel_tokens=int(os.getenv("SUMMARY_MIN_NOVEL_TOKENS", "30")),
+            max_staleness_hours=float(os.getenv("SUMMARY_MAX_STALENESS_HOURS", "24")),
+            enabled=os.getenv("SUMMARY_GATE", "on").lower() not in ("0", "off", "false"),
+        )
+
+
+@dataclass
+class GateDecision:
+    """Outcome of evaluating one item against the gate."""
+
+    regenerate: bool
+    reason: str
+    new_tokens: int
+    pending_tokens: int
+    novelty: float
+
+
+def cosine_similarity(a: List[float], b: List[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm_a = math.sqrt(sum(x * x for x in a))
+    norm_b = math.sqrt(sum(y * y for y in b))
+    if not norm_a or not norm_b:
+        return 0.0
+    return dot / (norm_a * norm_b)
+
+
+def max_novelty(embeddings: List[List[float]], centroid: Optional[List[float]]) -> float:
+    """Largest cosine distance between a new chunk and the client centroid."""
+    if not embeddings:
+        return 0.0
+    if not centroid:
+        return 1.0
+    return max(
+        1.0 - cosine_similarity(e, centroid) if len(e) == len(centroid) else 1.0
+        for e in embeddings
+    )
+
+
+def update_centroid(
+    centroid: Optional[List[float]],
+    count: int,
+    embeddings: List[List[float]],
+) -> List[float]:
+    """Running mean of all chunk embeddings seen for a client."""
+    if not embeddings:
+        return list(centroid or [])
+    dim = len(embeddings[0])
+    if not centroid or len(centroid) != dim:
+        # No usable centroid (first item, or the embedding backend changed)
+        centroid, count = [0.0] * dim, 0
+    total = count + len(embeddings)
+    sums = [c * count for c in centroid]
+    for e in embeddings:
+        for i, x in enumerate(e):
+            sums[i] += x
+    return [s / total for s in sums]
+
+
+def _is_missing_table(error: Exception) -> bool:
+    """True if ``error`` says the state table does not exist."""
+    if str(getattr(error, "code", "") or "") in _MISSING_TABLE_CODES:
+        return True
+    message = str(error).lower()
+    return STATE_TABLE in message and ("does not exist" in message or "schema cache" in message)
+
+
+def _parse_ts(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+class SummaryGate:
+    """Decides whether a client summary needs regenerating."""
+
+    def __init__(self, supabase: Any, config: Optional[GateConfig] = None) -> None:
+        self._supabase = supabase
+        self.config = config or GateConfig.from_env()
+        self._available = self.config.enabled
+
+    def _load_state(self, client_id: str) -> Optional[Dict[str, Any]]:
+        rows = (
+            self._supabase.table(STATE_TABLE)
+            .select("*")
+            .eq("client_id", client_id)
+            .limit(1)
+            .execute()
+            .data
+        )
+        return rows[0] if rows else None
+
+    def _save_state(self, row: Dict[str, Any]) -> None:
+        row["updated_at"] = datetime.now(timezone.utc).isoformat()
+        self._supabase.table(STATE_TABLE).upsert(row).execute()
+
+    def _handle_error(self, action: str, client_id: Optional[str], error: Exception) -> None:
+        """Turn the gate off if the table is missing; otherwise only log."""
+        if _is_missing_table(error):
+            logger.warning("Summary gate disabled (%s missing): %s", STATE_TABLE, error)
+            self._available = False
+        else:
+            logger.warning("Summary gate failed to %s for client %s: %s", action, client_id, error)
+
+    def evaluate(
+        self,
+        client_id: str,
+        embeddings: List[List[float]],
+        new_tokens: int,
+    ) -> GateDecision:
+        """
+        Evaluate an item's new chunks and record them in the client state.
+
+        Args:
+            client_id: Client the item belongs to
+            embeddings: Embeddings of the item's new chunks
+            new_tokens: Token count of the item's new chunks
+
+        Returns:
+            GateDecision; call ``mark_summarized()`` after regenerating
+        """
+        if not self._available:
+            return GateDecision(True, "gate disabled", new_tokens, new_tokens, 1.0)
+
+        try:
+            state = self._load_state(client_id)
+        except Exception as e:
+            self._handle_error("load state", client_id, e)
+            return GateDecision(True, "gate error", new_tokens, new_tokens, 1.0)
+
+        cfg = self.config
+        centroid = (state or {}).get("centroid")
+        count = int((state or {}).get("chunk_count") or 0)
+        pending = int((state or {}).get("pending_tokens") or 0) + new_tokens
+        novelty = max_novelty(embeddings, centroid)
+        last = _parse_ts((state or {}).get("last_summarized_at"))
+        age = datetime.now(timezone.utc) - last if last else None
+
+        if state is None or last is None:
+            reason = "first summary"
+        elif pending >= cfg.min_new_tokens:
+            reason = f"{pending} new tokens"
+        elif novelty >= cfg.novelty_threshold and new_tokens >= cfg.min_novel_tokens:
+            reason = f"novel content (distance {novelty:.2f})"
+        elif age is not None and age >= timedelta(hours=cfg.max_staleness_hours):
+            reason = f"stale ({age.total_seconds() / 3600:.1f}h since last summary)"
+        else:
+            reason = ""
+
+        try:
+            self._save_state({
+                "client_id": client_id,
+                "centroid": update_centroid(centroid, count, embeddings),
+                "chunk_count": count + len(embeddings),
+                "pending_tokens": pending,
+                "last_summarized_at": last.isoformat() if last else None,
+            })
+        except Exception as e:
+            self._handle_error("save state", client_id, e)
+            return GateDecision(True, "gate error", new_tokens, pending, novelty)
+
+        if reason:
+            return GateDecision(True, reason, new_tokens, pending, novelty)
+        return GateDecision(
+            False,
+            f"deferred ({pending} pending tokens, distance {novelty:.2f})",
+            new_tokens,
+            pending,
+            novelty,
+        )
+
+    def mark_summarized(self, client_id: str) -> None:
+        """Reset pending counters after a successful regeneration."""
+        if not self._available:
+            return
+        try:
+            self._supabase.table(STATE_TABLE).update({
+                "pending_tokens": 0,
+                "last_summarized_at": datetime.now(timezone.utc).isoformat(),
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+            }).eq("client_id", client_id).execute()
+        except Exception as e:
+            self._handle_error("reset pending tokens", client_id, e)
+
+    def stale_clients(self) -> List[str]:
+        """Clients with deferred content older than the staleness limit."""
+        if not self._available:
+            return []
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=self.config.max_staleness_hours)
+        try:
+            rows = (
+                self._supabase.table(STATE_TABLE)
+                .select("client_id")
+                .gt("pending_tokens", 0)
+                .lt("last_summarized_at", cutoff.isoformat())
+                .execute()
+                .data
+            )
+        except Exception as e:
+            self._handle_error("list stale clients", None, e)
+            return []
+        return [r["client_id"] for r in rows]
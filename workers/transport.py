@@ -0,0 +1,48 @@
+"""
+Pooled API clients for the Nexus workers.
+
+Each worker process makes one OpenAI client and one Supabase client and
+reuses them (and their keep-alive connections) for every item. Both are
+built with explicit pool sizes, connect/read timeouts and retries instead of
+the SDK defaults (a 2 minute timeout for Supabase, 10 minutes for OpenAI),
+so a stalled connection fails fast and is retried.
+
+The settings and the OpenAI client come from the daily runner's
+``scripts/lib/transport.py`` (see ``shared.py``), so both trees read the
+same environment variables with the same defaults:
+
+- ``HTTP_POOL_SIZE``: connections kept per client (default 10)
+- ``HTTP_CONNECT_TIMEOUT`` / ``HTTP_READ_TIMEOUT``: seconds (default 5 / 30)
+- ``HTTP_RETRIES``: OpenAI retries on connection errors, 429 and 5xx;
+  Supabase retries on failed connects only, since its requests include
+  non-idempotent writes (default 3)
+"""
+
+from typing import Any
+
+try:
+    from . import shared  # noqa: F401 (makes scripts/lib importable)
+except ImportError:
+    import shared  # noqa: F401
+
+from lib.transport import openai_client, pool_size, retries, timeouts
+
+__all__ = ["openai_client", "pool_size", "retries", "supabase_client", "timeouts"]
+
+
+def supabase_client(url: str, key: str) -> Any:
+    """A Supabase client with a sized keep-alive pool, timeouts and connect retries."""
+    import httpx
+    from supabase import ClientOptions, create_client
+
+    connect, read = timeouts()
+    size = pool_size()
+    http_client = httpx.Client(
+        timeout=httpx.Timeout(read, connect=connect),
+        transport=httpx.HTTPTransport(
+            limits=httpx.Limits(max_connections=size, max_keepalive_connections=size),
+            retries=retries(),
+        ),
+        follow_redirects=True,
+    )
+    return create_client(url, key, options=ClientOptions(httpx_client=http_client))
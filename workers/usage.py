@@ -0,0 +1,309 @@
+"""
+Token usage accumulation, rollups and cost reporting.
+
+The workers record embedding and chat-completion usage in-process with a
+``UsageAccumulator`` and flush batched rollups once per item instead of writing
+one ``token_usage`` row per chunk:
+
+- ``token_usage_item_rollups``: one row per (item, model)
+- ``token_usage_hourly_rollups``: one row per (client, hour, model)
+
+Hourly rows are incremented in the database by ``add_token_usage_hourly()``
+(an ``INSERT ... ON CONFLICT DO UPDATE`` that adds the deltas), so concurrent
+flushes for the same client and hour never overwrite each other's counts.
+
+A failed flush keeps its counters and is retried by a later flush, after a
+backoff that doubles per consecutive failure (5 s up to 5 min). Item rows
+are upserted with absolute totals, so retrying after a partial write does not
+double count; the hourly deltas are applied in one call, which either adds
+all of them or none.
+
+Reporting reads only the rollup tables:
+
+    python workers/usage.py report --since 2025-12-01 --until 2025-12-08
+    python workers/usage.py report --since 2025-12-01 --json
+
+Table and function definitions: docs/token_usage_rollups.sql
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ITEM_TABLE = "token_usage_item_rollups"
+HOURLY_TABLE = "token_usage_hourly_rollups"
+HOURLY_INCREMENT_FN = "add_token_usage_hourly"
+
+# USD per 1M tokens as (input, output). Unknown models are costed at zero.
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "text-embedding-3-small": (0.02, 0.0),
+    "text-embedding-3-large": (0.13, 0.0),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4-turbo-preview": (10.00, 30.00),
+    "local-hashing": (0.0, 0.0),
+}
+
+_COUNTERS = ("tokens_in", "tokens_out", "requests", "elapsed_sec", "cost_usd")
+
+FLUSH_BACKOFF_SEC = 5.0
+FLUSH_BACKOFF_MAX_SEC = 300.0
+
+
+def estimate_cost(model: str, tokens_in: int, tokens_out: int) -> float:
+    price_in, price_out = MODEL_PRICES.get(model, (0.0, 0.0))
+    return (tokens_in * price_in + tokens_out * price_out) / 1_000_000
+
+
+def _hour_bucket(ts: datetime) -> str:
+    return ts.replace(minute=0, second=0, microsecond=0).isoformat()
+
+
+def _empty_counters() -> Dict[str, float]:
+    return {name: 0 for name in _COUNTERS}
+
+
+class UsageAccumulator:
+    """In-process token usage totals, flushed as rollups."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._items: Dict[Tuple[str, str, str], Dict[str, float]] = defaultdict(_empty_counters)
+        self._hourly: Dict[Tuple[str, str, str], Dict[str, float]] = defaultdict(_empty_counters)
+        self._hourly_items: Dict[Tuple[str, str, str], set] = defaultdict(set)
+        self._failures = 0
+        self._retry_at = 0.0
+
+    def record(
+        self,
+        *,
+        client_id: str,
+        model: str,
+        tokens_in: int,
+        tokens_out: int = 0,
+        item_id: Optional[str] = None,
+        elapsed_sec: float = 0.0,
+        requests: int = 1,
+    ) -> None:
+        """Add one API call's usage to the pending rollups."""
+        cost = estimate_cost(model, tokens_in, tokens_out)
+        delta = {
+            "tokens_in": tokens_in,
+            "tokens_out": tokens_out,
+            "requests": requests,
+            "elapsed_sec": elapsed_sec,
+            "cost_usd": cost,
+        }
+        hour_key = (client_id, _hour_bucket(datetime.now(timezone.utc)), model)
+        with self._lock:
+            if item_id:
+                bucket = self._items[(item_id, client_id, model)]
+                for name, value in delta.items():
+                    bucket[name] += value
+                self._hourly_items[hour_key].add(item_id)
+            bucket = self._hourly[hour_key]
+            for name, value in delta.items():
+                bucket[name] += value
+
+    def _drain(self) -> Tuple[Dict, Dict, Dict]:
+        with self._lock:
+            drained = (self._items, self._hourly, self._hourly_items)
+            self._items = defaultdict(_empty_counters)
+            self._hourly = defaultdict(_empty_counters)
+            self._hourly_items = defaultdict(set)
+        return drained
+
+    def _restore(self, items: Dict, hourly: Dict, hourly_items: Dict) -> None:
+        """Merge counters from a failed flush back into the pending rollups."""
+        with self._lock:
+            for pending, failed in ((self._items, items), (self._hourly, hourly)):
+                for key, counters in failed.items():
+                    bucket = pending[key]
+                    for name, value in counters.items():
+                        bucket[name] += value
+            for key, ids in hourly_items.items():
+                self._hourly_items[key] |= ids
+
+    def flush(self, supabase: Any, force: bool = False) -> bool:
+        """
+        Write pending rollups. Failures are logged and never raised.
+
+        Args:
+            supabase: Supabase client
+            force: Ignore the backoff after a failure (e.g. before exiting)
+
+        Returns:
+            False if the write failed or is waiting out a backoff; the
+            counters stay pending for the next flush
+        """
+        if not force and time.monotonic() < self._retry_at:
+            return False
+        items, hourly, hourly_items = self._drain()
+        if not (items or hourly):
+            return True
+
+        now = datetime.now(timezone.utc).isoformat()
+        try:
+            if items:
+                supabase.table(ITEM_TABLE).upsert([
+                    {
+                        "item_id": item_id,
+                        "client_id": client_id,
+                        "model": model,
+                        "processed_at": now,
+                        **{k: round(v, 6) if k in ("elapsed_sec", "cost_usd") else int(v)
+                           for k, v in counters.items()},
+                    }
+                    for (item_id, client_id, model), counters in items.items()
+                ]).execute()
+
+            deltas: List[Dict[str, Any]] = []
+            for (client_id, hour, model), counters in hourly.items():
+                delta: Dict[str, Any] = {"client_id": client_id, "hour": hour, "model": model}
+                for name, value in counters.items():
+                    delta[name] = round(value, 6) if name in ("elapsed_sec", "cost_usd") else int(value)
+                delta["items"] = len(hourly_items.get((client_id, hour, model), ()))
+                deltas.append(delta)
+            if deltas:
+                supabase.rpc(HOURLY_INCREMENT_FN, {"deltas": deltas}).execute()
+        except Exception as e:
+            self._restore(items, hourly, hourly_items)
+            self._failures += 1
+            delay = min(FLUSH_BACKOFF_MAX_SEC, FLUSH_BACKOFF_SEC * 2 ** (self._failures - 1))
+            self._retry_at = time.monotonic() + delay
+            logger.warning("Token usage flush failed, retrying in %.0fs: %s", delay, e)
+            return False
+
+        self._failures = 0
+        self._retry_at = 0.0
+        return True
+
+
+# ---------------------------------------
+# REPORTING
+# ---------------------------------------
+
+def build_report(hourly_rows: List[Dict[str, Any]], item_rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate rollup rows into throughput and cost figures."""
+    totals = _empty_counters()
+    by_client: Dict[str, Dict[str, float]] = defaultdict(_empty_counters)
+    by_model: Dict[str, Dict[str, float]] = defaultdict(_empty_counters)
+
+    for row in hourly_rows:
+        for name in _COUNTERS:
+            value = float(row.get(name) or 0)
+            totals[name] += value
+            by_client[row["client_id"]][name] += value
+            by_model[row["model"]][name] += value
+
+    item_costs: Dict[str, float] = defaultdict(float)
+    for row in item_rows:
+        item_costs[row["item_id"]] += float(row.get("cost_usd") or 0)
+
+    tokens = totals["tokens_in"] + totals["tokens_out"]
+    return {
+        "tokens_in": int(totals["tokens_in"]),
+        "tokens_out": int(totals["tokens_out"]),
+        "requests": int(totals["requests"]),
+        "cost_usd": round(totals["cost_usd"], 6),
+        "api_seconds": round(totals["elapsed_sec"], 3),
+        "tokens_per_sec": round(tokens / totals["elapsed_sec"], 1) if totals["elapsed_sec"] else 0.0,
+        "items": len(item_costs),
+        "cost_per_item_usd": round(sum(item_costs.values()) / len(item_costs), 6) if item_costs else 0.0,
+        "by_client": {
+            client_id: {
+                "tokens": int(c["tokens_in"] + c["tokens_out"]),
+                "cost_usd": round(c["cost_usd"], 6),
+            }
+            for client_id, c in sorted(by_client.items(), key=lambda kv: -kv[1]["cost_usd"])
+        },
+        "by_model": {
+            model: {
+                "tokens": int(m["tokens_in"] + m["tokens_out"]),
+                "cost_usd": round(m["cost_usd"], 6),
+            }
+            for model, m in sorted(by_model.items())
+        },
+    }
+
+
+def fetch_report(supabase: Any, since: datetime, until: datetime) -> Dict[str, Any]:
+    hourly_rows = (
+        supabase.table(HOURLY_TABLE)
+        .select("*")
+        .gte("hour", _hour_bucket(since))
+        .lt("hour", until.isoformat())
+        .execute()
+        .data
+    )
+    item_rows = (
+        supabase.table(ITEM_TABLE)
+        .select("item_id, cost_usd")
+        .gte("processed_at", since.isoformat())
+        .lt("processed_at", until.isoformat())
+        .execute()
+        .data
+    )
+    report = build_report(hourly_rows, item_rows)
+    report["since"] = since.isoformat()
+    report["until"] = until.isoformat()
+    return report
+
+
+def _parse_date(value: str) -> datetime:
+    ts = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    print(f"Token usage {report['since']} → {report['until']}")
+    print(f"  Tokens in/out:  {report['tokens_in']:,} / {report['tokens_out']:,}")
+    print(f"  API requests:   {report['requests']:,}")
+    print(f"  Throughput:     {report['tokens_per_sec']:,} tokens/sec of API time")
+    print(f"  Total cost:     ${report['cost_usd']:.4f}")
+    print(f"  Items:          {report['items']:,} (${report['cost_per_item_usd']:.6f} per item)")
+    print("  Cost per client:")
+    for client_id, c in report["by_client"].items():
+        print(f"    {client_id}: ${c['cost_usd']:.4f} ({c['tokens']:,} tokens)")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Token usage reporting from rollup tables")
+    sub = parser.add_subparsers(dest="command", required=True)
+    report = sub.add_parser("report", help="Throughput and cost over a time range")
+    report.add_argument("--since", help="Start (ISO date/time, default: 7 days ago)")
+    report.add_argument("--until", help="End (ISO date/time, default: now)")
+    report.add_argument("--json", action="store_true", help="Output JSON")
+    args = parser.parse_args(argv)
+
+    from dotenv import load_dotenv
+    from supabase import create_client
+
+    load_dotenv()
+    supabase = create_client(
+        os.getenv("SUPABASE_URL") or os.getenv("NEXT_PUBLIC_SUPABASE_URL"),
+        os.environ["SUPABASE_SERVICE_ROLE_KEY"],
+    )
+
+    until = _parse_date(args.until) if args.until else datetime.now(timezone.utc)
+    since = _parse_date(args.since) if args.since else until - timedelta(days=7)
+    result = fetch_report(supabase, since, until)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        _print_report(result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())